@@ -0,0 +1,89 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Benchmark of searching a :py:class:`ConversationStore` filled with tens of thousands of messages.
+
+Times :py:meth:`ConversationStore.search` with the FTS5 full-text index,
+and with the ``LIKE`` scan it falls back to when SQLite has no FTS5 extension.
+
+Run from the repository root with the package installed::
+
+    python benchmarks/conversation_search.py --messages 50000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from chatgpt_gui.network.client import ConversationStore
+from chatgpt_gui.network.client import Message
+
+_WORDS: list[str] = [
+    'python', 'qt', 'widget', 'signal', 'thread', 'socket', 'cookie', 'proxy', 'cache', 'token', 'stream',
+    'parser', 'layout', 'cursor', 'timer', 'request', 'response', 'header', 'encoding', 'database', 'index',
+    'query', 'memory', 'latency', 'bucket', 'retry', 'circuit', 'backoff', 'render', 'scroll', 'window',
+]
+_QUERIES: list[str] = ['python', 'proxy cache', 'signal thread', 'lat', 'database index query', 'nonexistent']
+
+
+def _fill(store: ConversationStore, messages: int, per_conversation: int, rng: random.Random) -> None:
+    """Store conversations of random sentences, using filler words and a few words from ``_WORDS``."""
+    filler: list[str] = [f'word{i}' for i in range(5000)]
+    for start in range(0, messages, per_conversation):
+        store.extend(uuid4(), (
+            Message(
+                text=' '.join(rng.choices(filler, k=25) + rng.choices(_WORDS, k=3)),
+                role='user' if index % 2 else 'assistant'
+            ) for index in range(min(per_conversation, messages - start))
+        ))
+
+
+def _time_queries(store: ConversationStore, repeat: int) -> dict[str, tuple[float, int]]:
+    """Return the median milliseconds and amount of results of searching for each query."""
+    results: dict[str, tuple[float, int]] = {}
+    for query in _QUERIES:
+        durations: list[float] = []
+        for _ in range(repeat):
+            start: float = time.perf_counter()
+            hits = store.search(query)
+            durations.append((time.perf_counter() - start) * 1000)
+        results[query] = (statistics.median(durations), len(hits))
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--messages', type=int, default=50_000, help='amount of messages to store')
+    parser.add_argument('--per-conversation', type=int, default=100, help='amount of messages in each conversation')
+    parser.add_argument('--repeat', type=int, default=5, help='amount of times each query is searched')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ConversationStore(Path(directory) / 'conversations.db')
+
+        start: float = time.perf_counter()
+        _fill(store, args.messages, args.per_conversation, random.Random(0))
+        print(f'Stored {args.messages} messages in {time.perf_counter() - start:.2f}s, '
+              f'full-text search available: {store.full_text_search}')
+
+        methods: list[tuple[str, bool]] = [('LIKE scan', False)]
+        if store.full_text_search:
+            methods.insert(0, ('FTS5 index', True))
+
+        for name, full_text_search in methods:
+            store.full_text_search = full_text_search
+            print(f'{name}:')
+            for query, (duration, hits) in _time_queries(store, args.repeat).items():
+                print(f'    {query!r:24} {duration:8.2f} ms  ({hits} results)')
+
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
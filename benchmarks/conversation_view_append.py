@@ -0,0 +1,91 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Benchmark of the latency of appending messages to a :py:class:`ConversationView` as it grows to 10k messages.
+
+Compares the append-only renderer, with and without its bounded message window,
+against the previous renderer, which copied the whole transcript into ``setText`` for every message.
+Each measured append includes processing events, so layout and painting are counted.
+
+The application is started with a temporary home directory, so no user settings are read or written.
+Run from the repository root with the package installed::
+
+    python benchmarks/conversation_view_append.py --messages 10000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ['HOME'] = os.environ['USERPROFILE'] = tempfile.mkdtemp()
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# pylint: disable=wrong-import-position
+from chatgpt_gui.exception_hook import ExceptionHook
+from chatgpt_gui.gui import GetterApp
+from chatgpt_gui.gui.widgets import ConversationView
+
+_TEXT: str = 'lorem ipsum dolor sit amet ' * 8
+
+
+class _SetTextView(ConversationView):
+    """The previous renderer, which replaced the text of the output with a copy of it and the new message."""
+
+    def append_to_view(self, text: str, index: int | None = None) -> None:
+        self.output.setText(f'{self.output.toPlainText()}{text}\n\n')
+        self.output.verticalScrollBar().setValue(self.output.verticalScrollBar().maximum())
+
+
+def _bench(app: GetterApp, view: ConversationView, messages: int, marks: list[int], samples: int) -> dict[int, float]:
+    """Append messages to a shown view, returning the median milliseconds of the appends before each mark."""
+    durations: dict[int, list[float]] = {mark: [] for mark in marks}
+    for number in range(1, messages + 1):
+        start: float = time.perf_counter()
+        view.append_to_view(f'You: message {number} {_TEXT}')
+
+        if (mark := next((mark for mark in marks if mark - samples < number <= mark), None)) is not None:
+            app.processEvents()
+            durations[mark].append((time.perf_counter() - start) * 1000)
+    return {mark: statistics.median(values) for mark, values in durations.items()}
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--messages', type=int, default=10_000, help='amount of messages to append')
+    parser.add_argument('--old-messages', type=int, default=2_000,
+                        help='amount of messages to append with the previous renderer, which is quadratic')
+    parser.add_argument('--samples', type=int, default=20, help='amount of appends measured before each mark')
+    args = parser.parse_args()
+
+    # ExceptionHook is required for subscribing to ExceptionEvents
+    with ExceptionHook():
+        GetterApp.create(sys.argv[0])
+        app: GetterApp = GetterApp.instance()
+
+        runs: list[tuple[str, type[ConversationView], int, dict[str, int]]] = [
+            ('append-only, windowed', ConversationView, args.messages, {}),
+            ('append-only, unbounded', ConversationView, args.messages, {'max_rendered_messages': sys.maxsize}),
+            ('previous setText', _SetTextView, args.old_messages, {}),
+        ]
+        for name, view_type, messages, attributes in runs:
+            # Views are shown on their own, as the application window shows a modal dialog on first launch
+            view: ConversationView = view_type()
+            for attribute, value in attributes.items():
+                setattr(view, attribute, value)
+            view.resize(900, 700)
+            view.show()
+            app.processEvents()
+
+            marks: list[int] = [mark for mark in (100, 1_000, 2_000, 5_000, 10_000) if mark <= messages]
+            results: dict[int, float] = _bench(app, view, messages, marks, args.samples)
+            print(f'{name:24}: ' + ', '.join(f'{duration:7.2f} ms at {mark}' for mark, duration in results.items()))
+            view.close()
+
+
+if __name__ == '__main__':
+    main()
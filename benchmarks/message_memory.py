@@ -0,0 +1,83 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Benchmark of the memory used per message by a 100k-message conversation history.
+
+Compares the previous representation, a list of plain dataclasses holding a :py:class:`uuid.UUID` object,
+against a list of the slotted :py:class:`Message`, and the columnar :py:class:`MessageList`.
+Memory is measured with :py:mod:`tracemalloc`, both in total and excluding the text of each message.
+
+Run from the repository root with the package installed::
+
+    python benchmarks/message_memory.py --messages 100000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from uuid import UUID
+from uuid import uuid4
+
+from chatgpt_gui.network.client import Message
+from chatgpt_gui.network.client import MessageList
+
+
+@dataclass
+class _DictMessage:
+    """The previous :py:class:`Message`, with an instance dictionary and a UUID object."""
+
+    uuid: UUID = field(default_factory=uuid4)
+    text: str | None = field(default=None)
+    role: str = field(default='user')
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> _DictMessage:
+        return cls(uuid=UUID(data['id']), text='\n\n'.join(data['content']['parts']), role=data['role'])
+
+
+def _measure(build: Callable[[], Any]) -> int:
+    """Return the bytes still allocated by the object built by the given function."""
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    gc.collect()
+    size: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return size
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--messages', type=int, default=100_000, help='amount of messages in the history')
+    parser.add_argument('--text-length', type=int, default=100, help='length of the text of each message')
+    args = parser.parse_args()
+
+    # Parse each message from JSON, as when loading a conversation, so texts and roles aren't shared by reference
+    lines: list[str] = [json.dumps({
+        'id': str(uuid4()),
+        'role': ('user', 'assistant')[index % 2],
+        'content': {'content_type': 'text', 'parts': [f'{index:08} '.ljust(args.text_length, 'x')]},
+    }) for index in range(args.messages)]
+    text_size: int = sys.getsizeof('x' * args.text_length)
+
+    print(f'{args.messages} messages with {args.text_length}-character texts ({text_size} bytes each)')
+    for name, build in (
+            ('before: dataclass with UUID', lambda: [_DictMessage.from_json(json.loads(line)) for line in lines]),
+            ('after: slotted Message', lambda: [Message.from_json(json.loads(line)) for line in lines]),
+            ('after: MessageList', lambda: MessageList(Message.from_json(json.loads(line)) for line in lines)),
+    ):
+        per_message: float = _measure(build) / args.messages
+        print(f'{name:28}: {per_message:6.1f} bytes/message, {per_message - text_size:6.1f} excluding text')
+
+
+if __name__ == '__main__':
+    main()
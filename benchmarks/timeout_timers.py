@@ -0,0 +1,135 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Benchmark of the overhead of connect timeouts for 1k concurrent requests.
+
+Compares the previous approach, a single-shot :py:class:`QTimer` parented to every reply,
+against a :py:class:`TimeoutScheduler` shared by every reply, which is driven by one timer.
+Requests are sent to a local server which responds too late, so every request times out and is aborted.
+
+Run from the repository root with the package installed::
+
+    python benchmarks/timeout_timers.py --requests 1000
+"""
+from __future__ import annotations
+
+import argparse
+import http.server
+import socketserver
+import threading
+import time
+from collections.abc import Callable
+
+from PySide6.QtCore import *
+from PySide6.QtNetwork import *
+
+from chatgpt_gui.network import NetworkSession
+from chatgpt_gui.network import TimeoutScheduler
+
+
+class _SilentHandler(http.server.BaseHTTPRequestHandler):
+    """Holds every request open for a few seconds without responding."""
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        time.sleep(5)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    request_queue_size = 4096
+
+    def handle_error(self, request, client_address) -> None:
+        pass  # Aborted requests close their connection
+
+
+def _start_server() -> str:
+    """Start the silent server on a background thread, returning its base URL."""
+    server = _Server(('127.0.0.1', 0), _SilentHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def _per_reply_timers(replies: list[QNetworkReply], timeout: float) -> Callable[[], int]:
+    """Arm a timer for each reply, like the previous implementation. Return a function counting timer dispatches."""
+    dispatches: list[int] = [0]
+
+    def expire(reply: QNetworkReply) -> None:
+        dispatches[0] += 1
+        if not reply.isFinished():
+            reply.abort()
+
+    for reply in replies:
+        timer = QTimer(reply)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda _reply=reply: expire(_reply))  # pyright: ignore[reportGeneralTypeIssues]
+        timer.start(int(timeout * 1000))
+    return lambda: dispatches[0]
+
+
+def _shared_scheduler(replies: list[QNetworkReply], timeout: float) -> Callable[[], int]:
+    """Add every reply to a single scheduler. Return a function counting timer dispatches."""
+    scheduler = TimeoutScheduler(replies[0].manager())
+    dispatches: list[int] = [0]
+
+    def count() -> None:
+        dispatches[0] += 1
+
+    scheduler._timer.timeout.connect(count)  # pylint: disable=protected-access
+
+    for reply in replies:
+        scheduler.add(reply, timeout)
+    return lambda: dispatches[0]
+
+
+def _run(session: NetworkSession, base: str, requests: int, timeout: float,
+         arm: Callable[[list[QNetworkReply], float], Callable[[], int]]) -> tuple[float, float, float, int]:
+    """Send requests, arm their timeouts, and wait until every request is aborted.
+
+    :return: Milliseconds to arm the timeouts, wall and CPU milliseconds until every request finished,
+        and the amount of timer dispatches to Python.
+    """
+    replies: list[QNetworkReply] = [session.get(f'{base}/{index}', timeout=None)._reply for index in range(requests)]
+    loop = QEventLoop()
+    remaining: list[int] = [requests]
+
+    def finished() -> None:
+        remaining[0] -= 1
+        if not remaining[0]:
+            loop.quit()
+
+    for reply in replies:
+        reply.finished.connect(finished)  # pyright: ignore[reportGeneralTypeIssues]
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    dispatches: Callable[[], int] = arm(replies, timeout)
+    armed: float = time.perf_counter() - wall
+    loop.exec()
+
+    return armed * 1000, (time.perf_counter() - wall) * 1000, (time.process_time() - cpu) * 1000, dispatches()
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--requests', type=int, default=1_000, help='amount of concurrent requests')
+    parser.add_argument('--timeout', type=float, default=0.25, help='connect timeout of each request in seconds')
+    parser.add_argument('--runs', type=int, default=2, help='amount of times each approach is measured')
+    args = parser.parse_args()
+
+    _app = QCoreApplication([])
+    base: str = _start_server()
+    session = NetworkSession()
+
+    print(f'{args.requests} concurrent requests timing out after {args.timeout:g}s')
+    for _ in range(args.runs):
+        for name, arm in (('QTimer per reply', _per_reply_timers), ('shared TimeoutScheduler', _shared_scheduler)):
+            armed, wall, cpu, dispatches = _run(session, base, args.requests, args.timeout, arm)
+            print(f'{name:24}: arming {armed:6.1f} ms, all aborted after {wall:6.0f} ms, '
+                  f'cpu {cpu:6.0f} ms, {dispatches} timer dispatches to Python')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Benchmark of the CPU time used while waiting for a reply from a delayed local server.
+
+Compares the previous busy-wait, which called ``QCoreApplication.processEvents`` until the reply finished,
+against :py:func:`chatgpt_gui.utils.wait_for_reply`, which sleeps in a local ``QEventLoop``.
+
+Run from the repository root with the package installed::
+
+    python benchmarks/wait_for_reply_cpu.py --delay 2
+"""
+from __future__ import annotations
+
+import argparse
+import http.server
+import socketserver
+import threading
+import time
+from collections.abc import Callable
+
+from PySide6.QtCore import *
+from PySide6.QtNetwork import *
+
+from chatgpt_gui.network import NetworkSession
+from chatgpt_gui.utils import wait_for_reply
+
+
+class _DelayedHandler(http.server.BaseHTTPRequestHandler):
+    """Responds to ``GET /<seconds>`` with an empty body after sleeping for that many seconds."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        time.sleep(float(self.path.strip('/') or 0))
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+def _start_server() -> str:
+    """Start the delayed server on a background thread, returning its base URL."""
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _DelayedHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def _busy_wait(reply: QNetworkReply) -> None:
+    """The previous implementation of ``wait_for_reply``."""
+    while not reply.isFinished():
+        QCoreApplication.processEvents()
+
+
+def _measure(session: NetworkSession, url: str, wait: Callable[[QNetworkReply], object]) -> tuple[float, float]:
+    """Return the wall and CPU seconds spent waiting for a reply to the URL."""
+    reply: QNetworkReply = session.get(url)._reply
+    wall, cpu = time.perf_counter(), time.process_time()
+    wait(reply)
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--delay', type=float, default=2.0, help='seconds the server waits before responding')
+    parser.add_argument('--runs', type=int, default=3, help='amount of replies to wait for with each method')
+    args = parser.parse_args()
+
+    _app = QCoreApplication([])
+    base: str = _start_server()
+    session = NetworkSession()
+    wait_for_reply(session.get(f'{base}/0')._reply)  # Connect before measuring
+
+    print(f'Waiting {args.runs} times for a reply delayed by {args.delay:g}s')
+    for name, wait in (('processEvents busy-wait', _busy_wait), ('wait_for_reply', wait_for_reply)):
+        results = [_measure(session, f'{base}/{args.delay}', wait) for _ in range(args.runs)]
+        wall: float = sum(result[0] for result in results) / args.runs
+        cpu: float = sum(result[1] for result in results) / args.runs
+        print(f'{name:24}: wall {wall:6.3f}s, cpu {cpu:6.3f}s ({cpu / wall:6.1%} of a core)')
+
+
+if __name__ == '__main__':
+    main()
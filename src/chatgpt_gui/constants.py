@@ -8,7 +8,10 @@ __all__ = (
     'BYTE_UNITS',
     'CG_CACHE_PATH',
     'CG_CONFIG_PATH',
+    'CG_COOKIES_PATH',
+    'CG_CONVERSATION_STORE_PATH',
     'CG_DATE_FORMAT',
+    'CG_NETWORK_CACHE_PATH',
     'CG_PACKAGE_NAME',
     'CG_PROXY_PATTERN',
     'CG_RESOURCE_PATH',
@@ -62,6 +65,15 @@ CG_CACHE_PATH: Final[Path] = Path.home() / '.cache/chatgpt_gui'
 CG_CONFIG_PATH: Final[Path] = Path.home() / '.config/chatgpt_gui'
 """Directory containing user configuration data."""
 
+CG_COOKIES_PATH: Final[Path] = CG_CONFIG_PATH / '.cookies.json'
+"""File containing cookies of the ChatGPT session."""
+
+CG_CONVERSATION_STORE_PATH: Final[Path] = CG_CACHE_PATH / 'conversations.sqlite3'
+"""Database containing all conversations."""
+
+CG_NETWORK_CACHE_PATH: Final[Path] = CG_CACHE_PATH / 'network'
+"""Directory containing cached HTTP responses."""
+
 CG_RESOURCE_PATH: Final[Path] = Path(__file__).parent / 'resources'
 """Directory containing application resources."""
 
@@ -34,6 +34,7 @@ from ..models import DeferredCallable
 from ..models import DistributedCallable
 from ..models import Singleton
 from ..network import Client
+from ..network import MetricsRegistry
 from ..network import NetworkSession
 from ..network import Response
 from ..network import VersionChecker
@@ -96,7 +97,9 @@ class GetterApp(Singleton, QApplication):
 
         self._first_launch: bool = not _LAUNCHED_FILE.is_file()  # Check if launched marker exists
         self._legacy_style: str = self.styleSheet()              # Set legacy style before it is overridden
-        self._thread_pool: QThreadPool = QThreadPool.globalInstance()
+        # Qt uses the global thread pool for image scaling while painting,
+        # so long-running workers must not occupy its threads
+        self._thread_pool: QThreadPool = QThreadPool(self)
 
         self._setting_defaults: dict[str, TomlValue | CommentValue] = toml.loads(
             _DEFAULTS_FILE.read_text(encoding='utf8'), decoder=PathTomlDecoder()
@@ -109,12 +112,13 @@ class GetterApp(Singleton, QApplication):
 
         # Must have themes up before load_env
         self.icon_store: defaultdict[str, QIcon] = defaultdict(QIcon)  # Null icon generator
-        self.session: NetworkSession = NetworkSession(self)
+        self.metrics: MetricsRegistry = MetricsRegistry()
+        self.session: NetworkSession = NetworkSession(self, cache_path=CG_NETWORK_CACHE_PATH, metrics=self.metrics)
         self.settings: TomlFile = TomlFile(_SETTINGS_FILE, default=self._setting_defaults)  # type: ignore
         self.themes: dict[str, Theme] = {}
         self.theme_index_map: dict[str, int] = {}
         self.translator: Translator
-        self.version_checker: VersionChecker = VersionChecker(self)
+        self.version_checker: VersionChecker = VersionChecker(self, self.session)
 
         # Correct malformed language tag with default language selected by Translator
         try:
@@ -133,8 +137,9 @@ class GetterApp(Singleton, QApplication):
 
         # Must load client last, but before windows
         self.load_env(verbose=True)
-        self.client = Client(self)
+        self.client = Client(self, metrics=self.metrics)
         self.update_client_proxy()
+        self.client.prewarm()  # Connect while the windows are created
         self._connect_events()
 
         # Setup window instances
@@ -178,6 +183,7 @@ class GetterApp(Singleton, QApplication):
         from .windows import CaptchaDialog
         from .windows import ChangelogViewer
         from .windows import LicenseViewer
+        from .windows import MetricsViewer
         from .windows import ReadmeViewer
         from .windows import SettingsWindow
         from .windows import SignInDialog
@@ -193,6 +199,7 @@ class GetterApp(Singleton, QApplication):
         self._windows['sign_in'] = SignInDialog()
         self._windows['changelog_viewer'] = ChangelogViewer()
         self._windows['license_viewer'] = LicenseViewer()
+        self._windows['metrics_viewer'] = MetricsViewer(self.metrics)
         self._windows['readme_viewer'] = ReadmeViewer()
         self._windows['settings'] = SettingsWindow.instance()  # type: ignore
         self._windows['app'] = AppWindow.instance()            # type: ignore
@@ -220,6 +227,10 @@ class GetterApp(Singleton, QApplication):
             DeferredCallable(self.update_client_proxy),
             TomlEvents.Set, lambda event: event.key == 'network/proxy/protocol' and not event.new)
 
+        EventBus['settings'].subscribe(
+            DeferredCallable(self.update_client_proxy_pool),
+            TomlEvents.Set, lambda event: event.key.startswith('network/proxy/pool/'))
+
         self.updateTranslations.connect(lambda: setattr(self.translator, 'language', self.settings['language']))
         self.updateTranslations.connect(lambda: self.setApplicationDisplayName(self.translator('app.name')))
         self.updateTranslations.connect(self._registered_translations)
@@ -582,7 +593,9 @@ class GetterApp(Singleton, QApplication):
         self._thread_pool.start(runnable, priority)
 
     def update_client_proxy(self) -> None:
-        """Update the client proxy with the current application settings."""
+        """Update the client proxy and proxy pool with the current application settings."""
+        self.update_client_proxy_pool()
+
         if protocol := self.settings['network/proxy/protocol']:
             host: str = self.settings['network/proxy/host']  # type: ignore
             port: int = self.settings['network/proxy/port']  # type: ignore
@@ -602,3 +615,19 @@ class GetterApp(Singleton, QApplication):
             self.client.proxy = f'{protocol_str}{login}{host}:{port}'
         else:
             del self.client.proxy
+
+    def update_client_proxy_pool(self) -> None:
+        """Update the client proxy pool with the current application settings.
+
+        If a setting is invalid, an error dialog is shown, and the previous proxies are kept.
+        """
+        pool = self.client.proxy_pool
+        try:
+            pool.strategy = self.settings['network/proxy/pool/strategy']  # type: ignore
+            pool.set_proxies(self.settings['network/proxy/pool/proxies'])  # type: ignore
+        except ValueError as e:
+            self.show_dialog('errors.proxy_pool_invalid', description_args=(e,))
+
+        pool.health_url = self.settings['network/proxy/pool/health_url'] or None  # type: ignore
+        pool.health_interval = self.settings['network/proxy/pool/health_interval']  # type: ignore
+        pool.max_failures = self.settings['network/proxy/pool/max_failures']  # type: ignore
@@ -8,16 +8,17 @@ __all__ = (
     'ConversationsContextMenu',
 )
 
-import json
 from pathlib import Path
+from uuid import UUID
 
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
 from ...constants import *
-from ...network.client import Conversation
+from ...models import DeferredCallable
 from ...utils import add_menu_items
 from ...utils import init_objects
+from ..aliases import app
 from ..aliases import tr
 from ..widgets import ConversationTabs
 from ..widgets import ConversationView
@@ -26,6 +27,12 @@ from ..widgets import ConversationView
 class ConversationsContextMenu(QMenu):
     """Context menu that shows actions to help the user."""
 
+    recent_limit: int = 20
+    """Maximum amount of conversations shown in the recent conversations menu."""
+
+    search_limit: int = 20
+    """Maximum amount of messages shown in the search menu."""
+
     def __init__(self, parent: ConversationTabs, current: ConversationView) -> None:
         """Create a new :py:class:`HelpContextMenu`."""
         super().__init__(parent)
@@ -33,7 +40,26 @@ class ConversationsContextMenu(QMenu):
         self.tabs = parent
         self.current = current
 
+        recent = QMenu(tr('gui.menus.conversations.recent'), self)
+        for stored in app().client.store.recent(limit=self.recent_limit):
+            recent.addAction(stored.title or str(stored.uuid), DeferredCallable(
+                self.open_stored_conversation, stored.uuid, stored.title
+            ))
+        recent.setDisabled(recent.isEmpty())
+
+        self.search_menu = QMenu(tr('gui.menus.conversations.search'), self)
+        self.search_input = QLineEdit(self.search_menu)
+        search_input_action = QWidgetAction(self.search_menu)
+        search_input_action.setDefaultWidget(self.search_input)
+        self.search_menu.addAction(search_input_action)
+        self.search_menu.aboutToShow.connect(self.search_input.setFocus)
+
         init_objects({
+            self.search_input: {
+                'clearButtonEnabled': True,
+                'placeholderText': tr('gui.menus.conversations.search.placeholder'),
+                'textChanged': self.search
+            },
             (import_conversation := QAction(self)): {
                 'text': tr('gui.menus.conversations.import'),
                 'triggered': self.import_conversation
@@ -50,7 +76,7 @@ class ConversationsContextMenu(QMenu):
         })
 
         add_menu_items(self, [
-            'Conversations', import_conversation,
+            'Conversations', recent, self.search_menu, import_conversation,
             'Current', export_conversation  # , rename_conversation
         ])
 
@@ -59,38 +85,47 @@ class ConversationsContextMenu(QMenu):
         file_path = Path(QFileDialog.getOpenFileName(
             self, caption=tr('gui.menus.conversations.import'),
             dir=str(CG_CACHE_PATH / 'conversations'),
-            filter='JSON Files (*.json);;All files (*.*)')[0])
+            filter='JSON Lines Files (*.jsonl);;JSON Files (*.json);;All files (*.*)')[0])
 
         # Return if dialog is cancelled
         if not file_path.is_file():
             return
 
-        # Load messages from json data
-        conversation = Conversation.from_json(json.loads(file_path.read_text(encoding='utf8')))
-        view = ConversationView(conversation)
-        for message in conversation.messages:
-            if message.role == 'assistant':
-                view.receive_message(message, conversation)
-            else:
-                view.append_to_view(tr('gui.output_text.you_prompt', message.text, key_eval=False))
+        self.tabs.import_conversation(file_path)
+
+    def open_stored_conversation(self, uuid: UUID, title: str = '') -> None:
+        """Open a conversation from the conversation store. See :py:meth:`ConversationTabs.open_stored_conversation`.
+
+        :param uuid: UUID of conversation to open.
+        :param title: Title of the new tab. Defaults to the UUID.
+        """
+        self.tabs.open_stored_conversation(uuid, title)
+
+    def search(self, query: str) -> None:
+        """Replace the search menu's results with messages matching the query.
 
-        # remove empty conversation
-        if not self.current.conversation.messages:
-            self.tabs.removeTab(self.tabs.currentIndex())
+        :param query: Words to search stored messages for.
+        """
+        # Keep the search input, which is always the first action
+        for action in self.search_menu.actions()[1:]:
+            self.search_menu.removeAction(action)
+            action.deleteLater()
 
-        self.tabs.addTab(view, file_path.stem)
-        self.tabs.setCurrentIndex(self.tabs.count() - 1)
+        for result in app().client.store.search(query, limit=self.search_limit):
+            self.search_menu.addAction(
+                f'{result.title}: {result.snippet}' if result.title else result.snippet,
+                DeferredCallable(self.open_stored_conversation, result.conversation_uuid, result.title)
+            )
 
     def export_conversation(self) -> None:
         """Export conversation to given filename."""
         file_path = Path(QFileDialog.getSaveFileName(
             self, caption=tr('gui.menus.conversations.export'),
-            dir=str(CG_CACHE_PATH / f'conversations/{self.current.conversation.uuid}.json'),
-            filter='JSON Files (*.json);;All files (*.*)')[0])
+            dir=str(CG_CACHE_PATH / f'conversations/{self.current.conversation.uuid}.jsonl'),
+            filter='JSON Lines Files (*.jsonl);;JSON Files (*.json);;All files (*.*)')[0])
 
         # Return if dialog is cancelled
         if str(file_path) == '.':
             return
 
-        file_path.write_text(json.dumps(self.current.conversation.to_json(), indent=2), encoding='utf8')
-        self.tabs.setTabText(self.tabs.currentIndex(), file_path.stem)
+        self.tabs.export_conversation(self.current, file_path)
@@ -76,9 +76,15 @@ class ToolsContextMenu(QMenu):
                 'text': tr('gui.menus.tools.exception_reporter'),
                 'icon': app().windows['app'].exception_reporter.logger.icon(),  # type: ignore
                 'triggered': app().windows['app'].exception_reporter.show       # type: ignore
+            },
+
+            (metrics_viewer := QAction(self)): {
+                'text': tr('gui.menus.tools.metrics_viewer'),
+                'icon': app().windows['metrics_viewer'].windowIcon(),
+                'triggered': app().windows['metrics_viewer'].show
             }
         })
 
         add_menu_items(self, [
-            'Tools', shortcut_tool, exception_reporter
+            'Tools', shortcut_tool, exception_reporter, metrics_viewer
         ])
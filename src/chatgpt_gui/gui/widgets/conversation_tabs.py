@@ -8,6 +8,9 @@ __all__ = (
     'ConversationTabs',
 )
 
+from pathlib import Path
+from uuid import UUID
+
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
@@ -15,11 +18,18 @@ from PySide6.QtWidgets import *
 from ...network.client import Conversation
 from ...utils import init_objects
 from ..aliases import app
+from ..aliases import tr
 from .conversation_view import ConversationView
 
 
 class ConversationTabs(QTabWidget):
-    """Viewer for a ChatGPT conversation."""
+    """Viewer for a ChatGPT conversation.
+
+    Only the most recently shown tabs keep their conversation rendered.
+    """
+
+    max_rendered_tabs: int = 8
+    """Maximum amount of tabs with a rendered conversation. The least recently shown tabs are released first."""
 
     def __init__(self, parent: QWidget | None = None, conversation: Conversation | None = None) -> None:
         """Initialize :py:class:`ConversationView` values."""
@@ -27,11 +37,14 @@ class ConversationTabs(QTabWidget):
         self.conversation_counter: int = 0
         self.conversation: Conversation = conversation if conversation is not None else Conversation()
         self.add_conversation_button: QPushButton = QPushButton(self)
+        # Ordered from least to most recently shown
+        self._shown_views: dict[ConversationView, None] = {}
 
         init_objects({
             self: {
                 'tabsClosable': True,
                 'tabCloseRequested': self.remove_conversation,
+                'currentChanged': self.on_current_changed,
                 'contextMenuPolicy': Qt.ContextMenuPolicy.CustomContextMenu,
                 'customContextMenuRequested': self.on_custom_context_menu
             },
@@ -50,19 +63,140 @@ class ConversationTabs(QTabWidget):
         self.conversation_counter += 1
         self.addTab(ConversationView(), f'Conversation {self.conversation_counter}')
 
+    def _progress_dialog(self, label: str) -> QProgressDialog:
+        """Create a dialog showing the progress of a background task, from 0 to 1000."""
+        dialog = QProgressDialog(label, '', 0, 1000, self)
+        dialog.setCancelButton(None)  # type: ignore
+        dialog.setMinimumDuration(500)
+        dialog.setWindowModality(Qt.WindowModality.NonModal)
+        return dialog
+
+    def export_conversation(self, view: ConversationView, path: Path) -> None:
+        """Export a conversation to a file on a worker thread, showing its progress.
+
+        Files with a ``.json`` suffix are written as a single JSON object, all others are written as JSON Lines.
+
+        :param view: View of the conversation to export. Its conversation must be saved in the conversation store.
+        :param path: Path of file to export to.
+        """
+        from ..workers import ExportConversation
+
+        progress = self._progress_dialog(tr('gui.menus.conversations.export.progress', path.name))
+
+        def exported(_: Path) -> None:
+            progress.deleteLater()
+            if (index := self.indexOf(view)) != -1:
+                self.setTabText(index, path.stem)
+
+        def failed(e: Exception) -> None:
+            progress.deleteLater()
+            app().show_dialog('errors.conversations.export_failure', self, description_args=(path, e))
+
+        app().start_worker(ExportConversation(
+            app().client.store.path, view.conversation.uuid, path,  # type: ignore
+            progress=lambda value: progress.setValue(int(value * 1000)),
+            valueReturned=exported, exceptionRaised=failed
+        ))
+
+    def import_conversation(self, path: Path) -> None:
+        """Import a conversation file into the conversation store on a worker thread, showing its progress.
+
+        The conversation is opened in a new tab after being imported.
+        If it was already stored, it's replaced, and any tab showing the replaced conversation is closed.
+        Files with a ``.json`` suffix are read as a single JSON object, all others are read as JSON Lines.
+
+        :param path: Path of file to import.
+        """
+        from ..workers import ImportConversation
+
+        progress = self._progress_dialog(tr('gui.menus.conversations.import.progress', path.name))
+
+        def imported(uuid: UUID) -> None:
+            progress.deleteLater()
+
+            # Forget the replaced conversation, so it's loaded from the store again
+            app().client.conversations.pop(uuid, None)
+            for index in reversed(range(self.count())):
+                if self.widget(index).conversation.uuid == uuid:  # type: ignore
+                    self.remove_conversation(index)
+
+            self.open_stored_conversation(uuid, path.stem)
+
+        def failed(e: Exception) -> None:
+            progress.deleteLater()
+            app().show_dialog('errors.conversations.import_failure', self, description_args=(path, e))
+
+        app().start_worker(ImportConversation(
+            app().client.store.path, path,
+            progress=lambda value: progress.setValue(int(value * 1000)),
+            valueReturned=imported, exceptionRaised=failed
+        ))
+
+    def open_conversation(self, conversation: Conversation, title: str) -> None:
+        """Open a conversation in a new tab, replacing the current conversation if it's empty.
+
+        :param conversation: Conversation to open.
+        :param title: Title of the new tab.
+        """
+        view = ConversationView(conversation)
+
+        # remove empty conversation
+        current: ConversationView | None = self.currentWidget()  # type: ignore
+        if current is not None and not current.conversation.messages and not current.is_waiting:
+            self.removeTab(self.currentIndex())
+            self._shown_views.pop(current, None)
+            current.deleteLater()
+
+        self.addTab(view, title)
+        self.setCurrentIndex(self.count() - 1)
+
+    def open_stored_conversation(self, uuid: UUID, title: str = '') -> None:
+        """Open a conversation from the conversation store, or switch to its tab if it's already open.
+
+        :param uuid: UUID of conversation to open.
+        :param title: Title of the new tab. Defaults to the UUID.
+        """
+        for index in range(self.count()):
+            if self.widget(index).conversation.uuid == uuid:  # type: ignore
+                self.setCurrentIndex(index)
+                return
+
+        # Only read the messages rendered when the view is shown, older messages are read as they're scrolled to
+        if (conversation := app().client.load_conversation(uuid, limit=ConversationView.page_size)) is not None:
+            self.open_conversation(conversation, title or str(uuid))
+
     def remove_conversation(self, index: int):
         """Remove the conversation at the given index.
 
         :param index: Index of conversation to remove.
         """
         view: ConversationView = self.widget(index)  # type: ignore
+        view.cancel_message()
         view.deleteLater()
+        self._shown_views.pop(view, None)
 
         self.removeTab(index)
         if not self.count():
             self.conversation_counter = 0
             self.add_conversation()
 
+    def on_current_changed(self, index: int) -> None:
+        """Ran when the currentChanged signal is emitted.
+
+        Releases the output of the least recently shown tabs over the rendered tab limit.
+
+        :param index: Index of the new current tab.
+        """
+        if (view := self.widget(index)) is None:
+            return
+
+        self._shown_views.pop(view, None)  # type: ignore
+        self._shown_views[view] = None  # type: ignore
+
+        for old_view in list(self._shown_views)[:-self.max_rendered_tabs]:
+            if old_view.release_output():
+                del self._shown_views[old_view]
+
     def on_custom_context_menu(self, point: QPoint) -> None:
         """Ran when the customContextMenuRequested signal is emitted.
 
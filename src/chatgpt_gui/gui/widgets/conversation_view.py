@@ -8,10 +8,14 @@ __all__ = (
     'ConversationView',
 )
 
+import math
+from collections import deque
+
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
-from ...models import DistributedCallable
+from ...network import CircuitOpenError
+from ...network import ScheduledRequest
 from ...network.client import Conversation
 from ...network.client import Message
 from ...utils import init_layouts
@@ -22,18 +26,53 @@ from .external_text_browser import ExternalTextBrowser
 from .paste_line_edit import PasteLineEdit
 
 
+class _RenderedMessage:
+    """Text of a message in the output of a :py:class:`ConversationView`."""
+
+    __slots__ = ('index', 'length')
+
+    def __init__(self, index: int | None, length: int) -> None:
+        """Create a new :py:class:`_RenderedMessage`.
+
+        :param index: Index of the message in the conversation, None if it isn't part of the conversation (yet).
+        :param length: Amount of characters taken by the message in the output document.
+        """
+        self.index: int | None = index
+        self.length: int = length
+
+
 class ConversationView(QFrame):
-    """Viewer for a ChatGPT conversation."""
+    """Viewer for a ChatGPT conversation.
+
+    Messages are only ever inserted at the edges of the output, so adding a message
+    doesn't copy or re-layout the rest of the conversation. Only the most recent
+    messages are rendered, and older messages are rendered when scrolling to the top.
+
+    Widgets are created, and the conversation rendered, when the view is first shown.
+    """
+
+    max_rendered_messages: int = 200
+    """Maximum amount of messages kept in the output when appending a message."""
+
+    page_size: int = 50
+    """Amount of older messages rendered at once when scrolling to the top."""
 
     def __init__(self, conversation: Conversation | None = None, *args, **kwargs) -> None:
         """Initialize :py:class:`ConversationView` values."""
         super().__init__(*args, **kwargs)
         self.conversation = conversation if conversation is not None else Conversation()
 
+        self.is_rendered: bool = False
         self.is_waiting: bool = False
-        self._init_ui()
+        self.pending_message: ScheduledRequest | None = None
+
+        self._ui_initialized: bool = False
+        self._pending_prompt: _RenderedMessage | None = None
+        self._pending_response_length: int | None = None
+        self._rendered: deque[_RenderedMessage] = deque()
 
     def _init_ui(self) -> None:
+        self._ui_initialized = True
 
         def toggle_multiline():
             nonlocal multiline_mode
@@ -112,22 +151,137 @@ class ConversationView(QFrame):
         toggle_multiline()
         self.output.setPlaceholderText(tr('gui.output_text.placeholder'))
 
+        self.output.verticalScrollBar().valueChanged.connect(self._on_scroll)
+
         app().client.receivedMessage.connect(self.receive_message)
-        app().client.receivedError.connect(DistributedCallable((
-            lambda *_: setattr(self, 'is_waiting', False),
-            lambda *_: self.send_button.setDisabled(False)
-        )))
+        app().client.receivedMessageDelta.connect(self.receive_message_delta)
+        app().client.messageFailed.connect(self.message_failed)
+
+    @staticmethod
+    def _format_message(message: Message) -> str:
+        """Format a message as shown in the output."""
+        if message.role == 'assistant':
+            return tr('gui.output_text.ai_prompt', message.text, key_eval=False)
+        return tr('gui.output_text.you_prompt', message.text, key_eval=False)
+
+    @property
+    def _first_rendered_index(self) -> int:
+        """Index of the oldest message in the output."""
+        return next(
+            (rendered.index for rendered in self._rendered if rendered.index is not None),
+            len(self.conversation.messages)
+        )
 
-    def append_to_view(self, text: str) -> None:
+    def _end_cursor(self) -> QTextCursor:
+        """Return a cursor at the end of the output document."""
+        cursor = QTextCursor(self.output.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        return cursor
+
+    @staticmethod
+    def _insert(cursor: QTextCursor, text: str) -> int:
+        """Insert text at the cursor, replacing its selection.
+
+        :return: Length of the inserted text in the document, which counts UTF-16 code units.
+        """
+        start: int = cursor.selectionStart()
+        cursor.insertText(text)
+        return cursor.position() - start
+
+    def _on_scroll(self, value: int) -> None:
+        """Render older messages when scrolled to the top."""
+        if value == self.output.verticalScrollBar().minimum() and self._first_rendered_index > 0:
+            self.render_older_messages()
+
+    def _scroll_to_bottom(self) -> None:
+        """Scroll the output to the newest message."""
+        self.output.verticalScrollBar().setValue(self.output.verticalScrollBar().maximum())
+
+    def _select_pending_response(self) -> QTextCursor:
+        """Return a cursor selecting the partial response at the end of the output, if any."""
+        cursor: QTextCursor = self._end_cursor()
+        if self._pending_response_length is not None:
+            cursor.setPosition(cursor.position() - self._pending_response_length, QTextCursor.MoveMode.KeepAnchor)
+        return cursor
+
+    def _trim(self) -> None:
+        """Remove the oldest messages over the render limit."""
+        if len(self._rendered) <= self.max_rendered_messages:
+            return
+
+        length: int = 0
+        while len(self._rendered) > self.max_rendered_messages:
+            length += self._rendered.popleft().length
+
+        cursor = QTextCursor(self.output.document())
+        cursor.setPosition(length, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+
+    def append_to_view(self, text: str, index: int | None = None) -> None:
         """Append some new text to the output.
 
         Adds two newlines after the text for better differentiation between messages.
         Also scrolls down to bottom for you.
 
         :param text: Text to append to output.
+        :param index: Index of the message in the conversation, if the text is a message.
         """
-        self.output.setText(f'{self.output.toPlainText()}{text}\n\n')
-        self.output.verticalScrollBar().setValue(self.output.verticalScrollBar().maximum())
+        self._rendered.append(_RenderedMessage(index, self._insert(self._end_cursor(), f'{text}\n\n')))
+
+        self._trim()
+        self._scroll_to_bottom()
+
+    def release_output(self) -> bool:
+        """Clear the output to free its memory, until the view is shown again.
+
+        Views waiting for a response are not released.
+
+        :return: True if the output was released.
+        """
+        if not self.is_rendered or self.is_waiting:
+            return False
+
+        self.output.clear()
+        self._pending_prompt = None
+        self._pending_response_length = None
+        self._rendered.clear()
+        self.is_rendered = False
+        return True
+
+    def render_history(self) -> None:
+        """Replace the output with the most recent messages in the conversation."""
+        self.is_rendered = True
+        self.output.clear()
+        self._pending_prompt = None
+        self._pending_response_length = None
+        self._rendered.clear()
+
+        cursor: QTextCursor = self._end_cursor()
+        start: int = max(len(self.conversation.messages) - self.page_size, 0)
+        for index, message in enumerate(self.conversation.messages[start:], start=start):
+            self._rendered.append(_RenderedMessage(index, self._insert(cursor, f'{self._format_message(message)}\n\n')))
+
+        self._scroll_to_bottom()
+
+    def render_older_messages(self) -> None:
+        """Render a page of messages before the oldest message in the output, keeping the scroll position."""
+        if not (end := self._first_rendered_index):
+            return
+
+        start: int = max(end - self.page_size, 0)
+        scroll_bar: QScrollBar = self.output.verticalScrollBar()
+        distance_from_bottom: int = scroll_bar.maximum() - scroll_bar.value()
+
+        cursor = QTextCursor(self.output.document())
+        cursor.beginEditBlock()
+        rendered: list[_RenderedMessage] = [
+            _RenderedMessage(index, self._insert(cursor, f'{self._format_message(message)}\n\n'))
+            for index, message in enumerate(self.conversation.messages[start:end], start=start)
+        ]
+        cursor.endEditBlock()
+        self._rendered.extendleft(reversed(rendered))
+
+        scroll_bar.setValue(scroll_bar.maximum() - distance_from_bottom)
 
     def send_message(self) -> None:
         """Send a message to the client using the current input text.
@@ -141,16 +295,86 @@ class ConversationView(QFrame):
             self.is_waiting = True
             self.send_button.setDisabled(True)
             self.append_to_view(tr('gui.output_text.you_prompt', message, key_eval=False))  # type: ignore
+            self._pending_prompt = self._rendered[-1]
+
+            try:
+                self.pending_message = app().client.send_message(message, self.conversation)  # type: ignore
+            except CircuitOpenError as e:
+                # The host is failing, so tell the user when they can try again instead of reporting an exception
+                self.message_failed(self.conversation)
+                app().show_dialog('warnings.circuit_open', self, description_args=(e.host, math.ceil(e.retry_in)))
+            except (ValueError, ConnectionError):
+                self.message_failed(self.conversation)
+                raise
 
-            app().client.send_message(message, self.conversation)  # type: ignore
+    def cancel_message(self) -> None:
+        """Cancel the message currently waiting for a response, if any."""
+        if self.pending_message is not None:
+            self.pending_message.cancel()
+
+    def message_failed(self, conversation: Conversation) -> None:
+        """Allow sending messages again after a failed response.
+
+        :param conversation: Conversation the message failed in.
+        """
+        if conversation is self.conversation:
+            self.is_waiting = False
+            self.pending_message = None
+            self.send_button.setDisabled(False)
+            if not self.is_rendered:
+                return
+
+            # Keep any partial response
+            if self._pending_response_length is not None:
+                length: int = self._pending_response_length + self._insert(self._end_cursor(), '\n\n')
+                self._rendered.append(_RenderedMessage(None, length))
+                self._pending_response_length = None
+            self._pending_prompt = None
 
     def receive_message(self, message: Message, conversation: Conversation) -> None:
         """Receive a response from the client.
 
+        Replaces the partial response, if any.
+
         :param message: Message received.
         :param conversation: Conversation received in.
         """
         if conversation is self.conversation:
             self.is_waiting = False
+            self.pending_message = None
             self.send_button.setDisabled(False)
-            self.append_to_view(tr('gui.output_text.ai_prompt', message.text, key_eval=False))
+            if not self.is_rendered:
+                return
+
+            # The prompt was added to the conversation alongside the response
+            index: int = len(conversation.messages) - 1
+            if self._pending_prompt is not None:
+                self._pending_prompt.index = index - 1
+                self._pending_prompt = None
+
+            if self._pending_response_length is not None:
+                self._select_pending_response().removeSelectedText()
+                self._pending_response_length = None
+
+            self.append_to_view(tr('gui.output_text.ai_prompt', message.text, key_eval=False), index)
+
+    def receive_message_delta(self, message: Message, conversation: Conversation) -> None:
+        """Receive a partial response from the client, replacing the previous partial response.
+
+        :param message: Partial message received.
+        :param conversation: Conversation received in.
+        """
+        if conversation is self.conversation and self.is_rendered:
+            self._pending_response_length = self._insert(
+                self._select_pending_response(), tr('gui.output_text.ai_prompt', message.text, key_eval=False)
+            )
+            self._scroll_to_bottom()
+
+    def showEvent(self, event: QShowEvent) -> None:
+        """Create widgets and render the conversation, if not done already."""
+        if not self._ui_initialized:
+            self._init_ui()
+        if not self.is_rendered:
+            self.render_history()
+
+        super().showEvent(event)
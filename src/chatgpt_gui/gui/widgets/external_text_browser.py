@@ -141,11 +141,13 @@ class ExternalTextBrowser(QTextBrowser):
         if resource_type == 0x2 and not url.isLocalFile():
             image: QImage = QImage()
             if (url_string := url.toDisplayString()) not in self.remote_image_cache:
-                # Add placeholder bytes to show the url is being downloaded.
-                # Otherwise, unneeded replies are sent out and cause application stutter.
-                self.remote_image_cache[url_string] = b''
-
+                # Identical in-flight requests are coalesced by the session, so loading the same image again
+                # while it's being downloaded doesn't send another request.
                 def handle_reply(reply: Response):
+                    # Only the first of the coalesced callbacks needs to reload the document
+                    if url_string in self.remote_image_cache:
+                        return
+
                     image.loadFromData(reply.data)
                     self.remote_image_cache[url_string] = reply.data
 
@@ -153,8 +155,8 @@ class ExternalTextBrowser(QTextBrowser):
                         self.hot_reload()
 
                 app().session.get(url, finished=handle_reply)
-            elif cached_data := self.remote_image_cache[url_string]:
-                image.loadFromData(cached_data)
+            else:
+                image.loadFromData(self.remote_image_cache[url_string])
             return image
 
         return super().loadResource(resource_type, url, **kwargs)
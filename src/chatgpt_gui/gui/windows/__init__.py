@@ -9,6 +9,7 @@ __all__ = (
     'ChangelogViewer',
     'ExceptionReporter',
     'LicenseViewer',
+    'MetricsViewer',
     'ReadmeViewer',
     'SettingsWindow',
     'SignInDialog',
@@ -19,6 +20,7 @@ from .captcha_dialog import CaptchaDialog
 from .changelog_viewer import ChangelogViewer
 from .exception_reporter import ExceptionReporter
 from .license_viewer import LicenseViewer
+from .metrics_viewer import MetricsViewer
 from .readme_viewer import ReadmeViewer
 from .settings import SettingsWindow
 from .sign_in_dialog import SignInDialog
@@ -0,0 +1,164 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""MetricsViewer implementation."""
+from __future__ import annotations
+
+__all__ = (
+    'MetricsViewer',
+)
+
+from functools import partial
+from pathlib import Path
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+from ...constants import *
+from ...network import MetricsRegistry
+from ...utils import init_layouts
+from ...utils import init_objects
+from ..aliases import app
+from ..aliases import tr
+
+
+class MetricsViewer(QWidget):
+    """Widget that shows the latency of each network endpoint, and can export the metrics as JSON."""
+
+    # Translation key and histogram phase of each latency column, after the totals columns
+    _LATENCY_COLUMNS: tuple[tuple[str, str, float], ...] = (
+        ('p50', 'total', 50),
+        ('p90', 'total', 90),
+        ('p99', 'total', 99),
+        ('first_byte', 'first_byte', 50),
+        ('connect', 'connect', 50),
+        ('server', 'server', 50),
+        ('transfer', 'transfer', 50),
+    )
+
+    def __init__(self, metrics: MetricsRegistry, *args, **kwargs) -> None:
+        """Create a new :py:class:`MetricsViewer` and initialize UI.
+
+        :param metrics: Registry to show the metrics of.
+        """
+        super().__init__(*args, **kwargs)
+        self.metrics: MetricsRegistry = metrics
+        self.resize(QSize(900, 400))
+        self.setWindowTitle(tr('gui.metrics_viewer.title'))
+        self.setWindowIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogDetailedView))
+
+        # Only refresh while shown, so hidden viewers cost nothing
+        self.refresh_timer: QTimer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)  # pyright: ignore[reportGeneralTypeIssues]
+        self._init_ui()
+
+    def _init_ui(self) -> None:
+        self.summary_label = QLabel(self)
+        self.tree = QTreeWidget(self)
+
+        columns: list[str] = ['endpoint', 'requests', 'errors', 'received'] + [
+            column for column, _, _ in self._LATENCY_COLUMNS
+        ]
+
+        init_objects({
+            self.tree: {
+                'columnCount': len(columns),
+                'rootIsDecorated': False,
+                'sortingEnabled': True,
+                'uniformRowHeights': True
+            },
+
+            (refresh_button := QPushButton(self)): {
+                'icon': self.style().standardIcon(QStyle.StandardPixmap.SP_BrowserReload),
+                'clicked': self.refresh
+            },
+
+            (clear_button := QPushButton(self)): {
+                'clicked': self.clear
+            },
+
+            (export_button := QPushButton(self)): {
+                'clicked': self.export
+            }
+        })
+
+        app().init_translations({
+            self.setWindowTitle: 'gui.metrics_viewer.title',
+            refresh_button.setText: 'gui.metrics_viewer.refresh',
+            clear_button.setText: 'gui.metrics_viewer.clear',
+            export_button.setText: 'gui.metrics_viewer.export',
+        } | {
+            partial(self.tree.headerItem().setText, i): f'gui.metrics_viewer.columns.{column}'
+            for i, column in enumerate(columns)
+        })
+
+        init_layouts({
+            (buttons := QHBoxLayout()): {
+                'items': [self.summary_label, QSpacerItem(0, 0, hData=QSizePolicy.Policy.MinimumExpanding),
+                          refresh_button, clear_button, export_button]
+            },
+
+            QVBoxLayout(self): {
+                'items': [self.tree, buttons]
+            }
+        })
+
+    def clear(self) -> None:
+        """Remove every recorded request from the registry."""
+        self.metrics.clear()
+        self.refresh()
+
+    def export(self) -> None:
+        """Save the metrics to a JSON file chosen by the user, for offline analysis."""
+        file_path = Path(QFileDialog.getSaveFileName(
+            self, caption=tr('gui.metrics_viewer.export'),
+            dir=str(CG_CACHE_PATH / 'network_metrics.json'),
+            filter='JSON Files (*.json);;All files (*.*)')[0])
+
+        # Return if dialog is cancelled
+        if str(file_path) == '.':
+            return
+
+        self.metrics.dump(file_path)
+
+    def refresh(self) -> None:
+        """Show the current metrics of every endpoint, along with cache, coalescing, retry, and rate limit totals."""
+        client = app().client
+        self.summary_label.setText(tr(
+            'gui.metrics_viewer.summary',
+            app().session.cache_hits, app().session.cache_misses, app().session.requests_coalesced,
+            client.retry_policy.retries, client.circuit_breaker.trips, client.circuit_breaker.rejections,
+            client.rate_limiter.throttled, client.rate_limiter.throttle_wait
+        ))
+
+        sort_column: int = self.tree.sortColumn()
+        sort_order: Qt.SortOrder = self.tree.header().sortIndicatorOrder()
+        self.tree.setSortingEnabled(False)
+        self.tree.clear()
+
+        for name, endpoint in self.metrics.endpoints.items():
+            values: list[float] = [endpoint.count, endpoint.errors, endpoint.bytes_received / 1024] + [
+                endpoint.histograms[phase].percentile(percent) for _, phase, percent in self._LATENCY_COLUMNS
+            ]
+
+            item = QTreeWidgetItem(self.tree)
+            item.setText(0, name)
+            for column, value in enumerate(values, start=1):
+                # Store numbers as display data, so columns sort numerically
+                item.setData(column, Qt.ItemDataRole.DisplayRole, round(value, 1))
+
+        self.tree.setSortingEnabled(True)
+        self.tree.sortItems(sort_column, sort_order)
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        """Stop refreshing the metrics while hidden."""
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def showEvent(self, event: QShowEvent) -> None:
+        """Refresh the metrics when shown, and every second after."""
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
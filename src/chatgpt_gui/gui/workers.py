@@ -5,14 +5,22 @@
 from __future__ import annotations
 
 __all__ = (
+    'ExportConversation',
+    'ImportConversation',
     'SignIn',
 )
 
+import json
 from collections.abc import Callable
+from pathlib import Path
+from uuid import UUID
 
 from PySide6.QtCore import *
 from shiboken6 import Shiboken
 
+from ..network.client import Conversation
+from ..network.client import ConversationStore
+from ..network.client import Message
 from .app import GetterApp
 
 
@@ -21,6 +29,10 @@ class _SignalHolder(QObject):
     valueReturned = Signal(object)
 
 
+class _ProgressSignalHolder(_SignalHolder):
+    progress = Signal(float)
+
+
 class _Worker(QRunnable):
     _signal_holder: type[_SignalHolder] = _SignalHolder
 
@@ -94,3 +106,110 @@ class SignIn(_Worker):
 
     def _run(self) -> None:
         GetterApp.instance().client.sign_in(self.username, self.password)
+
+
+class ExportConversation(_Worker):
+    """Exports a stored conversation to a file, one message at a time.
+
+    Files with a ``.json`` suffix are written as a single JSON object, all others are written as JSON Lines;
+    with the conversation's id on the first line, and a message on each following line.
+
+    Emits the fraction of messages written through the ``progress`` signal.
+    Raises :py:class:`ValueError` if the conversation isn't saved in the store.
+    """
+
+    _signal_holder: type[_SignalHolder] = _ProgressSignalHolder
+
+    def __init__(self, store_path: Path | str, uuid: UUID, path: Path, **kwargs: Callable | Slot) -> None:
+        """Create a new :py:class:`ExportConversation` worker to export the conversation to the given ``path``."""
+        super().__init__(**kwargs)
+        self.store_path = store_path
+        self.uuid = uuid
+        self.path = path
+
+    def _run(self) -> Path:
+        # SQLite connections can only be used from the thread that created them
+        store = ConversationStore(self.store_path)
+        try:
+            if self.uuid is None or self.uuid not in store:
+                raise ValueError(f'Conversation {self.uuid} is not saved, send a message in it first.')
+
+            total: int = store.message_count(self.uuid)
+            legacy: bool = self.path.suffix == '.json'
+
+            with self.path.open('w', encoding='utf8') as file:
+                file.write(f'{{"id": "{self.uuid}", "messages": [' if legacy else f'{{"id": "{self.uuid}"}}\n')
+
+                for i, message in enumerate(store.iter_messages(self.uuid), start=1):
+                    if legacy:
+                        file.write(f'{", " if i > 1 else ""}{json.dumps(message.to_json())}')
+                    else:
+                        file.write(f'{json.dumps(message.to_json())}\n')
+
+                    if not i % 1000:
+                        self.signals.progress.emit(i / total)
+
+                if legacy:
+                    file.write(']}')
+        finally:
+            store.close()
+
+        self.signals.progress.emit(1.0)
+        return self.path
+
+
+class ImportConversation(_Worker):
+    """Imports a conversation file into a conversation store, reading one message at a time.
+
+    Files with a ``.json`` suffix are read as a single JSON object, all others are read as JSON Lines.
+    See :py:class:`ExportConversation` for the format.
+
+    A conversation which is already stored is replaced, instead of appending the imported messages to it.
+
+    Emits the fraction of the file read through the ``progress`` signal.
+    Returns the UUID of the imported conversation.
+    """
+
+    _signal_holder: type[_SignalHolder] = _ProgressSignalHolder
+
+    batch_size: int = 1000
+    """Amount of messages kept in memory before being written to the store."""
+
+    def __init__(self, store_path: Path | str, path: Path, **kwargs: Callable | Slot) -> None:
+        """Create a new :py:class:`ImportConversation` worker to import the conversation at the given ``path``."""
+        super().__init__(**kwargs)
+        self.store_path = store_path
+        self.path = path
+
+    def _run(self) -> UUID:
+        # SQLite connections can only be used from the thread that created them
+        store = ConversationStore(self.store_path)
+        try:
+            if self.path.suffix == '.json':
+                conversation = Conversation.from_json(json.loads(self.path.read_text(encoding='utf8')))
+                store.delete(conversation.uuid)  # type: ignore
+                store.extend(conversation.uuid, conversation.messages)  # type: ignore
+                self.signals.progress.emit(1.0)
+                return conversation.uuid  # type: ignore
+
+            total: int = self.path.stat().st_size or 1
+            with self.path.open('rb') as file:
+                uuid = UUID(json.loads(file.readline())['id'])
+                store.delete(uuid)
+                batch: list[Message] = []
+                for line in file:
+                    if not line.strip():
+                        continue
+
+                    batch.append(Message.from_json(json.loads(line)))
+                    if len(batch) >= self.batch_size:
+                        store.extend(uuid, batch)
+                        batch.clear()
+                        self.signals.progress.emit(file.tell() / total)
+
+                store.extend(uuid, batch)
+        finally:
+            store.close()
+
+        self.signals.progress.emit(1.0)
+        return uuid
@@ -4,19 +4,47 @@
 """Main networking package for ChatGPT-GUI."""
 
 __all__ = (
+    'AsyncNetworkSession',
+    'CircuitBreaker',
+    'CircuitOpenError',
     'Client',
+    'EventStreamParser',
     'gc_response',
     'KNOWN_HEADERS',
+    'MetricsRegistry',
     'NetworkSession',
+    'ProxyPool',
+    'RateLimiter',
     'Request',
+    'RequestScheduler',
     'Response',
+    'ResponseSink',
+    'ResponseTiming',
+    'RetryPolicy',
+    'ScheduledRequest',
+    'TimeoutScheduler',
+    'TokenBucket',
     'VersionChecker',
 )
 
 from .client import Client
+from .event_stream import EventStreamParser
+from .manager import AsyncNetworkSession
 from .manager import gc_response
 from .manager import KNOWN_HEADERS
 from .manager import NetworkSession
 from .manager import Request
 from .manager import Response
+from .metrics import MetricsRegistry
+from .metrics import ResponseTiming
+from .proxy_pool import ProxyPool
+from .rate_limit import RateLimiter
+from .rate_limit import TokenBucket
+from .retry import CircuitBreaker
+from .retry import CircuitOpenError
+from .retry import RetryPolicy
+from .scheduler import RequestScheduler
+from .scheduler import ScheduledRequest
+from .sink import ResponseSink
+from .timeouts import TimeoutScheduler
 from .version_check import VersionChecker
@@ -8,13 +8,21 @@ __all__ = (
     'Authenticator',
     'Client',
     'Conversation',
+    'ConversationStore',
     'Message',
+    'MessageList',
+    'StoredConversation',
+    'StoredMessageList',
     'User',
 )
 
 from .auth import Authenticator
 from .chatgpt import Client
+from .store import ConversationStore
+from .store import StoredConversation
+from .store import StoredMessageList
 from .structures import Action
 from .structures import Conversation
 from .structures import Message
+from .structures import MessageList
 from .structures import User
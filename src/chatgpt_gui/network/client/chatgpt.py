@@ -8,9 +8,12 @@ __all__ = (
     'Client',
 )
 
+import asyncio
 import datetime as dt
 import json
 import os
+import time
+from collections.abc import Callable
 from json import JSONDecodeError
 from typing import Any
 from uuid import UUID
@@ -20,12 +23,24 @@ from PySide6.QtNetwork import *
 
 from ...constants import *
 from ...models import CaseInsensitiveDict
+from ...models import DeferredCallable
+from ...utils import atomic_write
 from ...utils import decode_url
 from ...utils import hide_windows_file
+from ..event_stream import EventStreamParser
 from ..manager import NetworkSession
 from ..manager import Request
 from ..manager import Response
+from ..proxy_pool import ProxyPool
+from ..rate_limit import RateLimiter
+from ..rate_limit import TokenBucket
+from ..retry import CircuitBreaker
+from ..retry import CircuitOpenError
+from ..retry import RetryPolicy
+from ..scheduler import RequestScheduler
+from ..scheduler import ScheduledRequest
 from .auth import Authenticator
+from .store import ConversationStore
 from .structures import Action
 from .structures import Conversation
 from .structures import Message
@@ -37,8 +52,10 @@ class Client(QObject):
     """Asynchronous HTTP REST Client that interfaces with ChatGPT."""
 
     authenticationRequired = Signal()
+    messageFailed = Signal(Conversation)
     receivedError = Signal(str, int)
     receivedMessage = Signal(Message, Conversation)
+    receivedMessageDelta = Signal(Message, Conversation)
     signedOut = Signal()
 
     def __init__(self, parent: QObject, **kwargs) -> None:
@@ -51,9 +68,24 @@ class Client(QObject):
             3. user's .session config file (Created by application)
 
         :keyword session_token: Session token, allows for creation of access tokens.
+        :keyword max_concurrent_messages: Maximum amount of messages generated at once. Defaults to 2.
+        :keyword conversation_store: Path of the database to save conversations to.
+        :keyword session_save_delay: Milliseconds to wait after session data changes before saving it.
+            Defaults to 1000.
+        :keyword keep_alive_interval: Seconds between reconnecting to the host while idle. Defaults to 60.
+        :keyword keep_alive_timeout: Seconds without requests before connections are no longer kept alive.
+            Defaults to 600.
+        :keyword max_retries: Maximum amount of times a request which failed temporarily is sent again. Defaults to 3.
+        :keyword rate_limiter: :py:class:`RateLimiter` to pace requests with, which can be shared between clients.
+            Defaults to a limiter with separate budgets for conversations, models, and authentication.
+        :keyword metrics: :py:class:`MetricsRegistry` to record the timing of every request in.
+        :keyword proxies: URLs of proxies to spread requests over. Overrides the proxy set with :py:attr:`proxy`.
+        :keyword proxy_strategy: How the proxy of each request is selected. Defaults to round_robin.
+        :keyword proxy_health_url: URL to periodically probe the proxies with. Defaults to no probes.
         """
         super().__init__(parent)
         self.receivedMessage.connect(lambda msg, convo: print(f'Conversation: {convo.uuid} | {msg}'))
+        self.receivedMessage.connect(lambda msg, convo: self.store.append(convo))
 
         self.authenticator = Authenticator(self)
         self.authenticator.authenticationSuccessful.connect(self.new_session)
@@ -61,13 +93,44 @@ class Client(QObject):
         self.authenticator.updateUserAgent.connect(self._user_agent_updated)
 
         self.conversations: dict[UUID, Conversation] = {}
+        self.store: ConversationStore = ConversationStore(kwargs.pop('conversation_store', CG_CONVERSATION_STORE_PATH))
         self.host: str = 'chat.openai.com'
         self.models: list[str] | None = None
         self.session_data: Session = Session()
 
+        # Stop sending requests while the host is failing, instead of making every request wait to fail
+        self.circuit_breaker: CircuitBreaker = CircuitBreaker()
+        self.retry_policy: RetryPolicy = RetryPolicy(
+            max_retries=kwargs.pop('max_retries', 3), circuit_breaker=self.circuit_breaker
+        )
+
+        # Wait for our turn instead of sending bursts of requests that would be rejected with 429 Too Many Requests
+        self.rate_limiter: RateLimiter = kwargs.pop('rate_limiter', None) or self.default_rate_limiter()
+
+        self.first_message_elapsed: dt.timedelta | None = None
+        self.session_writes: int = 0
+        self.session_writes_avoided: int = 0
+
         self._first_request: bool = True
         self._access_token: str | None = None
 
+        # Session data is written by a single background thread, so writes happen in the order they are scheduled
+        self._session_writer: QThreadPool = QThreadPool(self)
+        self._session_writer.setMaxThreadCount(1)
+        self._session_save_timer: QTimer = QTimer(self)
+        self._session_save_timer.setSingleShot(True)
+        self._session_save_timer.setInterval(kwargs.pop('session_save_delay', 1000))
+        self._session_save_timer.timeout.connect(self._write_session_data)  # pyright: ignore[reportGeneralTypeIssues]
+        if (app := QCoreApplication.instance()) is not None:
+            app.aboutToQuit.connect(self.flush_session_data)  # pyright: ignore[reportGeneralTypeIssues]
+
+        # Keep the connection to the host open while idle, until no requests are sent for a while
+        self.keep_alive_timeout: float = kwargs.pop('keep_alive_timeout', 600.0)
+        self._last_activity: float = time.monotonic()
+        self._keep_alive_timer: QTimer = QTimer(self)
+        self._keep_alive_timer.setInterval(int(kwargs.pop('keep_alive_interval', 60.0) * 1000))
+        self._keep_alive_timer.timeout.connect(self._keep_alive)  # pyright: ignore[reportGeneralTypeIssues]
+
         # Load session token
         _session_token: str | None = kwargs.pop('session_token', os.getenv('CHATGPT_SESSION_AUTH', None))
         if _session_token is None and (CG_SESSION_PATH.is_file() or CG_SESSION_PATH_OLD.is_file()):
@@ -81,15 +144,28 @@ class Client(QObject):
                 CG_SESSION_PATH.unlink()
             else:
                 self.session_data = Session.from_json(_session_data)
+                self.session_data.dirty = False
         else:
             self.session_data.session_token = _session_token
 
         self.authenticator.session_data = self.session_data
 
-        self.session: NetworkSession = NetworkSession(self)
+        self.session: NetworkSession = NetworkSession(
+            self, cookie_path=CG_COOKIES_PATH, metrics=kwargs.pop('metrics', None)
+        )
+        # Emitted for the replies of every manager of the session, including those of proxies
+        self.session.manager.finished.connect(self._record_activity)  # pyright: ignore[reportGeneralTypeIssues]
+
+        # Spread requests over several proxies, ejecting proxies which fail until they pass a health probe again
+        self.proxy_pool: ProxyPool = ProxyPool(
+            self.session, kwargs.pop('proxies', ()), strategy=kwargs.pop('proxy_strategy', 'round_robin'),
+            health_url=kwargs.pop('proxy_health_url', None), parent=self
+        )
+        self.scheduler: RequestScheduler = RequestScheduler(
+            self.session, kwargs.pop('max_concurrent_messages', 2), parent=self, rate_limiter=self.rate_limiter
+        )
         self.session.headers = CaseInsensitiveDict({
             'Accept': '*/*',
-            # 'Accept-Encoding': ', '.join(('gzip', 'deflate', 'br')),
             'Accept-Language': 'en-US,en;q=0.5',
             'Connection': 'keep-alive',
             'DNT': '1',
@@ -104,21 +180,39 @@ class Client(QObject):
             'X-OpenAI-Assistant-App-Id': '',
         })
 
-        if self.session_token:
-            self.set_cookie('__Secure-next-auth.session-token', self.session_token)
-
-        if self.session_data.cf_bm:
-            self.set_cookie('__cf_bm', self.session_data.cf_bm)
-
-        if self.session_data.cf_unique_visitor_id:
-            self.set_cookie('_cfuvid', self.session_data.cf_unique_visitor_id)
-
-        if self.session_data.cf_clearance:
-            self.set_cookie('cf_clearance', self.session_data.cf_clearance)
+        # Only fall back to the session data for cookies that weren't restored from the cookie jar,
+        # as restored cookies keep the domain and expiration date given by the server
+        for name, value in (
+                ('__Secure-next-auth.session-token', self.session_token),
+                ('__cf_bm', self.session_data.cf_bm),
+                ('_cfuvid', self.session_data.cf_unique_visitor_id),
+                ('cf_clearance', self.session_data.cf_clearance),
+        ):
+            if value and self.session.get_cookie(name) is None:
+                self.set_cookie(name, value)
 
         if self.session_data.user_agent:
             self.session.headers['User-Agent'] = self.session_data.user_agent
 
+    @staticmethod
+    def default_rate_limiter() -> RateLimiter:
+        """Create a :py:class:`RateLimiter` with the default budget for each class of ChatGPT endpoint.
+
+        Messages are limited to bursts of 3, then one every 3 seconds.
+        Models and authentication requests are limited to bursts of 2, then one every 5 seconds.
+        Any other request is limited to bursts of 10, then 2 per second.
+        """
+        return RateLimiter({
+            'conversation': TokenBucket(rate=1 / 3, capacity=3),
+            'models': TokenBucket(rate=1 / 5, capacity=2),
+            'auth': TokenBucket(rate=1 / 5, capacity=2),
+            'default': TokenBucket(rate=2, capacity=10),
+        }, endpoints={
+            'conversation': 'backend-api/conversation',
+            'models': 'backend-api/models',
+            'auth': 'api/auth/session',
+        })
+
     @property
     def api_root(self) -> str:
         """Root of sent API requests."""
@@ -235,7 +329,12 @@ class Client(QObject):
 
     @session_token.deleter
     def session_token(self) -> None:
+        # Cancel any pending writes, so the deleted session isn't written again
+        self._session_save_timer.stop()
+        self._session_writer.waitForDone()
+
         self.session_data.clear()
+        self.session_data.dirty = False
         self.delete_cookie('__Secure-next-auth.session-token')
         if CG_SESSION_PATH.is_file():
             CG_SESSION_PATH.unlink()
@@ -253,35 +352,108 @@ class Client(QObject):
         self.session.headers['User-Agent'] = user_agent
         self.save_session_data()
 
+    def _keep_alive(self) -> None:
+        """Reconnect to the host if the connection was closed, unless the client has been idle for too long."""
+        if time.monotonic() - self._last_activity > self.keep_alive_timeout:
+            self._keep_alive_timer.stop()
+            return
+
+        self._prewarm_connections()
+
+    def _prewarm_connections(self) -> None:
+        """Connect to the host through each healthy proxy of the pool, or through the client proxy if it's empty.
+
+        Requests are never sent around a non-empty pool, so connections which bypass it would never be reused.
+        """
+        if pooled := self.proxy_pool.healthy:
+            for pooled_proxy in pooled:
+                self.session.prewarm(self.api_root, pooled_proxy.proxy)
+        elif not self.proxy_pool.proxies:
+            self.session.prewarm(self.api_root)
+
+    def _record_activity(self, reply: QNetworkReply) -> None:
+        """Record that a response was received, keeping the connection alive while idle afterwards.
+
+        Replies without a status, such as failed requests and connections made by prewarming, are ignored.
+        """
+        if reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute) is None:
+            return
+
+        self._last_activity = time.monotonic()
+        if not self._keep_alive_timer.isActive():
+            self._keep_alive_timer.start()
+
     def _get(self, path: str, update_auth_on_401: bool = True, **kwargs) -> Response:
         """Get a :py:class:`Response` from ChatGPT.
 
         :param path: path to append to the API root
         :param update_auth_on_401: run self._refresh_auth if response status code is 401 Unauthorized
         :param kwargs: Key word arguments to pass to the requests GET Request.
+        :raises CircuitOpenError: If requests to the host are failing.
         """
         if self._first_request:
             self._first_request = False
             self._get('chat')
             self.refresh_auth()
 
-        response: Response = self.session.get(self.api_root + path.strip(), wait_until_finished=True, **kwargs)
+        request = Request('GET', self.api_root + path.strip(), **kwargs)
+        self.rate_limiter.acquire(request.url)
+
+        # Transient failures are retried according to the retry policy
+        response: Response = self.retry_policy.send(self.session, request)
+
+        if self._handle_get_response(response, update_auth_on_401) and self.refresh_auth():
+            response = self._get(path, False, **kwargs)
+            if response.code == 401:
+                # Refresh auth failed, ask user to re-authenticate.
+                self.authenticationRequired.emit()
+
+        return response
+
+    async def _aget(self, path: str, update_auth_on_401: bool = True, **kwargs) -> Response:
+        """Get a :py:class:`Response` from ChatGPT without blocking the running asyncio event loop.
 
-        if session_token := self.session.cookies.get('__Secure-next-auth.session-token'):
+        :param path: path to append to the API root
+        :param update_auth_on_401: run self._refresh_auth if response status code is 401 Unauthorized
+        :param kwargs: Key word arguments to pass to the requests GET Request.
+        :raises CircuitOpenError: If requests to the host are failing.
+        """
+        if self._first_request:
+            self._first_request = False
+            await self._aget('chat')
+            await self.arefresh_auth()
+
+        request = Request('GET', self.api_root + path.strip(), **kwargs)
+        await self.rate_limiter.aacquire(request.url)
+
+        response: Response = await self.retry_policy.asend(self.session, request)
+
+        if self._handle_get_response(response, update_auth_on_401) and await self.arefresh_auth():
+            response = await self._aget(path, False, **kwargs)
+            if response.code == 401:
+                # Refresh auth failed, ask user to re-authenticate.
+                self.authenticationRequired.emit()
+
+        return response
+
+    def _handle_get_response(self, response: Response, update_auth_on_401: bool) -> bool:
+        """Update the session token from a finished :py:class:`Response` and report any errors.
+
+        :param response: Finished response to handle.
+        :param update_auth_on_401: Whether a 401 Unauthorized response should refresh authentication.
+        :return: True if authentication should be refreshed before retrying the request.
+        """
+        if session_token := self.session.get_cookie('__Secure-next-auth.session-token'):
             self.session_token = session_token
 
         if response.code and not response.ok:
             # Handle errors
-            if response.code == 401 and update_auth_on_401 and self.access_token is not None:
-                if self.refresh_auth():
-                    response = self._get(path, False, **kwargs)
-                    if response.code == 401:
-                        # Refresh auth failed, ask user to re-authenticate.
-                        self.authenticationRequired.emit()
-            elif response.code != 401:
-                self.receivedError.emit(response.url.toDisplayString(), response.code)
+            if response.code == 401:
+                return update_auth_on_401 and self.access_token is not None
 
-        return response
+            self.receivedError.emit(response.url.toDisplayString(), response.code)
+
+        return False
 
     @staticmethod
     def _migrate_session_format() -> None:
@@ -308,6 +480,13 @@ class Client(QObject):
         """
         return self._get('backend-api/models').json.get('models')
 
+    async def aget_models(self) -> list[dict[str, Any]] | None:
+        """Get the list of models to use with ChatGPT without blocking the running asyncio event loop.
+
+        :return: List of model data. The "slug" key is the model name.
+        """
+        return (await self._aget('backend-api/models')).json.get('models')
+
     def get_image(self, url: str) -> bytes:
         """Get an image using ChatGPT.
 
@@ -328,67 +507,212 @@ class Client(QObject):
 
         return response.data
 
-    def save_session_data(self) -> None:
-        """Dump the session data to its config file."""
+    @staticmethod
+    def _dump_session_data(data: str) -> None:
+        """Atomically replace the session config file with the given JSON text."""
         hide_windows_file(CG_SESSION_PATH, unhide=True)
-        CG_SESSION_PATH.write_text(json.dumps(self.session_data.to_json(), indent=2), encoding='utf8')
+        atomic_write(CG_SESSION_PATH, data)
         hide_windows_file(CG_SESSION_PATH)
 
-    def send_message(self, message_text: str, conversation: Conversation) -> None:
-        """Send a message and emit the AI's response through `the `receivedMessage`` signal.
+    def _write_session_data(self) -> None:
+        """Write the session data on a background thread if it changed since it was last saved."""
+        if not self.session_data.dirty:
+            return
 
-        Automatically handles the last message id.
+        # Serialize on this thread, so the written data is a consistent snapshot
+        data: str = json.dumps(self.session_data.to_json(), indent=2)
+        self.session_data.dirty = False
+        self.session_writes += 1
+        self._session_writer.start(DeferredCallable(self._dump_session_data, data))
+
+    def flush_session_data(self) -> None:
+        """Immediately save the session data if it changed, and wait for any pending writes to finish."""
+        self._session_save_timer.stop()
+        self._session_writer.waitForDone()
+
+        if self.session_data.dirty:
+            self._dump_session_data(json.dumps(self.session_data.to_json(), indent=2))
+            self.session_data.dirty = False
+            self.session_writes += 1
+
+    def save_session_data(self) -> None:
+        """Schedule the session data to be saved to its config file, if it changed since it was last saved.
+
+        The data is saved on a background thread after a short delay, so multiple changes are written once.
+        Calls which don't result in a new write are counted by ``session_writes_avoided``.
+        """
+        if not self.session_data.dirty or self._session_save_timer.isActive():
+            self.session_writes_avoided += 1
+            return
+
+        self._session_save_timer.start()
+
+    def _create_action(self, message_text: str, conversation: Conversation) -> Action:
+        """Create the :py:class:`Action` to send a message, replying to the last message in the conversation.
 
         :param message_text: Message to send.
         :param conversation: Conversation to send message in.
-        :raises ValueError: If Response couldn't be parsed as a text/event-stream.
         """
-        if not self.models:
-            if not (models := self.get_models()):
-                raise ValueError('Couldn\'t get model data from ChatGPT. Check to make sure the session is valid.')
-            self.models = [model['slug'] for model in models]
-
         if conversation.messages:
             parent_message: Message = conversation.messages[-1]
         else:
             parent_message = Message()
 
         message: Message = Message(text=message_text)
-        action: Action = Action(self.models[0], conversation, [message], parent_message)
+        return Action(self.models[0], conversation, [message], parent_message)  # type: ignore
 
-        request: Request = Request(
+    def _create_message_request(self, action: Action) -> Request:
+        """Create the :py:class:`Request` which sends the given action to ChatGPT."""
+        return Request(
             'POST', self.api_root + 'backend-api/conversation',
             headers={'Accept': 'text/event-stream', 'Content-type': 'application/json'},
-            json=action.to_json(), timeout=180.0,
+            json=action.to_json(), timeout=180.0, stream=True,
         )
 
-        response: Response = request.send(self.session, wait_until_finished=True)
-        if not response.ok:
-            self.receivedError.emit(response.url.toDisplayString(), response.code)
-            return
+    def _load_models(self, priority: int, loaded: Callable[[], ScheduledRequest],
+                     failed: Callable[[], Any]) -> ScheduledRequest:
+        """Load the model data through the scheduler, then submit the request created by a callback.
 
-        # Get the finished stream from the text/event-stream
-        # Index -1 Is empty string, as the response ends with 2 newlines
-        # Index -2 Is the "[DONE]", signifier
-        # Index -3 Is the finished product
-        try:
-            last_stream: str = response.text.split('\n\n')[-3]
-        except IndexError as e:
-            raise ValueError(f'Message response is not a text/event-stream ({response.text}).') from e
+        If no request was sent yet, the session is started and its authentication refreshed first,
+        with each request submitted once the previous one finishes, so the event loop is never blocked.
+
+        :param priority: Priority of the submitted requests.
+        :param loaded: Callback once the models are loaded, returning the submitted follow-up request.
+        :param failed: Callback if any of the requests fails or is cancelled.
+        :return: Handle of the first request, which cancels the request in progress when cancelled.
+        """
+        def update_models(response: Response) -> bool:
+            if models := response.json.get('models'):
+                self.models = [model['slug'] for model in models]
+            return bool(models)
 
-        json_response: dict[str, Any] = json.loads(last_stream.removeprefix('data: ').strip())
-        response_message: Message = Message.from_json(json_response['message'])
+        def update_auth(response: Response) -> bool:
+            self._update_auth(response)
+            return True
 
-        conversation.messages.extend(action.messages)
-        conversation.messages.append(response_message)
+        steps: list[tuple[str, Callable[[Response], bool]]] = []
+        if self._first_request:
+            self._first_request = False
+            steps.append(('chat', lambda response: True))
+            if self._can_refresh_auth():
+                steps.append(('api/auth/session', update_auth))
+        steps.append(('backend-api/models', update_models))
+
+        def submit(step: int) -> ScheduledRequest:
+            path, handle = steps[step]
+
+            def finished(response: Response) -> None:
+                self._handle_get_response(response, False)
+                try:
+                    if scheduled.cancelled or not handle(response):
+                        failed()
+                        return
+                    scheduled.follow_up = submit(step + 1) if step + 1 < len(steps) else loaded()
+                except (CircuitOpenError, JSONDecodeError):
+                    failed()
+
+            scheduled: ScheduledRequest = self.scheduler.submit(
+                Request('GET', self.api_root + path), priority, on_cancel=failed, finished=finished
+            )
+            return scheduled
+
+        return submit(0)
+
+    def send_message(self, message_text: str, conversation: Conversation, priority: int = 0) -> ScheduledRequest:
+        """Send a message and emit the AI's response through `the `receivedMessage`` signal.
 
-        if conversation.uuid is None:
-            conversation.uuid = UUID(json_response['conversation_id'])
+        The message is queued in the client's :py:class:`RequestScheduler`, so messages in separate conversations
+        are generated in parallel, up to the scheduler's limit. This method returns without waiting for a response.
+        If the models weren't loaded yet, they are loaded through the scheduler before the message is submitted.
+
+        The response is read as a stream, and each partial message is emitted
+        through the ``receivedMessageDelta`` signal as soon as it arrives.
+        If the request fails or is cancelled, the ``messageFailed`` signal is emitted with the conversation.
+
+        Automatically handles the last message id.
+
+        :param message_text: Message to send.
+        :param conversation: Conversation to send message in.
+        :param priority: Messages with a higher priority are sent first when the scheduler is at its limit.
+        :return: Handle which can be used to track or cancel the message.
+        :raises CircuitOpenError: If requests to the host are failing.
+        """
+        started: float = time.perf_counter()
+        self.circuit_breaker.check(self.host)
+        failed = DeferredCallable(self.messageFailed.emit, conversation)
+
+        def submit() -> ScheduledRequest:
+            self.circuit_breaker.check(self.host)
+            action: Action = self._create_action(message_text, conversation)
+            stream = _MessageStream(self, action, started)
+
+            return self.scheduler.submit(
+                self._create_message_request(action), priority,
+                on_cancel=failed, finished=stream.finish, ready_read=stream.read
+            )
+
+        if not self.models:
+            return self._load_models(priority, submit, failed)
+        return submit()
 
-        if conversation.uuid not in self.conversations:
-            self.conversations[conversation.uuid] = conversation
+    async def asend_message(self, message_text: str, conversation: Conversation) -> Message | None:
+        """Send a message without blocking the running asyncio event loop.
+
+        Behaves the same as :py:meth:`send_message`, but waits for and returns the AI's response.
+        Many messages can be sent at once by composing calls with ``asyncio.gather``.
+
+        :param message_text: Message to send.
+        :param conversation: Conversation to send message in.
+        :return: The AI's response, or None if the request failed.
+        :raises CircuitOpenError: If requests to the host are failing.
+        :raises ValueError: If Response couldn't be parsed as a text/event-stream.
+        """
+        started: float = time.perf_counter()
+        if not self.models:
+            if not (models := await self.aget_models()):
+                raise ValueError('Couldn\'t get model data from ChatGPT. Check to make sure the session is valid.')
+            self.models = [model['slug'] for model in models]
+
+        self.circuit_breaker.check(self.host)
+        action: Action = self._create_action(message_text, conversation)
+        stream = _MessageStream(self, action, started)
+        future: asyncio.Future[Message | None] = asyncio.get_running_loop().create_future()
+
+        def handle_cancel() -> None:
+            self.messageFailed.emit(conversation)
+            if not future.done():
+                future.set_result(None)
+
+        def handle_finished(response: Response) -> None:
+            try:
+                future.set_result(stream.finish(response))
+            except ValueError as e:
+                future.set_exception(e)
+
+        scheduled: ScheduledRequest = self.scheduler.submit(
+            self._create_message_request(action),
+            on_cancel=handle_cancel, finished=handle_finished, ready_read=stream.read
+        )
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            scheduled.cancel()
+            raise
+
+    def load_conversation(self, uuid: UUID, limit: int | None = None) -> Conversation | None:
+        """Return an open conversation, or load it from the conversation store.
+
+        :param uuid: UUID of conversation to load.
+        :param limit: If given, only this many of the newest messages are read into memory,
+            and older messages are read from the store when accessed.
+        :return: The conversation, or None if it was never saved.
+        """
+        if (conversation := self.conversations.get(uuid)) is None:
+            if (conversation := self.store.load(uuid, limit)) is not None:
+                self.conversations[uuid] = conversation
 
-        self.receivedMessage.emit(response_message, conversation)
+        return conversation
 
     def hidden_token(self) -> str:
         """:return: The first and last 3 characters of the session token, seperated by periods."""
@@ -397,12 +721,13 @@ class Client(QObject):
             return f'{key[:3]}{"." * 50}{key[-3:]}'
         return 'None'
 
-    def refresh_auth(self) -> bool:
-        """Refresh authentication to OpenAI servers.
+    def _can_refresh_auth(self) -> bool:
+        """Check whether the current session is able to refresh authentication.
 
-        If session is invalid, ask for new credentials
+        If session is invalid, ask for new credentials.
+        Refresh the cloudflare clearance token if it is invalid.
 
-        :return: True if successful, else False.
+        :return: True if the session is valid, else False.
         """
         # If invalid session token, ask application for new session and return early.
         if not self.session_token or (
@@ -421,19 +746,20 @@ class Client(QObject):
         if not self.session_data.is_valid_clearance():
             self.authenticator.cloudflare_clearance()
 
-        response = self._get('api/auth/session')
+        return True
 
-        # Ignore next refresh if it has the same value
-        if etag := response.headers.get('ETag'):
-            self.session.headers['If-None-Match'] = etag
+    def _update_auth(self, response: Response) -> None:
+        """Update the session data from a finished ``api/auth/session`` response.
 
-        if cf_bm := self.session.cookies.get('__cf_bm'):
+        :param response: Response of the auth session endpoint.
+        """
+        if cf_bm := self.session.get_cookie('__cf_bm'):
             self.session_data.cf_bm = cf_bm
 
-        if cf_unique_visitor_id := self.session.cookies.get('_cfuvid'):
+        if cf_unique_visitor_id := self.session.get_cookie('_cfuvid'):
             self.session_data.cf_unique_visitor_id = cf_unique_visitor_id
 
-        if cf_clearance := self.session.cookies.get('cf_clearance'):
+        if cf_clearance := self.session.get_cookie('cf_clearance'):
             self.session_data.cf_clearance = cf_clearance
 
         if user := response.json.get('user'):
@@ -442,14 +768,51 @@ class Client(QObject):
         if session_expire := response.json.get('expires'):
             self.session_data.session_expires = dt.datetime.strptime(session_expire, CG_DATE_FORMAT)
 
-        if session_token := self.session.cookies.get('__Secure-next-auth.session-token'):
+        if session_token := self.session.get_cookie('__Secure-next-auth.session-token'):
             self.session_token = session_token
 
         if access_token := response.json.get('accessToken'):
             self.access_token = access_token
 
+        self.save_session_data()
+
+    def refresh_auth(self) -> bool:
+        """Refresh authentication to OpenAI servers.
+
+        If session is invalid, ask for new credentials
+
+        :return: True if successful, else False.
+        """
+        if not self._can_refresh_auth():
+            return False
+
+        self._update_auth(self._get('api/auth/session'))
         return True
 
+    async def arefresh_auth(self) -> bool:
+        """Refresh authentication to OpenAI servers without blocking the running asyncio event loop.
+
+        If session is invalid, ask for new credentials
+
+        :return: True if successful, else False.
+        """
+        if not self._can_refresh_auth():
+            return False
+
+        self._update_auth(await self._aget('api/auth/session'))
+        return True
+
+    def prewarm(self) -> None:
+        """Connect to the host in the background, so the first request doesn't wait for the connection to be made.
+
+        Should be called as soon as possible after the client is created and its proxy is set.
+        The connection is kept alive while idle, see ``keep_alive_timeout``.
+        If the proxy pool isn't empty, a connection is made through each of its healthy proxies instead.
+        """
+        self._prewarm_connections()
+        self._last_activity = time.monotonic()
+        self._keep_alive_timer.start()
+
     def sign_in(self, username: str, password: str) -> None:
         """Signin to OpenAI using the specified username and password.
 
@@ -470,9 +833,107 @@ class Client(QObject):
         self.refresh_auth()
 
     def delete_cookie(self, name: str) -> None:
-        """Delete given cookie if cookie exists."""
-        self.session.clear_cookies(self.host, '/', name)
+        """Delete every cookie with the given name, on any domain."""
+        self.session.cookie_jar.remove(name=name)
 
     def set_cookie(self, name: str, value: str) -> None:
-        """Set cookie value in Cookie jar."""
+        """Set cookie value in Cookie jar, replacing cookies with the same name on any domain.
+
+        Cookies that already have the value are kept, along with the domain and expiration date set by the server.
+        """
+        if self.session.get_cookie(name) == value:
+            return
+
+        self.session.cookie_jar.remove(name=name)
         self.session.set_cookie(name, value, self.host)
+
+
+class _MessageStream:
+    """Reads the ``text/event-stream`` response of a sent :py:class:`Action` as it arrives."""
+
+    def __init__(self, client: Client, action: Action, started: float) -> None:
+        """Create a new :py:class:`_MessageStream` for the given client and action.
+
+        :param client: Client which emits the received messages.
+        :param action: Action which was sent.
+        :param started: When the message was sent, from ``time.perf_counter``.
+        """
+        self.action: Action = action
+        self.client: Client = client
+        self.started: float = started
+        self.last_event: dict[str, Any] | None = None
+        self.parser: EventStreamParser = EventStreamParser()
+
+    def read(self, response: Response) -> None:
+        """Parse all available data from the response, emitting each partial message.
+
+        :param response: Response to read from.
+        """
+        # Error bodies are not event-streams, leave them for finish()
+        if not response.ok:
+            return
+
+        # Time from sending the first message of the session until its response starts arriving
+        if self.client.first_message_elapsed is None:
+            self.client.first_message_elapsed = dt.timedelta(seconds=time.perf_counter() - self.started)
+
+        conversation: Conversation = self.action.conversation
+
+        # Each event contains a snapshot of the entire message so far,
+        # so only the latest one needs to be kept.
+        for data in self.parser.feed(response.read()):
+            if data == '[DONE]':
+                continue
+
+            # Skip frames which aren't message events, such as keep-alive comments sent as data
+            try:
+                event: dict[str, Any] = json.loads(data)
+            except JSONDecodeError:
+                continue
+            if not isinstance(event, dict) or not event.get('message'):
+                continue
+
+            self.last_event = event
+            if conversation.uuid is None and event.get('conversation_id'):
+                conversation.uuid = UUID(event['conversation_id'])
+
+            self.client.receivedMessageDelta.emit(Message.from_json(event['message']), conversation)
+
+    def finish(self, response: Response) -> Message | None:
+        """Add the finished message to the conversation and emit it through the ``receivedMessage`` signal.
+
+        :param response: Finished response.
+        :return: The AI's response, or None if the request failed.
+        :raises ValueError: If Response couldn't be parsed as a text/event-stream.
+        """
+        # Messages aren't retried, as the server may have received them, but failures still count against the host
+        self.client.retry_policy.record(response)
+
+        if not response.ok:
+            # Aborted and failed connections have no status code to report
+            if response.code is not None:
+                self.client.receivedError.emit(response.url.toDisplayString(), response.code)
+
+            self.client.messageFailed.emit(self.action.conversation)
+            return None
+
+        # Parse any data that arrived alongside the finished signal
+        self.read(response)
+        if self.last_event is None:
+            self.client.messageFailed.emit(self.action.conversation)
+            raise ValueError(f'Message response from {response.url.toDisplayString()} is not a text/event-stream.')
+
+        conversation: Conversation = self.action.conversation
+        response_message: Message = Message.from_json(self.last_event['message'])
+
+        conversation.messages.extend(self.action.messages)
+        conversation.messages.append(response_message)
+
+        if conversation.uuid is None:
+            conversation.uuid = UUID(self.last_event['conversation_id'])
+
+        if conversation.uuid not in self.client.conversations:
+            self.client.conversations[conversation.uuid] = conversation
+
+        self.client.receivedMessage.emit(response_message, conversation)
+        return response_message
@@ -0,0 +1,425 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Persistent storage for conversations."""
+from __future__ import annotations
+
+__all__ = (
+    'ConversationStore',
+    'SearchResult',
+    'StoredConversation',
+    'StoredMessageList',
+)
+
+import datetime as dt
+import itertools
+import sqlite3
+import time
+from collections.abc import Iterable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import overload
+from uuid import UUID
+
+from .structures import Conversation
+from .structures import Message
+from .structures import MessageList
+
+_SCHEMA: str = '''
+CREATE TABLE IF NOT EXISTS conversations (
+    uuid TEXT PRIMARY KEY NOT NULL,
+    title TEXT NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    uuid TEXT PRIMARY KEY NOT NULL,
+    conversation_uuid TEXT NOT NULL REFERENCES conversations (uuid) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    text TEXT,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS conversations_updated ON conversations (updated DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS messages_position ON messages (conversation_uuid, position);
+'''
+
+# Full-text index that reads its content from the messages table, kept up to date by triggers
+_FTS_SCHEMA: str = '''
+CREATE VIRTUAL TABLE messages_fts USING fts5 (text, content = 'messages', content_rowid = 'rowid');
+CREATE TRIGGER messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, text) VALUES (new.rowid, new.text);
+END;
+CREATE TRIGGER messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+INSERT INTO messages_fts (messages_fts) VALUES ('rebuild');
+'''
+
+
+@dataclass
+class SearchResult:
+    """Message found by :py:meth:`ConversationStore.search`."""
+
+    conversation_uuid: UUID
+    message_uuid: UUID
+    title: str
+    role: str
+    snippet: str
+
+
+@dataclass
+class StoredConversation:
+    """Summary of a conversation in a :py:class:`ConversationStore`, without its messages."""
+
+    uuid: UUID
+    title: str
+    updated: dt.datetime
+    message_count: int
+
+
+class ConversationStore:
+    """SQLite database of every conversation and message.
+
+    Messages are only ever appended, so saving a conversation after each response writes a single row
+    instead of the whole conversation. Conversations are indexed by last update, and messages by their
+    conversation and position, so listing or loading a conversation only reads the rows it returns.
+    """
+
+    __slots__ = ('_connection', 'full_text_search', 'path')
+
+    def __init__(self, path: Path | str) -> None:
+        """Open the database at the given path, creating it if it doesn't exist.
+
+        :param path: Path of the database file, or ":memory:" for a temporary in-memory database.
+        """
+        self.path: Path | str = path
+        if isinstance(path, Path):
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._connection: sqlite3.Connection = sqlite3.connect(path)
+        # Write-ahead logging only syncs on checkpoints, making each append cheap
+        self._connection.execute('PRAGMA journal_mode = WAL')
+        self._connection.execute('PRAGMA synchronous = NORMAL')
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        self._connection.executescript(_SCHEMA)
+
+        self.full_text_search: bool = self._create_full_text_index()
+
+    def __contains__(self, uuid: UUID) -> bool:
+        """Whether a conversation with the given UUID is stored."""
+        return self._connection.execute(
+            'SELECT 1 FROM conversations WHERE uuid = ?', (str(uuid),)
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        """Amount of stored conversations."""
+        return self._connection.execute('SELECT COUNT(*) FROM conversations').fetchone()[0]
+
+    def _create_full_text_index(self) -> bool:
+        """Create the full-text index over message text if it doesn't exist, indexing any existing messages.
+
+        :return: False if SQLite was compiled without the FTS5 extension.
+        """
+        if self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+        ).fetchone() is not None:
+            return True
+
+        try:
+            # executescript commits before running, so wrap the statements in a transaction manually
+            self._connection.executescript(f'BEGIN; {_FTS_SCHEMA} COMMIT;')
+        except sqlite3.OperationalError:
+            self._connection.rollback()
+            return False
+        return True
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Quote each word of a query for FTS5, matching the last word as a prefix."""
+        terms: list[str] = [f'"{term.replace(chr(34), chr(34) * 2)}"' for term in query.split()]
+        return f'{" ".join(terms)}*'
+
+    @staticmethod
+    def _like_snippet(text: str, term: str, width: int = 60) -> str:
+        """Cut the text surrounding the first occurrence of the term."""
+        start: int = max(text.lower().find(term.lower()) - width // 2, 0)
+        snippet: str = text[start:start + width]
+        return f'{"..." if start else ""}{snippet}{"..." if start + width < len(text) else ""}'
+
+    def _next_position(self, uuid: UUID) -> int:
+        """Return the position after the last stored message of a conversation."""
+        return self._connection.execute(
+            'SELECT COALESCE(MAX(position) + 1, 0) FROM messages WHERE conversation_uuid = ?', (str(uuid),)
+        ).fetchone()[0]
+
+    @staticmethod
+    def _title(messages: Iterable[Message]) -> str:
+        """Create a title from the first line of the first message with text."""
+        for message in messages:
+            if message.text:
+                title: str = message.text.strip().split('\n', maxsplit=1)[0]
+                return title if len(title) <= 60 else f'{title[:57]}...'
+        return ''
+
+    def append(self, conversation: Conversation) -> int:
+        """Append any messages of the conversation that are not stored yet.
+
+        Messages are compared by count, so only messages added to the end of the conversation are written.
+
+        :param conversation: Conversation to save. Must have a UUID.
+        :return: Amount of messages written.
+        :raises ValueError: If the conversation has no UUID.
+        """
+        if conversation.uuid is None:
+            raise ValueError('Cannot store a conversation without a UUID.')
+
+        with self._connection:
+            stored: int = self.message_count(conversation.uuid)
+            if stored and stored >= len(conversation.messages):
+                return 0
+
+            position: int = self._next_position(conversation.uuid)
+            return self._insert(conversation.uuid, conversation.messages[stored:], position)
+
+    def _insert(self, uuid: UUID, messages: list[Message], position: int) -> int:
+        """Insert messages at the given position of a conversation, creating the conversation if needed.
+
+        Must be called inside a transaction.
+        """
+        now: float = time.time()
+        self._connection.execute(
+            'INSERT INTO conversations (uuid, title, created, updated) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (uuid) DO UPDATE SET updated = excluded.updated',
+            (str(uuid), self._title(messages), now, now)
+        )
+        return self._connection.executemany(
+            'INSERT OR IGNORE INTO messages (uuid, conversation_uuid, position, role, text, created) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            ((str(message.uuid), str(uuid), position, message.role, message.text, now)
+             for position, message in enumerate(messages, start=position))
+        ).rowcount
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        self._connection.close()
+
+    def delete(self, uuid: UUID) -> bool:
+        """Delete a conversation and all of its messages.
+
+        :param uuid: UUID of conversation to delete.
+        :return: True if the conversation existed.
+        """
+        with self._connection:
+            return self._connection.execute('DELETE FROM conversations WHERE uuid = ?', (str(uuid),)).rowcount > 0
+
+    def extend(self, uuid: UUID, messages: Iterable[Message]) -> int:
+        """Append messages to the end of a stored conversation, creating it if it doesn't exist.
+
+        Messages which are already stored are skipped.
+
+        :param uuid: UUID of conversation to add messages to.
+        :param messages: Messages to add.
+        :return: Amount of messages written.
+        """
+        with self._connection:
+            return self._insert(uuid, list(messages), self._next_position(uuid))
+
+    def iter_messages(self, uuid: UUID) -> Iterator[Message]:
+        """Iterate over the messages of a stored conversation in order, reading them from the database lazily.
+
+        :param uuid: UUID of conversation to read messages from.
+        """
+        for message_uuid, role, text in self._connection.execute(
+            'SELECT uuid, role, text FROM messages WHERE conversation_uuid = ? ORDER BY position', (str(uuid),)
+        ):
+            yield Message(uuid=UUID(message_uuid), text=text, role=role)
+
+    def message_count(self, uuid: UUID) -> int:
+        """Return the amount of messages stored for a conversation.
+
+        :param uuid: UUID of conversation to count messages of.
+        """
+        return self._connection.execute(
+            'SELECT COUNT(*) FROM messages WHERE conversation_uuid = ?', (str(uuid),)
+        ).fetchone()[0]
+
+    def recent(self, offset: int = 0, limit: int = 50) -> list[StoredConversation]:
+        """Return a page of stored conversations, starting from the most recently updated.
+
+        :param offset: Amount of conversations to skip.
+        :param limit: Maximum amount of conversations to return.
+        """
+        rows = self._connection.execute(
+            'SELECT uuid, title, updated, '
+            '(SELECT COUNT(*) FROM messages WHERE conversation_uuid = conversations.uuid) '
+            'FROM conversations ORDER BY updated DESC LIMIT ? OFFSET ?', (limit, offset)
+        )
+        return [
+            StoredConversation(UUID(uuid), title, dt.datetime.fromtimestamp(updated), message_count)
+            for uuid, title, updated, message_count in rows
+        ]
+
+    def search(self, query: str, limit: int = 20) -> list[SearchResult]:
+        """Search the text of every stored message, returning the best matches first.
+
+        Every word in the query must appear in a message for it to match. The last word may be incomplete.
+        Matches are ranked with BM25 if full-text search is available,
+        otherwise messages are matched by the first word, newest first.
+
+        :param query: Words to search for.
+        :param limit: Maximum amount of results to return.
+        """
+        if not query.split():
+            return []
+
+        if self.full_text_search:
+            rows = self._connection.execute(
+                'SELECT messages.conversation_uuid, messages.uuid, conversations.title, messages.role, '
+                "snippet(messages_fts, 0, '', '', '...', 12) "
+                'FROM messages_fts '
+                'JOIN messages ON messages.rowid = messages_fts.rowid '
+                'JOIN conversations ON conversations.uuid = messages.conversation_uuid '
+                'WHERE messages_fts MATCH ? ORDER BY rank LIMIT ?', (self._fts_query(query), limit)
+            )
+        else:
+            term: str = query.split()[0]
+            pattern: str = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            rows = (
+                (conversation_uuid, uuid, title, role, self._like_snippet(text, term))
+                for conversation_uuid, uuid, title, role, text in self._connection.execute(
+                    'SELECT messages.conversation_uuid, messages.uuid, conversations.title, messages.role, '
+                    'messages.text '
+                    'FROM messages JOIN conversations ON conversations.uuid = messages.conversation_uuid '
+                    "WHERE messages.text LIKE ? ESCAPE '\\' ORDER BY messages.created DESC LIMIT ?",
+                    (f'%{pattern}%', limit)
+                )
+            )
+
+        return [
+            SearchResult(UUID(conversation_uuid), UUID(uuid), title, role, snippet)
+            for conversation_uuid, uuid, title, role, snippet in rows
+        ]
+
+    def load(self, uuid: UUID, limit: int | None = None) -> Conversation | None:
+        """Load a stored conversation with its messages.
+
+        :param uuid: UUID of conversation to load.
+        :param limit: If given, only this many of the newest messages are read,
+            and older messages are read from the store when accessed. See :py:class:`StoredMessageList`.
+        :return: The conversation, or None if it isn't stored.
+        """
+        if uuid not in self:
+            return None
+
+        if limit is not None:
+            return Conversation(uuid=uuid, messages=StoredMessageList(self, uuid, limit))
+        return Conversation(uuid=uuid, messages=MessageList(self.iter_messages(uuid)))
+
+    def messages(self, uuid: UUID, start: int, stop: int) -> list[Message]:
+        """Return a range of the messages of a stored conversation, in order.
+
+        :param uuid: UUID of conversation to read messages from.
+        :param start: Index of the first message to return.
+        :param stop: Index after the last message to return.
+        """
+        if stop <= start:
+            return []
+
+        return [
+            Message(uuid=UUID(message_uuid), text=text, role=role)
+            for message_uuid, role, text in self._connection.execute(
+                'SELECT uuid, role, text FROM messages WHERE conversation_uuid = ? ORDER BY position LIMIT ? OFFSET ?',
+                (str(uuid), stop - start, start)
+            )
+        ]
+
+
+class StoredMessageList(MessageList):
+    """Messages of a stored conversation, of which only the newest are kept in memory.
+
+    Older messages are read from the :py:class:`ConversationStore` whenever they are accessed, so opening a long
+    conversation only reads the messages that are shown. Appended messages are kept in memory.
+    Replacing, removing, or inserting messages first reads every older message into memory.
+    """
+
+    __slots__ = ('_offset', '_store', '_uuid')
+
+    def __init__(self, store: ConversationStore, uuid: UUID, limit: int) -> None:
+        """Create a new :py:class:`StoredMessageList`, reading the newest messages of a conversation.
+
+        :param store: Store to read messages from.
+        :param uuid: UUID of the stored conversation.
+        :param limit: Amount of the newest messages to keep in memory.
+        """
+        self._store: ConversationStore = store
+        self._uuid: UUID = uuid
+
+        count: int = store.message_count(uuid)
+        self._offset: int = max(count - limit, 0)
+        """Amount of older messages which are not in memory."""
+        super().__init__(store.messages(uuid, self._offset, count))
+
+    def __iter__(self) -> Iterator[Message]:
+        """Iterate over the messages in the list, reading older messages from the store lazily."""
+        yield from itertools.islice(self._store.iter_messages(self._uuid), self._offset)
+        for index in range(self._offset, len(self)):
+            yield self._get(index)
+
+    def __len__(self) -> int:
+        """Amount of messages in the list, including messages which are not in memory."""
+        return self._offset + len(self._texts)
+
+    @overload
+    def __getitem__(self, index: int) -> Message: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Message]: ...
+
+    def __getitem__(self, index: int | slice) -> Message | list[Message]:
+        """Return the message at the index, or a list of messages in the slice.
+
+        Older messages in a slice are read from the store at once.
+        """
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            return super().__getitem__(index)
+
+        start, stop, _ = index.indices(len(self))
+        return (self._store.messages(self._uuid, start, min(stop, self._offset)) +
+                [self._get(i) for i in range(max(start, self._offset), stop)])
+
+    def __setitem__(self, index: int, message: Message) -> None:  # type: ignore[override]
+        """Replace the message at the index. Slice assignment is not supported."""
+        self._load()
+        super().__setitem__(index, message)
+
+    def __delitem__(self, index: int) -> None:  # type: ignore[override]
+        """Remove the message at the index. Slice deletion is not supported."""
+        self._load()
+        super().__delitem__(index)
+
+    def _get(self, index: int) -> Message:
+        if index >= self._offset:
+            return super()._get(index - self._offset)
+
+        if not (messages := self._store.messages(self._uuid, index, index + 1)):
+            raise IndexError(f'{type(self).__name__} index out of range')
+        return messages[0]
+
+    def _load(self) -> None:
+        """Read every message which is not in memory, so indexes of the list match its columns."""
+        if not self._offset:
+            return
+
+        messages: MessageList = MessageList(self._store.messages(self._uuid, 0, self._offset))
+        messages.extend(MessageList._get(self, index) for index in range(len(self._texts)))
+
+        self._offset = 0
+        self._role_names, self._roles = messages._role_names, messages._roles
+        self._texts, self._uuids = messages._texts, messages._uuids
+
+    def insert(self, index: int, message: Message) -> None:
+        """Insert a message before the index."""
+        self._load()
+        super().insert(index, message)
@@ -8,27 +8,63 @@ __all__ = (
     'Action',
     'Conversation',
     'Message',
+    'MessageList',
     'Session',
     'User',
 )
 
 import datetime as dt
+import sys
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import MutableSequence
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import overload
 from uuid import UUID
 from uuid import uuid4
 
 from ...constants import *
 
 
-@dataclass
+@dataclass(init=False, repr=False, slots=True)
 class Message:
-    """ChatGPT message sent or received."""
+    """ChatGPT message sent or received.
+
+    The UUID is held as a 128-bit integer, and the role is interned, so messages with the same role share its string.
+    """
+
+    uuid_int: int
+    text: str | None
+    role: str
+
+    def __init__(self, uuid: UUID | int | None = None, text: str | None = None, role: str = 'user') -> None:
+        """Create a new :py:class:`Message`.
+
+        :param uuid: UUID of the message, or its integer value. Generated if not provided.
+        :param text: Text content of the message.
+        :param role: Who sent the message, such as "user" or "assistant".
+        """
+        if uuid is None:
+            uuid = uuid4()
+
+        self.uuid_int = uuid if isinstance(uuid, int) else uuid.int
+        self.text = text
+        self.role = sys.intern(role)
+
+    def __repr__(self) -> str:
+        """Representation of the :py:class:`Message` with its UUID, text, and role."""
+        return f'{type(self).__name__}(uuid={self.uuid!r}, text={self.text!r}, role={self.role!r})'
 
-    uuid: UUID = field(default_factory=uuid4)
-    text: str | None = field(default=None)
-    role: str = field(default='user')
+    @property
+    def uuid(self) -> UUID:
+        """UUID of the message."""
+        return UUID(int=self.uuid_int)
+
+    @uuid.setter
+    def uuid(self, value: UUID) -> None:
+        self.uuid_int = value.int
 
     @classmethod
     def from_json(cls, data: dict[str, Any]) -> Message:
@@ -58,7 +94,127 @@ class Message:
         return data
 
 
-@dataclass
+class MessageList(MutableSequence[Message]):
+    """Columnar list of messages.
+
+    Instead of keeping a :py:class:`Message` object for each message, their UUIDs are packed into a single
+    :py:class:`bytearray` at 16 bytes each, roles are stored as a 1-byte index into a table of role names,
+    and texts are kept in a separate list.
+
+    :py:class:`Message` objects are created when accessed, so changes to them are NOT reflected in the list.
+    Assign the changed message back to its index instead.
+    """
+
+    __slots__ = ('_role_names', '_roles', '_texts', '_uuids')
+
+    def __init__(self, messages: Iterable[Message] = ()) -> None:
+        """Create a new :py:class:`MessageList`.
+
+        :param messages: Initial messages of the list.
+        """
+        self._role_names: list[str] = []
+        self._roles: bytearray = bytearray()
+        self._texts: list[str | None] = []
+        self._uuids: bytearray = bytearray()
+
+        self.extend(messages)
+
+    def __eq__(self, other: object) -> bool:
+        """Whether the other sequence contains equal messages in the same order."""
+        if not isinstance(other, (MessageList, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __iter__(self) -> Iterator[Message]:
+        """Iterate over the messages in the list."""
+        for index in range(len(self)):
+            yield self._get(index)
+
+    def __len__(self) -> int:
+        """Amount of messages in the list."""
+        return len(self._texts)
+
+    def __repr__(self) -> str:
+        """Representation of the :py:class:`MessageList` with its length."""
+        return f'<{type(self).__name__} ({len(self)} messages)>'
+
+    @overload
+    def __getitem__(self, index: int) -> Message: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Message]: ...
+
+    def __getitem__(self, index: int | slice) -> Message | list[Message]:
+        """Return the message at the index, or a list of messages in the slice."""
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'{type(self).__name__} index out of range')
+        return self._get(index)
+
+    def __setitem__(self, index: int, message: Message) -> None:  # type: ignore[override]
+        """Replace the message at the index. Slice assignment is not supported."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'{type(self).__name__} index out of range')
+
+        self._uuids[index * 16:index * 16 + 16] = message.uuid_int.to_bytes(16, 'big')
+        self._roles[index] = self._role_index(message.role)
+        self._texts[index] = message.text
+
+    def __delitem__(self, index: int) -> None:  # type: ignore[override]
+        """Remove the message at the index. Slice deletion is not supported."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'{type(self).__name__} index out of range')
+
+        del self._uuids[index * 16:index * 16 + 16]
+        del self._roles[index]
+        del self._texts[index]
+
+    def _get(self, index: int) -> Message:
+        return Message(
+            uuid=int.from_bytes(self._uuids[index * 16:index * 16 + 16], 'big'),
+            text=self._texts[index],
+            role=self._role_names[self._roles[index]]
+        )
+
+    def _role_index(self, role: str) -> int:
+        """Return the index of a role name, adding it to the role table if needed."""
+        try:
+            return self._role_names.index(role)
+        except ValueError:
+            if len(self._role_names) > 0xFF:
+                raise ValueError(f'{type(self).__name__} cannot hold more than 256 different roles.') from None
+            self._role_names.append(role)
+            return len(self._role_names) - 1
+
+    def append(self, message: Message) -> None:
+        """Add a message to the end of the list."""
+        self._uuids += message.uuid_int.to_bytes(16, 'big')
+        self._roles.append(self._role_index(message.role))
+        self._texts.append(message.text)
+
+    def extend(self, messages: Iterable[Message]) -> None:
+        """Add messages to the end of the list."""
+        for message in messages:
+            self.append(message)
+
+    def insert(self, index: int, message: Message) -> None:
+        """Insert a message before the index."""
+        index = min(max(index + len(self) if index < 0 else index, 0), len(self))
+
+        self._uuids[index * 16:index * 16] = message.uuid_int.to_bytes(16, 'big')
+        self._roles.insert(index, self._role_index(message.role))
+        self._texts.insert(index, message.text)
+
+
+@dataclass(slots=True)
 class Conversation:
     """ChatGPT conversation.
 
@@ -66,14 +222,19 @@ class Conversation:
     """
 
     uuid: UUID | None = field(default=None)
-    messages: list[Message] = field(default_factory=list)
+    messages: MessageList = field(default_factory=MessageList)
+
+    def __post_init__(self) -> None:
+        """Convert other message sequences into a :py:class:`MessageList`."""
+        if not isinstance(self.messages, MessageList):
+            self.messages = MessageList(self.messages)
 
     @classmethod
     def from_json(cls, data: dict[str, Any]) -> Conversation:
         """Load data from a JSON representation."""
         return cls(
             uuid=UUID(data['id']),
-            messages=[Message.from_json(message) for message in data['messages']],
+            messages=MessageList(Message.from_json(message) for message in data['messages']),
         )
 
     def to_json(self) -> dict[str, Any]:
@@ -84,7 +245,7 @@ class Conversation:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """Action sent to ChatGPT.
 
@@ -157,6 +318,14 @@ class Session:
     session_expires: dt.datetime | None = field(default=None)
     session_token: str | None = field(default=None)
     user_agent: str | None = field(default=None)
+    dirty: bool = field(default=True, init=False, repr=False, compare=False)
+    """Whether the data changed since it was last saved. Set whenever another field is assigned a different value."""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Mark the session data as dirty if a field is assigned a different value."""
+        if name != 'dirty' and getattr(self, name, None) != value:
+            super().__setattr__('dirty', True)
+        super().__setattr__(name, value)
 
     @classmethod
     def from_json(cls, data: dict[str, Any]) -> Session:
@@ -0,0 +1,149 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Incremental decoding of compressed HTTP response bodies."""
+from __future__ import annotations
+
+__all__ = (
+    'ACCEPT_ENCODING',
+    'ContentDecoder',
+    'SUPPORTED_ENCODINGS',
+)
+
+import zlib
+from importlib.util import find_spec
+from typing import Any
+from typing import Final
+
+SUPPORTED_ENCODINGS: Final[tuple[str, ...]] = ('gzip', 'deflate') + (('br',) if find_spec('brotli') else ())
+"""Content codings which can be decoded. Brotli is only supported if the ``brotli`` package is installed."""
+
+ACCEPT_ENCODING: Final[str] = ', '.join(SUPPORTED_ENCODINGS)
+"""Value of the ``Accept-Encoding`` header to request every supported content coding."""
+
+
+def _codings(content_encoding: str) -> list[str]:
+    """Split a ``Content-Encoding`` header value into its content codings, without identity codings."""
+    codings: list[str] = []
+    for coding in content_encoding.split(','):
+        coding = coding.strip().lower()
+        if coding == 'x-gzip':
+            coding = 'gzip'
+        if coding not in {'', 'identity'}:
+            codings.append(coding)
+    return codings
+
+
+class _Inflater:
+    """Decompress a gzip or deflate stream with zlib.
+
+    Some servers send deflate streams without the zlib header, so fall back to a raw deflate stream.
+    """
+
+    __slots__ = ('_decompressor', '_first_chunk', '_gzip')
+
+    def __init__(self, gzip: bool) -> None:
+        self._gzip: bool = gzip
+        self._first_chunk: bool = True
+        # Add 16 to window bits to expect a gzip header and trailer
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS if gzip else zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes) -> bytes:
+        try:
+            try:
+                result: bytes = self._decompressor.decompress(data)
+            except zlib.error:
+                if self._gzip or not self._first_chunk:
+                    raise
+                self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                result = self._decompressor.decompress(data)
+        except zlib.error as e:
+            raise ValueError(f'Response body could not be decoded: {e}') from e
+
+        self._first_chunk = self._first_chunk and not data
+        return result
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush()
+
+
+class _BrotliDecompressor:
+    """Decompress a brotli stream with the ``brotli`` package."""
+
+    __slots__ = ('_decompressor',)
+
+    def __init__(self) -> None:
+        import brotli
+
+        self._decompressor: Any = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        import brotli
+
+        try:
+            return self._decompressor.process(data)
+        except brotli.error as e:
+            raise ValueError(f'Response body could not be decoded: {e}') from e
+
+    def flush(self) -> bytes:
+        return b''
+
+
+class ContentDecoder:
+    """Incrementally decode a response body compressed with the codings of its ``Content-Encoding`` header.
+
+    Bytes are fed as they arrive from the network, and the decoded bytes available so far are returned,
+    so compressed bodies can be processed while they are still being received.
+    """
+
+    __slots__ = ('_decompressors', '_finished')
+
+    def __init__(self, content_encoding: str) -> None:
+        """Create a new :py:class:`ContentDecoder`.
+
+        :param content_encoding: Value of the ``Content-Encoding`` header, listing codings in the order applied.
+        :raises ValueError: If a content coding is not supported.
+        """
+        self._decompressors: list[_Inflater | _BrotliDecompressor] = []
+        self._finished: bool = False
+
+        # Codings are listed in the order they were applied, so decode them in reverse
+        for coding in reversed(_codings(content_encoding)):
+            match coding:
+                case 'gzip' | 'deflate':
+                    self._decompressors.append(_Inflater(gzip=coding == 'gzip'))
+                case 'br' if 'br' in SUPPORTED_ENCODINGS:
+                    self._decompressors.append(_BrotliDecompressor())
+                case _:
+                    raise ValueError(f'Content-Encoding "{coding}" is not supported.')
+
+    @property
+    def identity(self) -> bool:
+        """Whether the body has no content coding, so decoding returns it unchanged."""
+        return not self._decompressors
+
+    @staticmethod
+    def supports(content_encoding: str) -> bool:
+        """Whether every content coding of the given ``Content-Encoding`` header value can be decoded."""
+        return all(coding in SUPPORTED_ENCODINGS for coding in _codings(content_encoding))
+
+    def decode(self, data: bytes, final: bool = False) -> bytes:
+        """Decode some bytes of the body, returning any decoded bytes that are available.
+
+        :param data: Newly received bytes.
+        :param final: Whether these are the last bytes of the body, flushing any remaining decoded bytes.
+        :return: Decoded bytes.
+        :raises ValueError: If the body is not valid for its content coding, or data is given after the final bytes.
+        """
+        if self._finished:
+            if data:
+                raise ValueError('Cannot decode data after the end of the body.')
+            return b''
+
+        for decompressor in self._decompressors:
+            data = decompressor.decompress(data)
+            if final:
+                data += decompressor.flush()
+
+        self._finished = final
+        return data
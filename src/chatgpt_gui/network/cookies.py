@@ -0,0 +1,300 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Cookie storage for chatgpt_gui."""
+from __future__ import annotations
+
+__all__ = (
+    'CookieJar',
+)
+
+import json
+from collections import defaultdict
+from json import JSONDecodeError
+from pathlib import Path
+from typing import TypeAlias
+
+from PySide6.QtCore import *
+from PySide6.QtNetwork import *
+
+from ..utils import atomic_write
+from ..utils import hide_windows_file
+
+_CookieKey: TypeAlias = tuple[str, str, str]
+
+
+def _is_expired(cookie: QNetworkCookie, now: QDateTime) -> bool:
+    """Return whether a cookie with an expiration date has expired."""
+    return not cookie.isSessionCookie() and cookie.expirationDate() < now
+
+
+def _is_parent_path(path: str, reference: str) -> bool:
+    """Return whether the cookie path ``reference`` matches the URL path ``path``, following RFC 6265."""
+    if (not path and reference == '/') or path.startswith(reference):
+        return reference.endswith('/') or len(path) == len(reference) or path[len(reference)] == '/'
+    return False
+
+
+class CookieJar(QNetworkCookieJar):
+    """:py:class:`QNetworkCookieJar` indexed by domain, path, and name, which can be saved to a file.
+
+    Cookies are looked up, replaced, and deleted by their identifier without scanning the jar,
+    and cookies sent with a request are only searched for within the URL host and its parent domains.
+    Expired cookies are never sent, and are removed when they are found.
+
+    If the jar has a path, cookies are loaded from it when created, and saved to it shortly after changing.
+    Cookies without an expiration date are saved as well, so they last until they are deleted by the server.
+    """
+
+    def __init__(self, path: Path | None = None, parent: QObject | None = None, save_delay: int = 1000) -> None:
+        """Create a new :py:class:`CookieJar`, loading any cookies saved at the given path.
+
+        :param path: File to save cookies to. If None, cookies are only kept in memory.
+        :param parent: Parent QObject.
+        :param save_delay: Milliseconds to wait after a change before saving, so bursts of changes are saved once.
+        """
+        super().__init__(parent)
+        self.dirty: bool = False
+        self.path: Path | None = path
+
+        self._cookies: dict[_CookieKey, QNetworkCookie] = {}
+        self._domains: defaultdict[str, set[_CookieKey]] = defaultdict(set)
+        self._names: defaultdict[str, set[_CookieKey]] = defaultdict(set)
+
+        self._save_timer: QTimer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(save_delay)
+        self._save_timer.timeout.connect(self.save)  # pyright: ignore[reportGeneralTypeIssues]
+
+        if path is not None:
+            self.load()
+            if (app := QCoreApplication.instance()) is not None:
+                app.aboutToQuit.connect(self.save)  # pyright: ignore[reportGeneralTypeIssues]
+
+    def __contains__(self, cookie: QNetworkCookie) -> bool:
+        """Whether a cookie with the same identifier is in the jar."""
+        return self._key(cookie) in self._cookies
+
+    def __len__(self) -> int:
+        """Amount of cookies in the jar, including any expired cookies which have not been removed yet."""
+        return len(self._cookies)
+
+    @staticmethod
+    def _key(cookie: QNetworkCookie) -> _CookieKey:
+        """Return the identifier of a cookie, which is unique in the jar."""
+        return cookie.domain(), cookie.path(), cookie.name().toStdString()
+
+    def _mark_dirty(self) -> None:
+        """Record that the jar has unsaved changes, and schedule a save."""
+        self.dirty = True
+        if self.path is not None and not self._save_timer.isActive():
+            self._save_timer.start()
+
+    def _pop(self, key: _CookieKey) -> QNetworkCookie | None:
+        """Remove a cookie from the jar and its indexes by identifier, without marking the jar as changed."""
+        if (cookie := self._cookies.pop(key, None)) is None:
+            return None
+
+        domain, _, name = key
+        for index, value in ((self._domains, domain), (self._names, name)):
+            index[value].discard(key)
+            if not index[value]:
+                del index[value]
+
+        return cookie
+
+    def _put(self, cookie: QNetworkCookie) -> None:
+        """Add a cookie to the jar and its indexes, replacing any with the same identifier."""
+        key: _CookieKey = self._key(cookie)
+        self._cookies[key] = QNetworkCookie(cookie)
+        self._domains[key[0]].add(key)
+        self._names[key[2]].add(key)
+
+    def allCookies(self) -> list[QNetworkCookie]:  # pylint: disable=invalid-name
+        """Return every cookie in the jar which has not expired."""
+        self.remove_expired()
+        return list(self._cookies.values())
+
+    def cookiesForUrl(self, url: QUrl | str) -> list[QNetworkCookie]:  # pylint: disable=invalid-name
+        """Return the cookies to send with a request to the given URL, with the most specific paths first.
+
+        :param url: URL of the request.
+        """
+        url = QUrl(url)
+        host: str = url.host()
+        path: str = url.path()
+        encrypted: bool = url.scheme() in {'https', 'wss'}
+        now: QDateTime = QDateTime.currentDateTimeUtc()
+
+        # Host-only cookies are stored under the host, domain cookies under the host or a parent with a leading dot
+        labels: list[str] = host.split('.')
+        domains: list[str] = [host] + [f'.{".".join(labels[i:])}' for i in range(len(labels))]
+
+        expired: list[_CookieKey] = []
+        cookies: list[QNetworkCookie] = []
+        for domain in domains:
+            for key in self._domains.get(domain, ()):
+                cookie: QNetworkCookie = self._cookies[key]
+                if _is_expired(cookie, now):
+                    expired.append(key)
+                elif _is_parent_path(path, cookie.path()) and (encrypted or not cookie.isSecure()):
+                    cookies.append(cookie)
+
+        if expired:
+            for key in expired:
+                self._pop(key)
+            self._mark_dirty()
+
+        cookies.sort(key=lambda c: len(c.path()), reverse=True)
+        return cookies
+
+    def deleteCookie(self, cookie: QNetworkCookie) -> bool:  # pylint: disable=invalid-name
+        """Delete the cookie with the same identifier as the given cookie.
+
+        :return: True if a cookie was deleted.
+        """
+        if self._pop(self._key(cookie)) is None:
+            return False
+
+        self._mark_dirty()
+        return True
+
+    def insertCookie(self, cookie: QNetworkCookie) -> bool:  # pylint: disable=invalid-name
+        """Insert a cookie, replacing any cookie with the same identifier.
+
+        A cookie which has already expired deletes the cookie it would replace instead, as servers delete cookies
+        by setting them with an expiration date in the past.
+
+        :return: True if the cookie was inserted.
+        """
+        if _is_expired(cookie, QDateTime.currentDateTimeUtc()):
+            self.deleteCookie(cookie)
+            return False
+
+        self._put(cookie)
+        self._mark_dirty()
+        return True
+
+    def setAllCookies(self, cookie_list: list[QNetworkCookie]) -> None:  # pylint: disable=invalid-name
+        """Replace every cookie in the jar with the given cookies."""
+        self._cookies.clear()
+        self._domains.clear()
+        self._names.clear()
+        for cookie in cookie_list:
+            self._put(cookie)
+        self._mark_dirty()
+
+    def updateCookie(self, cookie: QNetworkCookie) -> bool:  # pylint: disable=invalid-name
+        """Replace the cookie with the same identifier as the given cookie.
+
+        :return: True if a cookie was replaced, False if there is no cookie to replace.
+        """
+        if self._key(cookie) not in self._cookies:
+            return False
+        return self.insertCookie(cookie)
+
+    def find(self, name: str, domain: str | None = None, path: str | None = None) -> QNetworkCookie | None:
+        """Return a cookie which has not expired by its name, and optionally its domain and path.
+
+        If multiple cookies match, the cookie with the longest domain is returned.
+
+        :param name: Name of the cookie.
+        :param domain: Domain of the cookie. If None, match any domain.
+        :param path: Path of the cookie. If None, match any path.
+        """
+        if domain is not None and path is not None:
+            keys = [(domain, path, name)]
+        else:
+            keys = sorted((
+                key for key in self._names.get(name, ())
+                if (domain is None or key[0] == domain) and (path is None or key[1] == path)
+            ), key=lambda k: len(k[0]), reverse=True)
+
+        now: QDateTime = QDateTime.currentDateTimeUtc()
+        for key in keys:
+            if (cookie := self._cookies.get(key)) is not None and not _is_expired(cookie, now):
+                return cookie
+        return None
+
+    def load(self) -> None:
+        """Replace the cookies in the jar with the cookies saved to its path, if the file exists.
+
+        Unreadable files are ignored, as cookies are sent again by the server.
+        """
+        if self.path is None or not self.path.is_file():
+            return
+
+        try:
+            raw_cookies: list[str] = json.loads(self.path.read_text(encoding='utf8'))
+        except (JSONDecodeError, UnicodeDecodeError):
+            return
+
+        now: QDateTime = QDateTime.currentDateTimeUtc()
+        self.setAllCookies([
+            cookie for raw_cookie in raw_cookies
+            for cookie in QNetworkCookie.parseCookies(raw_cookie.encode('utf8'))
+            if not _is_expired(cookie, now)
+        ])
+        self.dirty = False
+        self._save_timer.stop()
+
+    def remove(self, domain: str | None = None, path: str | None = None, name: str | None = None) -> bool:
+        """Remove every cookie which matches the given domain, path, and name.
+
+        Arguments which are None match every cookie.
+
+        :return: True if any cookies were removed.
+        """
+        if domain is not None and path is not None and name is not None:
+            keys = [(domain, path, name)]
+        elif domain is not None:
+            keys = list(self._domains.get(domain, ()))
+        elif name is not None:
+            keys = list(self._names.get(name, ()))
+        else:
+            keys = list(self._cookies)
+
+        removed: bool = False
+        for key in keys:
+            if (path is None or key[1] == path) and (name is None or key[2] == name) and self._pop(key) is not None:
+                removed = True
+
+        if removed:
+            self._mark_dirty()
+        return removed
+
+    def remove_expired(self) -> int:
+        """Remove every expired cookie from the jar.
+
+        :return: Amount of cookies removed.
+        """
+        now: QDateTime = QDateTime.currentDateTimeUtc()
+        expired: list[_CookieKey] = [key for key, cookie in self._cookies.items() if _is_expired(cookie, now)]
+        for key in expired:
+            self._pop(key)
+
+        if expired:
+            self._mark_dirty()
+        return len(expired)
+
+    def save(self) -> bool:
+        """Save the cookies in the jar to its path if they changed since they were last loaded or saved.
+
+        :return: True if the cookies were written.
+        """
+        self._save_timer.stop()
+        if self.path is None or not self.dirty:
+            return False
+
+        self.remove_expired()
+        raw_cookies: list[str] = [
+            cookie.toRawForm(QNetworkCookie.RawForm.Full).toStdString() for cookie in self._cookies.values()
+        ]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        hide_windows_file(self.path, unhide=True)
+        atomic_write(self.path, json.dumps(raw_cookies, indent=2))
+        hide_windows_file(self.path)
+
+        self.dirty = False
+        return True
@@ -0,0 +1,80 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Incremental parsing for ``text/event-stream`` response bodies."""
+from __future__ import annotations
+
+__all__ = (
+    'EventStreamParser',
+)
+
+
+class EventStreamParser:
+    """Incrementally split a ``text/event-stream`` body into the data of each event.
+
+    Bytes are fed as they arrive from the network, and only the current incomplete event is kept in memory.
+    Follows the parsing rules at https://html.spec.whatwg.org/multipage/server-sent-events.html#parsing-an-event-stream,
+    but only the ``data`` field is kept, as it's the only one used by ChatGPT.
+    """
+
+    __slots__ = ('_buffer', '_data_lines', '_pending_size', 'max_buffer_size')
+
+    def __init__(self, max_buffer_size: int = 8 * 1024**2) -> None:
+        """Create a new :py:class:`EventStreamParser`.
+
+        :param max_buffer_size: Maximum amount of bytes an incomplete event may take before raising an error.
+        """
+        self._buffer: bytearray = bytearray()
+        self._data_lines: list[bytes] = []
+        self._pending_size: int = 0
+        self.max_buffer_size: int = max_buffer_size
+
+    @property
+    def pending_size(self) -> int:
+        """Amount of bytes held for the current incomplete event."""
+        return self._pending_size + len(self._buffer)
+
+    def feed(self, chunk: bytes) -> list[str]:
+        """Feed some bytes to the parser and return the data of each event completed by them.
+
+        :param chunk: Newly received bytes.
+        :return: Data of every completed event, in order of arrival.
+        :raises BufferError: If the current incomplete event exceeds the maximum buffer size.
+        """
+        self._buffer += chunk
+        events: list[str] = []
+
+        # Only process complete lines, keep the remainder for the next chunk
+        if (end := self._buffer.rfind(b'\n')) != -1:
+            lines: list[bytes] = self._buffer[:end].split(b'\n')
+            del self._buffer[:end + 1]
+
+            for line in lines:
+                line = line.removesuffix(b'\r')
+
+                # Empty line -- dispatch the event
+                if not line:
+                    if self._data_lines:
+                        events.append(b'\n'.join(self._data_lines).decode('utf8'))
+                    self._data_lines.clear()
+                    self._pending_size = 0
+                    continue
+
+                # Ignore comments and any non-data fields
+                if line.startswith(b'data:'):
+                    value: bytes = line[5:].removeprefix(b' ')
+                    self._data_lines.append(value)
+                    self._pending_size += len(value)
+
+        if self.pending_size > self.max_buffer_size:
+            raise BufferError(
+                f'Incomplete event exceeded the maximum buffer size of {self.max_buffer_size} bytes.'
+            )
+
+        return events
+
+    def reset(self) -> None:
+        """Discard any incomplete event data."""
+        self._buffer.clear()
+        self._data_lines.clear()
+        self._pending_size = 0
@@ -5,6 +5,7 @@
 from __future__ import annotations
 
 __all__ = (
+    'AsyncNetworkSession',
     'gc_response',
     'KNOWN_HEADERS',
     'NetworkSession',
@@ -12,16 +13,21 @@ __all__ = (
     'Response',
 )
 
+import asyncio
+import codecs
 import datetime as dt
 import json as json_
 import re
 from collections.abc import Callable
+from collections.abc import Generator
+from collections.abc import Iterator
 from collections.abc import Mapping
 from collections.abc import Sequence
 from json import dumps as json_dumps
 from pathlib import Path
 from typing import Any
 from typing import Final
+from typing import TYPE_CHECKING
 from typing import TypeAlias
 from warnings import warn
 from weakref import WeakKeyDictionary
@@ -38,11 +44,27 @@ from ..utils import guess_json_utf
 from ..utils import is_error_status
 from ..utils import query_to_dict
 from ..utils import wait_for_reply
+from .compression import ACCEPT_ENCODING
+from .compression import ContentDecoder
+from .cookies import CookieJar
+from .metrics import MetricsRegistry
+from .metrics import ResponseTiming
+from .sink import ResponseSink
+from .sink import SinkTarget
+from .sink import STREAM_BUFFER_SIZE
+from .timeouts import TimeoutScheduler
+from .upload import BodySource
+from .upload import open_body_device
+
+if TYPE_CHECKING:
+    from .proxy_pool import PooledProxy
+    from .proxy_pool import ProxyPool
 
 _StringPair: TypeAlias = dict[str, str] | list[tuple[str, str]]
 _KnownHeaderValues: TypeAlias = (str | bytes | dt.datetime | dt.date | dt.time | _StringPair | list[str])
 _HeaderValue: TypeAlias = dict[str, _KnownHeaderValues] | list[tuple[str, _KnownHeaderValues]]
 
+_CHARSET_PATTERN: Final[re.Pattern] = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
 _INT_PATTERN: Final[re.Pattern] = re.compile(r'[1-9]\d*|0')
 
 
@@ -52,7 +74,7 @@ KNOWN_HEADERS: CaseInsensitiveDict[tuple[QNetworkRequest.KnownHeaders, type]] =
     # -----------------------------------------------------------------------------------------------
     'Content-Disposition': (QNetworkRequest.KnownHeaders.ContentDispositionHeader, str),
     'Content-Type':        (QNetworkRequest.KnownHeaders.ContentTypeHeader,        str),
-    'Content-Length':      (QNetworkRequest.KnownHeaders.ContentLengthHeader,      bytes),
+    'Content-Length':      (QNetworkRequest.KnownHeaders.ContentLengthHeader,      int),
     'Cookie':              (QNetworkRequest.KnownHeaders.CookieHeader,             QNetworkCookie),
     'ETag':                (QNetworkRequest.KnownHeaders.ETagHeader,               str),
     'If-Match':            (QNetworkRequest.KnownHeaders.IfMatchHeader,            QStringListModel),
@@ -78,6 +100,7 @@ def _translate_header_value(
     The following types are supported:
         - str: Given value is translated into a str.
         - bytes: Translates string value into a utf8 encoded version.
+        - int: Translates string value into an integer.
         - QDateTime: Translates string and datetime values into a QDateTime.
         - QNetworkCookie: Translates string pairs into a QNetworkCookie list.
           The first value is the cookie name, the second is the cookie value.
@@ -98,6 +121,9 @@ def _translate_header_value(
             if isinstance(value, str):
                 return value.encode('utf8')
 
+        case 'int':
+            return int(value)  # pyright: ignore[reportGeneralTypeIssues]
+
         case 'QDateTime':
             if isinstance(value, (dt.datetime, dt.date, dt.time)):
                 date_value: dt.datetime | dt.date | dt.time = value
@@ -164,23 +190,66 @@ class NetworkSession:
         - patch
     """
 
-    def __init__(self, manager_parent: QObject | None = None) -> None:
+    def __init__(self, manager_parent: QObject | None = None,
+                 cache_path: Path | str | None = None,
+                 max_cache_size: int = 50 * 1024**2,
+                 cookie_path: Path | None = None,
+                 metrics: MetricsRegistry | None = None) -> None:
         """Initialize the NetworkSession.
 
+        If a cache path is given, GET and HEAD responses are stored in an HTTP disk cache.
+        Fresh responses are then loaded without a request, and stale responses are revalidated with their
+        ``ETag`` or ``Last-Modified`` validators, following the ``Cache-Control`` headers of each response.
+
         :param manager_parent: Parent of the QNetworkAccessManager.
+        :param cache_path: Directory of the HTTP disk cache. If None, responses are not cached.
+        :param max_cache_size: Maximum size of the HTTP disk cache in bytes. Least recently used entries are removed.
+        :param cookie_path: File to persist cookies to. If None, cookies are only kept in memory.
+        :param metrics: Registry to record the timing of every finished request in. If None, timings are not recorded.
+
+        Compressed responses are requested with every content coding in ``accept_encoding``, unless a request
+        sets its own ``Accept-Encoding`` header. Response bodies are decoded as they are read.
+
+        If ``coalesce_requests`` is True, a GET or HEAD request identical to one which is still in-flight isn't sent.
+        Instead, it returns the in-flight :py:class:`Response`, and its callbacks are called when that finishes.
+        Requests are identical if they have the same method, URL, headers, auth, redirect policy, proxies,
+        SSL settings, and timeouts, and have no body.
+        Streamed requests, and requests with a ready_read callback, consume the body as it's read, so aren't coalesced.
+
+        If ``proxy_pool`` is set, requests without their own proxies are sent through a proxy selected by the pool.
         """
         self._headers = CaseInsensitiveDict()
         self.manager = QNetworkAccessManager(manager_parent)
-        self.default_redirect_policy = QNetworkRequest.RedirectPolicy.UserVerifiedRedirectPolicy
+        self.cookie_jar: CookieJar = CookieJar(cookie_path)
+        self.cache: QNetworkDiskCache | None = None
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self.accept_encoding: str | None = ACCEPT_ENCODING
+        self.metrics: MetricsRegistry | None = metrics
+        self.proxy_pool: ProxyPool | None = None
+        # Qt's own default, which refuses redirects from HTTPS to HTTP
+        self.default_redirect_policy = QNetworkRequest.RedirectPolicy.NoLessSafeRedirectPolicy
         self.reply_auth_map: WeakKeyDictionary[QNetworkReply, tuple[str, str]] = WeakKeyDictionary()
+        self.coalesce_requests: bool = True
+        self.requests_coalesced: int = 0
+        self._in_flight: dict[tuple, Response] = {}
+        self._proxy_managers: dict[tuple, QNetworkAccessManager] = {}
+
+        # Connect timeouts of every request share one timer, instead of each reply having its own
+        self.timeouts: TimeoutScheduler = TimeoutScheduler(self.manager)
 
-        self.manager.authenticationRequired.connect(self._handle_auth)  # pyright: ignore[reportGeneralTypeIssues]
+        if cache_path is not None:
+            self.cache = QNetworkDiskCache(self.manager)
+            self.cache.setCacheDirectory(str(cache_path))
+            self.cache.setMaximumCacheSize(max_cache_size)
+
+        self._init_manager(self.manager)
 
     @property
     def cookies(self) -> dict[str, str]:
         """Return dictionary representation of the internal QNetworkCookieJar."""
         return {cookie.name().toStdString(): cookie.value().toStdString() for
-                cookie in self.manager.cookieJar().allCookies()}
+                cookie in self.cookie_jar.allCookies()}
 
     @cookies.deleter
     def cookies(self) -> None:
@@ -225,6 +294,41 @@ class NetworkSession:
                     f'This data is likely to be ignored.'
                 ))
 
+    def _count_cache_result(self, reply: QNetworkReply) -> None:
+        """Count a finished GET or HEAD reply as a cache hit or miss.
+
+        Responses revalidated with a "304 Not Modified" status are loaded from the cache, so they count as hits.
+        """
+        if reply.operation() not in {QNetworkAccessManager.Operation.GetOperation,
+                                     QNetworkAccessManager.Operation.HeadOperation}:
+            return
+
+        if reply.attribute(QNetworkRequest.Attribute.SourceIsFromCacheAttribute):
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    def _init_manager(self, manager: QNetworkAccessManager) -> None:
+        """Share the cookie jar, cache, and authentication of the session with a manager.
+
+        The finished signal of every other manager is forwarded to the main manager,
+        so ``manager.finished`` is emitted for every reply of the session.
+        """
+        manager.setCookieJar(self.cookie_jar)
+        if self.cache is not None:
+            manager.setCache(self.cache)
+        if manager is self.manager:
+            if self.cache is not None:
+                manager.finished.connect(self._count_cache_result)  # pyright: ignore[reportGeneralTypeIssues]
+        else:
+            manager.finished.connect(self.manager.finished)  # pyright: ignore[reportGeneralTypeIssues]
+        manager.authenticationRequired.connect(self._handle_auth)  # pyright: ignore[reportGeneralTypeIssues]
+
+        # Managers take ownership of their cookie jar and cache, so keep them owned by the main manager
+        self.cookie_jar.setParent(self.manager)
+        if self.cache is not None:
+            self.cache.setParent(self.manager)
+
     def _handle_auth(self, reply: QNetworkReply, authenticator: QAuthenticator) -> None:
         if reply in self.reply_auth_map:
             user, password = self.reply_auth_map[reply]
@@ -248,41 +352,70 @@ class NetworkSession:
           If path is provided, must provide domain. Raise otherwise.
         """
 
-        def deletion_predicate(cookie: QNetworkCookie) -> bool:
-            """Return whether the cookie should be deleted.
+        if name is not None and (domain is None or path is None):
+            raise ValueError('Must specify domain and path if specifying name')
+        if path is not None and domain is None:
+            raise ValueError('Must specify domain if specifying path')
 
-            :param cookie: The cookie to check.
-            :return: True if the cookie should be removed, False otherwise.
-            :raises ValueError: If name is provided, must provide path.
-              If path is provided, must provide domain. Raise otherwise.
-            """
-            # 3 args -- Delete the specific cookie which matches all information.
-            if name is not None:
-                if domain is None or path is None:
-                    raise ValueError('Must specify domain and path if specifying name')
+        return self.cookie_jar.remove(domain, path, name)
 
-                return cookie.name().toStdString() == name and cookie.domain() == domain and cookie.path() == path
+    def manager_for_proxy(self, proxy: QNetworkProxy | None) -> QNetworkAccessManager:
+        """Return the manager which sends requests through the given proxy, creating it if needed.
 
-            # 2 args -- Delete all cookies with the given domain and path.
-            if path is not None:
-                if domain is None:
-                    raise ValueError('Must specify domain if specifying path')
+        Qt applies proxies to a whole manager instead of a single request, so each proxy gets its own manager.
+        They share the cookies, cache, and authentication of the session, but not connections.
 
-                return cookie.domain() == domain and cookie.path() == path
+        :param proxy: Proxy to send requests through.
+            If None, return the main manager, which uses the application proxy.
+        """
+        if proxy is None:
+            return self.manager
 
-            # 1 arg -- Delete all cookies in the given domain.
-            if domain is not None:
-                return cookie.domain() == domain
+        key: tuple = (proxy.type(), proxy.hostName(), proxy.port(), proxy.user(), proxy.password())
+        if (manager := self._proxy_managers.get(key)) is None:
+            manager = self._proxy_managers[key] = QNetworkAccessManager(self.manager)
+            manager.setProxy(proxy)
+            self._init_manager(manager)
+        return manager
 
-            # 0 args -- Delete all cookies
-            return True
+    def prewarm(self, url: QUrl | str, proxy: QNetworkProxy | None = None) -> None:
+        """Connect to the host of a URL in the background, before any requests are sent to it.
 
-        results = []
-        for _cookie in self.manager.cookieJar().allCookies():
-            if deletion_predicate(_cookie):
-                results.append(self.manager.cookieJar().deleteCookie(_cookie))
+        The next request to the host reuses the connection, skipping the DNS lookup, connection, and TLS handshake.
+        Connecting again while a connection is open does nothing, so this can also be used to keep a connection alive.
 
-        return any(results)
+        :param url: URL of the host to connect to. Only the scheme, host, and port are used.
+        :param proxy: Proxy to connect through, see :py:meth:`manager_for_proxy`.
+            Only requests sent through the same proxy reuse the connection.
+        """
+        manager: QNetworkAccessManager = self.manager_for_proxy(proxy)
+        url = QUrl(url)
+        if url.scheme() == 'https':
+            # Offer the same protocols as a request would, so an HTTP/2 connection can be reused
+            ssl_config = QSslConfiguration.defaultConfiguration()
+            ssl_config.setAllowedNextProtocols([
+                QByteArray(QSslConfiguration.ALPNProtocolHTTP2), QByteArray(QSslConfiguration.NextProtocolHttp1_1)
+            ])
+            manager.connectToHostEncrypted(url.host(), url.port(443), ssl_config)
+        else:
+            manager.connectToHost(url.host(), url.port(80))
+
+    def clear_cache(self) -> None:
+        """Remove all responses from the HTTP disk cache, if there is one."""
+        if self.cache is not None:
+            self.cache.clear()
+
+    def get_cookie(self, name: str, domain: str | None = None) -> str | None:
+        """Return the value of a cookie which has not expired, or None if there is no such cookie.
+
+        Unlike :py:attr:`cookies`, only the cookies with the given name are searched.
+
+        :param name: Name of the cookie.
+        :param domain: Domain of the cookie. If None, match any domain.
+        """
+        if (cookie := self.cookie_jar.find(name, domain)) is not None:
+            return cookie.value().toStdString()
+        return None
 
     def set_cookie(self, name: str, value: str, domain: str, path: str | None = None) -> bool:
         """Create a new cookie with the given date.
@@ -295,7 +428,7 @@ class NetworkSession:
         cookie = QNetworkCookie(name=name.encode('utf8'), value=value.encode('utf8'))
         cookie.setDomain(domain)
         cookie.setPath(path or '/')
-        return self.manager.cookieJar().insertCookie(cookie)
+        return self.cookie_jar.insertCookie(cookie)
 
     def request(self, method: str, url: QUrl | str, *args, **kwargs) -> Response:
         """Send an HTTP request to the given URL with the given data.
@@ -307,20 +440,23 @@ class NetworkSession:
         :param method: HTTP method/verb to use for the request. Case-sensitive.
         :param url: URL to send the request to. Case-sensitive.
         :keyword params: URL parameters to attach to the URL. Case-sensitive.
-        :keyword data: Bytes to send in the request body.
+        :keyword data: Bytes to send in the request body, or a file path, QIODevice, or generator to stream it from.
         :keyword headers: Headers to use for the request. Case-insensitive.
         :keyword cookies: Cookies to use for the request. Case-sensitive.
         :keyword auth: Optional tuple containing username and password.
         :keyword timeout: Timeouts for the request.
         :keyword allow_redirects: If False, do not follow any redirect requests.
         :keyword proxies: String-pairs mapping protocol to the URL of the proxy.
-        :keyword stream: Whether to accept chunked encoding.
+        :keyword stream: Whether to stream the response body with a bounded read buffer, instead of buffering it.
         :keyword verify: Whether to verify SSL certificates.
         :keyword cert: Client certificate information.
         :keyword json: JSON data to send in the request body.
-        :keyword wait_until_finished: Process the application eventLoop until the reply is finished.
+        :keyword wait_until_finished: Block in a local event loop until the reply is finished.
         :keyword finished: Callback when the request finishes, with request supplied as an argument.
         :keyword progress: Callback to update download progress, with the request, received bytes, and total bytes.
+        :keyword upload_progress: Callback to update upload progress, with the request, sent bytes, and total bytes.
+        :keyword ready_read: Callback when new data is available to read, with the request supplied as an argument.
+        :keyword sink: File path, binary file, generator, or callable to stream the response body to.
 
         :return: Response object, which is not guaranteed to be finished.
         """
@@ -328,6 +464,9 @@ class NetworkSession:
             'wait_until_finished': kwargs.pop('wait_until_finished', False),
             'finished': kwargs.pop('finished', None),
             'progress': kwargs.pop('progress', None),
+            'upload_progress': kwargs.pop('upload_progress', None),
+            'ready_read': kwargs.pop('ready_read', None),
+            'sink': kwargs.pop('sink', None),
         }
 
         return Request(method, url, *args, **kwargs).send(self, **send_kwargs)
@@ -345,20 +484,23 @@ class NetworkSession:
 
         :param url: URL to send the request to. Case-sensitive.
         :keyword params: URL parameters to attach to the URL. Case-sensitive.
-        :keyword data: Bytes to send in the request body.
+        :keyword data: Bytes to send in the request body, or a file path, QIODevice, or generator to stream it from.
         :keyword headers: Headers to use for the request. Case-insensitive.
         :keyword cookies: Cookies to use for the request. Case-sensitive.
         :keyword auth: Optional tuple containing username and password.
         :keyword timeout: Timeouts for the request.
         :keyword allow_redirects: If False, do not follow any redirect requests.
         :keyword proxies: String-pairs mapping protocol to the URL of the proxy.
-        :keyword stream: Whether to accept chunked encoding.
+        :keyword stream: Whether to stream the response body with a bounded read buffer, instead of buffering it.
         :keyword verify: Whether to verify SSL certificates.
         :keyword cert: Client certificate information.
         :keyword json: JSON data to send in the request body.
-        :keyword wait_until_finished: Process the application eventLoop until the reply is finished.
+        :keyword wait_until_finished: Block in a local event loop until the reply is finished.
         :keyword finished: Callback when the request finishes, with request supplied as an argument.
         :keyword progress: Callback to update download progress, with the request, received bytes, and total bytes.
+        :keyword upload_progress: Callback to update upload progress, with the request, sent bytes, and total bytes.
+        :keyword ready_read: Callback when new data is available to read, with the request supplied as an argument.
+        :keyword sink: File path, binary file, generator, or callable to stream the response body to.
 
         :return: Response object, which is not guaranteed to be finished.
         """
@@ -379,20 +521,23 @@ class NetworkSession:
 
         :param url: URL to send the request to. Case-sensitive.
         :keyword params: URL parameters to attach to the URL. Case-sensitive.
-        :keyword data: Bytes to send in the request body.
+        :keyword data: Bytes to send in the request body, or a file path, QIODevice, or generator to stream it from.
         :keyword headers: Headers to use for the request. Case-insensitive.
         :keyword cookies: Cookies to use for the request. Case-sensitive.
         :keyword auth: Optional tuple containing username and password.
         :keyword timeout: Timeouts for the request.
         :keyword allow_redirects: If False, do not follow any redirect requests.
         :keyword proxies: String-pairs mapping protocol to the URL of the proxy.
-        :keyword stream: Whether to accept chunked encoding.
+        :keyword stream: Whether to stream the response body with a bounded read buffer, instead of buffering it.
         :keyword verify: Whether to verify SSL certificates.
         :keyword cert: Client certificate information.
         :keyword json: JSON data to send in the request body.
-        :keyword wait_until_finished: Process the application eventLoop until the reply is finished.
+        :keyword wait_until_finished: Block in a local event loop until the reply is finished.
         :keyword finished: Callback when the request finishes, with request supplied as an argument.
         :keyword progress: Callback to update download progress, with the request, received bytes, and total bytes.
+        :keyword upload_progress: Callback to update upload progress, with the request, sent bytes, and total bytes.
+        :keyword ready_read: Callback when new data is available to read, with the request supplied as an argument.
+        :keyword sink: File path, binary file, generator, or callable to stream the response body to.
 
         :return: Response object, which is not guaranteed to be finished.
         """
@@ -414,20 +559,23 @@ class NetworkSession:
 
         :param url: URL to send the request to. Case-sensitive.
         :keyword params: URL parameters to attach to the URL. Case-sensitive.
-        :keyword data: Bytes to send in the request body.
+        :keyword data: Bytes to send in the request body, or a file path, QIODevice, or generator to stream it from.
         :keyword headers: Headers to use for the request. Case-insensitive.
         :keyword cookies: Cookies to use for the request. Case-sensitive.
         :keyword auth: Optional tuple containing username and password.
         :keyword timeout: Timeouts for the request.
         :keyword allow_redirects: If False, do not follow any redirect requests.
         :keyword proxies: String-pairs mapping protocol to the URL of the proxy.
-        :keyword stream: Whether to accept chunked encoding.
+        :keyword stream: Whether to stream the response body with a bounded read buffer, instead of buffering it.
         :keyword verify: Whether to verify SSL certificates.
         :keyword cert: Client certificate information.
         :keyword json: JSON data to send in the request body.
-        :keyword wait_until_finished: Process the application eventLoop until the reply is finished.
+        :keyword wait_until_finished: Block in a local event loop until the reply is finished.
         :keyword finished: Callback when the request finishes, with request supplied as an argument.
         :keyword progress: Callback to update download progress, with the request, received bytes, and total bytes.
+        :keyword upload_progress: Callback to update upload progress, with the request, sent bytes, and total bytes.
+        :keyword ready_read: Callback when new data is available to read, with the request supplied as an argument.
+        :keyword sink: File path, binary file, generator, or callable to stream the response body to.
 
         :return: Response object, which is not guaranteed to be finished.
         """
@@ -448,20 +596,23 @@ class NetworkSession:
 
         :param url: URL to send the request to. Case-sensitive.
         :keyword params: URL parameters to attach to the URL. Case-sensitive.
-        :keyword data: Bytes to send in the request body.
+        :keyword data: Bytes to send in the request body, or a file path, QIODevice, or generator to stream it from.
         :keyword headers: Headers to use for the request. Case-insensitive.
         :keyword cookies: Cookies to use for the request. Case-sensitive.
         :keyword auth: Optional tuple containing username and password.
         :keyword timeout: Timeouts for the request.
         :keyword allow_redirects: If False, do not follow any redirect requests.
         :keyword proxies: String-pairs mapping protocol to the URL of the proxy.
-        :keyword stream: Whether to accept chunked encoding.
+        :keyword stream: Whether to stream the response body with a bounded read buffer, instead of buffering it.
         :keyword verify: Whether to verify SSL certificates.
         :keyword cert: Client certificate information.
         :keyword json: JSON data to send in the request body.
-        :keyword wait_until_finished: Process the application eventLoop until the reply is finished.
+        :keyword wait_until_finished: Block in a local event loop until the reply is finished.
         :keyword finished: Callback when the request finishes, with request supplied as an argument.
         :keyword progress: Callback to update download progress, with the request, received bytes, and total bytes.
+        :keyword upload_progress: Callback to update upload progress, with the request, sent bytes, and total bytes.
+        :keyword ready_read: Callback when new data is available to read, with the request supplied as an argument.
+        :keyword sink: File path, binary file, generator, or callable to stream the response body to.
 
         :return: Response object, which is not guaranteed to be finished.
         """
@@ -481,20 +632,23 @@ class NetworkSession:
 
         :param url: URL to send the request to. Case-sensitive.
         :keyword params: URL parameters to attach to the URL. Case-sensitive.
-        :keyword data: Bytes to send in the request body.
+        :keyword data: Bytes to send in the request body, or a file path, QIODevice, or generator to stream it from.
         :keyword headers: Headers to use for the request. Case-insensitive.
         :keyword cookies: Cookies to use for the request. Case-sensitive.
         :keyword auth: Optional tuple containing username and password.
         :keyword timeout: Timeouts for the request.
         :keyword allow_redirects: If False, do not follow any redirect requests.
         :keyword proxies: String-pairs mapping protocol to the URL of the proxy.
-        :keyword stream: Whether to accept chunked encoding.
+        :keyword stream: Whether to stream the response body with a bounded read buffer, instead of buffering it.
         :keyword verify: Whether to verify SSL certificates.
         :keyword cert: Client certificate information.
         :keyword json: JSON data to send in the request body.
-        :keyword wait_until_finished: Process the application eventLoop until the reply is finished.
+        :keyword wait_until_finished: Block in a local event loop until the reply is finished.
         :keyword finished: Callback when the request finishes, with request supplied as an argument.
         :keyword progress: Callback to update download progress, with the request, received bytes, and total bytes.
+        :keyword upload_progress: Callback to update upload progress, with the request, sent bytes, and total bytes.
+        :keyword ready_read: Callback when new data is available to read, with the request supplied as an argument.
+        :keyword sink: File path, binary file, generator, or callable to stream the response body to.
 
         :return: Response object, which is not guaranteed to be finished.
         """
@@ -514,20 +668,23 @@ class NetworkSession:
 
         :param url: URL to send the request to. Case-sensitive.
         :keyword params: URL parameters to attach to the URL. Case-sensitive.
-        :keyword data: Bytes to send in the request body.
+        :keyword data: Bytes to send in the request body, or a file path, QIODevice, or generator to stream it from.
         :keyword headers: Headers to use for the request. Case-insensitive.
         :keyword cookies: Cookies to use for the request. Case-sensitive.
         :keyword auth: Optional tuple containing username and password.
         :keyword timeout: Timeouts for the request.
         :keyword allow_redirects: If False, do not follow any redirect requests.
         :keyword proxies: String-pairs mapping protocol to the URL of the proxy.
-        :keyword stream: Whether to accept chunked encoding.
+        :keyword stream: Whether to stream the response body with a bounded read buffer, instead of buffering it.
         :keyword verify: Whether to verify SSL certificates.
         :keyword cert: Client certificate information.
         :keyword json: JSON data to send in the request body.
-        :keyword wait_until_finished: Process the application eventLoop until the reply is finished.
+        :keyword wait_until_finished: Block in a local event loop until the reply is finished.
         :keyword finished: Callback when the request finishes, with request supplied as an argument.
         :keyword progress: Callback to update download progress, with the request, received bytes, and total bytes.
+        :keyword upload_progress: Callback to update upload progress, with the request, sent bytes, and total bytes.
+        :keyword ready_read: Callback when new data is available to read, with the request supplied as an argument.
+        :keyword sink: File path, binary file, generator, or callable to stream the response body to.
 
         :return: Response object, which is not guaranteed to be finished.
         """
@@ -537,12 +694,44 @@ class NetworkSession:
         return self.request(method=method, url=url, **kwargs)
 
 
+class AsyncNetworkSession(NetworkSession):
+    """:py:class:`NetworkSession` whose requests are coroutines, for use with :py:mod:`asyncio`.
+
+    All convenience methods return an awaitable resulting in the finished :py:class:`Response`,
+    so many requests can be in-flight at once and composed with ``asyncio.gather``::
+
+        first, second = await asyncio.gather(session.get(url_1), session.get(url_2))
+
+    This requires the running asyncio event loop to be integrated with Qt's, such as ``qasync.QEventLoop``.
+    """
+
+    # pylint: disable=invalid-overridden-method
+    async def request(  # pyright: ignore[reportIncompatibleMethodOverride]
+            self, method: str, url: QUrl | str, *args, **kwargs
+    ) -> Response:
+        """Send an HTTP request to the given URL with the given data, and wait for it to finish.
+
+        -----
+
+        See :py:meth:`NetworkSession.request` for full kwarg documentation.
+
+        :param method: HTTP method/verb to use for the request. Case-sensitive.
+        :param url: URL to send the request to. Case-sensitive.
+        :return: The finished Response object.
+        :raises TypeError: If wait_until_finished is provided, as it would block the event loop.
+        """
+        if kwargs.pop('wait_until_finished', False):
+            raise TypeError(f'{type(self).__name__} does not support blocking with wait_until_finished.')
+
+        return await super().request(method, url, *args, **kwargs)
+
+
 class Request:
     """``requests``-like wrapper over a :py:class:`QNetworkRequest`."""
 
     def __init__(self, method: str, url: QUrl | str,
                  params: _StringPair | None = None,
-                 data: bytes | _StringPair | None = None,
+                 data: bytes | _StringPair | BodySource | None = None,
                  headers: _HeaderValue | None = None,
                  cookies: _StringPair | None = None,
                  # files: dict[str, Any] | None = None,
@@ -566,6 +755,9 @@ class Request:
 
         :param data: Bytes to send in the request body.
             If a string-pair, will be encoded to bytes as a form-encoded request body.
+            If a file path, QIODevice, binary file, or iterator of bytes (such as a generator), the body is streamed
+            from it while uploading, instead of being held in memory. Binary files and generators can only be sent once,
+            and are buffered by Qt unless a Content-Length header is given.
             Incompatible with the json and files parameters.
 
         :param headers: Headers to use for the request.
@@ -580,6 +772,8 @@ class Request:
             If a single float, both the connect and read timeout will be set to this value.
             If a tuple, the first value is the connect timeout and the second value is the read timeout.
             If None or 0, no timeout will be set.
+            The request is aborted if the response headers aren't received within the connect timeout,
+            or if no data is sent or received for longer than the read timeout.
 
         :param allow_redirects:
             If False, do not follow any redirect requests.
@@ -587,8 +781,10 @@ class Request:
         :param proxies: String-pairs mapping protocol to the URL of the proxy.
             Supported protocols are 'ftp', 'http', 'socks5'.
 
-        :param stream: Whether to accept chunked encoding.
-            See https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Transfer-Encoding#chunked_encoding
+        :param stream: Whether to stream the response body instead of buffering it.
+            Streamed responses have a read buffer of STREAM_BUFFER_SIZE bytes, so once it's full, the body is
+            received only as fast as it is read. They are not stored in the HTTP cache.
+            Read the body incrementally with a ready_read callback, or send it to a sink.
 
         :param verify: Whether to verify SSL certificates.
             If False, ignore all SSL errors.
@@ -624,9 +820,19 @@ class Request:
         """Representation of the :py:class:`Request` with method and target URL."""
         return f'<Request [{self.method}] ({self.url})>'
 
-    def _prepare_body(self) -> bytes | None:
+    @property
+    def replayable(self) -> bool:
+        """Whether the request can be sent again with the same body.
+
+        Bodies streamed from a generator, binary file, or sequential device are consumed by the first send.
+        """
+        if isinstance(self.data, QIODevice):
+            return not self.data.isSequential()
+        return not isinstance(self.data, Iterator)
+
+    def _prepare_body(self) -> bytes | QIODevice | None:
         content_type = None
-        body: bytes | None = None
+        body: bytes | QIODevice | None = None
 
         if self.data:
             if isinstance(self.data, dict):
@@ -636,6 +842,9 @@ class Request:
             elif isinstance(self.data, bytes):
                 body = self.data
 
+            elif isinstance(self.data, (Path, QIODevice, Iterator)):
+                body = open_body_device(self.data)
+
         elif self.json is not None:
             body = json_dumps(self.json, allow_nan=False).encode('utf8')
             content_type = 'application/json'
@@ -646,16 +855,16 @@ class Request:
         return body
 
     def _prepare_headers(self, headers: CaseInsensitiveDict) -> None:
-        if self.stream:
-            headers['Transfer-Encoding'] = 'chunked'
-
-        if self.cookies:
-            headers['Cookie'] = headers
-
         for name, value in headers.items():
             if name in KNOWN_HEADERS:
                 value = _translate_header_value(name, value)
-                self._request.setHeader(KNOWN_HEADERS[name][0], value)
+                if KNOWN_HEADERS[name][0] == QNetworkRequest.KnownHeaders.CookieHeader:
+                    # PySide can't convert a cookie list into the QVariant Qt expects, so send its raw form instead
+                    self._request.setRawHeader(b'Cookie', b'; '.join(
+                        cookie.toRawForm(QNetworkCookie.RawForm.NameAndValueOnly).data() for cookie in value
+                    ))
+                else:
+                    self._request.setHeader(KNOWN_HEADERS[name][0], value)
                 continue
 
             try:
@@ -665,49 +874,135 @@ class Request:
 
             self._request.setRawHeader(name.encode('utf8'), encoded_value)
 
+    @staticmethod
+    def _connect_callbacks(
+            response: Response,
+            finished: _ResponseConsumer | None,
+            progress: _ProgressConsumer | None,
+            upload_progress: _ProgressConsumer | None,
+            ready_read: _ResponseConsumer | None
+    ) -> None:
+        reply: QNetworkReply = response._reply
+
+        # Put into variables to ignore incorrect known-type errors
+        reply_finished, reply_downloadProgress, reply_uploadProgress, reply_readyRead = (
+            reply.finished, reply.downloadProgress,  # pyright: ignore[reportGeneralTypeIssues]
+            reply.uploadProgress, reply.readyRead    # pyright: ignore[reportGeneralTypeIssues]
+        )
+
+        if finished is not None:
+            # Aborted replies may emit finished a second time, so only handle the first emission
+            reply_finished.connect(
+                DeferredCallable(gc_response(finished), response), Qt.ConnectionType.SingleShotConnection
+            )
+
+        if progress is not None:
+            reply_downloadProgress.connect(DeferredCallable(progress, response, _extra_pos_args=2))
+
+        if upload_progress is not None:
+            reply_uploadProgress.connect(DeferredCallable(upload_progress, response, _extra_pos_args=2))
+
+        if ready_read is not None:
+            reply_readyRead.connect(DeferredCallable(ready_read, response))
+
     # pylint: disable=compare-to-zero
     def _prepare_response(
             self,
             reply: QNetworkReply,
+            timing: ResponseTiming,
             finished: _ResponseConsumer | None,
-            progress: _ProgressConsumer | None
+            progress: _ProgressConsumer | None,
+            upload_progress: _ProgressConsumer | None,
+            ready_read: _ResponseConsumer | None,
+            sink: ResponseSink | None
     ) -> Response:
-        _response = Response(self, reply)
+        _response = Response(self, reply, timing)
 
         # Put into variables to ignore incorrect known-type errors
-        (reply_redirected, reply_finished, reply_downloadProgress, reply_redirectAllowed) = (
-            reply.redirected, reply.finished,              # pyright: ignore[reportGeneralTypeIssues]
-            reply.downloadProgress, reply.redirectAllowed  # pyright: ignore[reportGeneralTypeIssues]
+        (reply_redirected, reply_finished, reply_readyRead, reply_metaDataChanged) = (
+            reply.redirected, reply.finished,               # pyright: ignore[reportGeneralTypeIssues]
+            reply.readyRead, reply.metaDataChanged          # pyright: ignore[reportGeneralTypeIssues]
         )
 
+        # Connect the timing first, so callbacks see each phase as marked.
+        # The timing doesn't reference the response, so connections which never fire don't keep it alive.
+        single_shot = Qt.ConnectionType.SingleShotConnection
+        for signal, mark in (
+                (reply.socketStartedConnecting, timing._mark_connecting),  # pyright: ignore[reportGeneralTypeIssues]
+                (reply.encrypted, timing._mark_encrypted),                 # pyright: ignore[reportGeneralTypeIssues]
+                (reply.requestSent, timing._mark_sent),                    # pyright: ignore[reportGeneralTypeIssues]
+                (reply_metaDataChanged, timing._mark_headers),
+                (reply_readyRead, timing._mark_first_byte),
+        ):
+            signal.connect(mark, single_shot)
+        reply_finished.connect(lambda: timing._mark_finished(reply.bytesAvailable()), single_shot)
+
         if self.allow_redirects:
-            reply_redirected.connect(lambda _: reply_redirectAllowed)
+            reply_redirected.connect(lambda url: self._verify_redirect(reply, url))
 
         if self.verify is False:
             reply.ignoreSslErrors()
 
-        if finished is not None:
-            reply_finished.connect(DeferredCallable(gc_response(finished), _response))
+        if self.stream or sink is not None:
+            reply.setReadBufferSize(STREAM_BUFFER_SIZE)
 
-        if progress is not None:
-            reply_downloadProgress.connect(DeferredCallable(progress, _response, _extra_pos_args=2))
+        if sink is not None:
+            _response.sink = sink
+            # Write the body before any finished callback, so the sink is complete when it's called.
+            # The readyRead connection keeps the response alive until it finishes, then is disconnected.
+            write_sink = DeferredCallable(_response._write_sink)
 
-        if self.timeout:
-            # Create connection timeout timer
-            # This is for the RESPONSE side of the connection.
-            def handle_connection_timeout():
-                if not reply.isFinished():
-                    reply.abort()
+            def close_sink() -> None:
+                reply_readyRead.disconnect(write_sink)
+                _response._close_sink()
+
+            reply_readyRead.connect(write_sink)
+            reply_finished.connect(close_sink, single_shot)
 
-            connection_timeout = int((self.timeout[0] if isinstance(self.timeout, Sequence) else self.timeout) * 1000)
-            timer = QTimer(reply)
-            timer.setSingleShot(True)
-            timer.setInterval(connection_timeout)
-            timer.timeout.connect(handle_connection_timeout)  # pyright: ignore[reportGeneralTypeIssues]
-            timer.start()
+        self._connect_callbacks(_response, finished, progress, upload_progress, ready_read)
 
         return _response
 
+    def _prepare_proxy(self) -> QNetworkProxy | None:
+        """Return the proxy to send the request through, or None to use the application proxy.
+
+        :raises ValueError: If proxy attribute is not a valid option.
+        """
+        proxy: QNetworkProxy | None = None
+        for protocol, proxy_url in (self.proxies or {}).items():
+            proxy_type: QNetworkProxy.ProxyType
+            match protocol:
+                case '':
+                    proxy_type = QNetworkProxy.ProxyType.NoProxy
+                case 'ftp':
+                    proxy_type = QNetworkProxy.ProxyType.FtpCachingProxy
+                case 'http':
+                    proxy_type = QNetworkProxy.ProxyType.HttpProxy
+                case 'socks5':
+                    proxy_type = QNetworkProxy.ProxyType.Socks5Proxy
+                case other:
+                    raise ValueError(f'proxy protocol "{other}" is not supported.')
+
+            proxy_url = QUrl(proxy_url)
+            proxy = QNetworkProxy(
+                proxy_type, proxy_url.host(), proxy_url.port(), proxy_url.userName(), proxy_url.password()
+            )
+        return proxy
+
+    @staticmethod
+    def _verify_redirect(reply: QNetworkReply, url: QUrl) -> None:
+        """Allow a redirect of a reply using the user-verified redirect policy, unless it's from HTTPS to HTTP.
+
+        Otherwise, cookies and auth headers of the request would be sent to the redirect unencrypted.
+        Replies using any other policy already followed the redirect, and would follow it again if allowed.
+        """
+        policy = reply.request().attribute(QNetworkRequest.Attribute.RedirectPolicyAttribute)
+        if policy != QNetworkRequest.RedirectPolicy.UserVerifiedRedirectPolicy.value:
+            return
+
+        if not (reply.url().scheme() == 'https' and url.scheme() == 'http'):
+            reply.redirectAllowed.emit()  # pyright: ignore[reportGeneralTypeIssues]
+
     def _prepare_ssl(self) -> None:
         ssl_config = QSslConfiguration.defaultConfiguration()
 
@@ -727,13 +1022,16 @@ class Request:
              session: NetworkSession,
              wait_until_finished: bool = False,
              finished: _ResponseConsumer | None = None,
-             progress: _ProgressConsumer | None = None
+             progress: _ProgressConsumer | None = None,
+             upload_progress: _ProgressConsumer | None = None,
+             ready_read: _ResponseConsumer | None = None,
+             sink: SinkTarget | None = None
              ) -> Response:
         """Send the :py:class:`Request` using the specified :py:class:`NetworkSession`.
 
         :param session: Session to use.
 
-        :param wait_until_finished: Process the application eventLoop until
+        :param wait_until_finished: Block in a local event loop until
             the reply is finished, so when it is returned you can immediately access data.
 
         :param finished: Callback when the request finishes,
@@ -742,17 +1040,37 @@ class Request:
         :param progress: Callback to update download progress,
             with the reply, received bytes, and total bytes supplied as arguments.
 
+        :param upload_progress: Callback to update upload progress,
+            with the reply, sent bytes, and total bytes supplied as arguments.
+
+        :param ready_read: Callback when new data is available to read,
+            with the reply supplied as an argument. Use ``Response.read()`` to consume the data incrementally.
+
+        :param sink: Where to stream the response body as it is received, implying ``stream``.
+            See :py:class:`ResponseSink` for the supported targets. The body is not kept in memory.
+
         :return: Response object, which is not guaranteed to be finished.
+        :raises OSError: If the request body is a file or device which couldn't be opened.
+        :raises TypeError: If sink is not a supported target.
         :raises ValueError: If proxy attribute is not a valid option.
         """
+        response_sink: ResponseSink | None = None if sink is None else ResponseSink(sink)
         request_url = QUrl(self.url)  # Ensure url is of type QUrl
         request_params = query_to_dict(request_url.query()) | self.params  # Update QUrl params with params argument
         request_headers = session.headers | self.headers                   # Use session headers as default headers
-        request_cookies = session.cookies | self.cookies                   # Use session cookies as default cookies
+        if session.accept_encoding and 'Accept-Encoding' not in request_headers:
+            request_headers['Accept-Encoding'] = session.accept_encoding
         request_data = self._prepare_body()
 
         if self.cookies:
-            request_headers['Cookie'] = request_cookies
+            # Qt replaces the Cookie header with the cookies of the jar, so add the jar's cookies for this URL manually
+            request_headers['Cookie'] = {
+                cookie.name().toStdString(): cookie.value().toStdString()
+                for cookie in session.cookie_jar.cookiesForUrl(request_url)
+            } | self.cookies
+            self._request.setAttribute(
+                QNetworkRequest.Attribute.CookieLoadControlAttribute, QNetworkRequest.LoadControl.Manual.value
+            )
 
         request_url.setQuery(dict_to_query(request_params))
         self._request.setUrl(request_url)
@@ -760,27 +1078,42 @@ class Request:
         self._prepare_ssl()
         self._prepare_headers(request_headers)
 
+        coalesce_key: tuple | None = None
+        if (session.coalesce_requests and self.method in {'GET', 'HEAD'} and request_data is None
+                and not self.stream and response_sink is None and ready_read is None):
+            raw_headers: tuple[tuple[bytes, bytes], ...] = tuple(
+                (name.data(), self._request.rawHeader(name).data()) for name in self._request.rawHeaderList()
+            )
+            proxies: tuple | None = None if self.proxies is None else tuple(self.proxies.items())
+            timeout = tuple(self.timeout) if isinstance(self.timeout, Sequence) else self.timeout
+            # Requests which differ in SSL settings or timeouts may succeed or fail differently, so they aren't shared
+            coalesce_key = (
+                self.method, request_url.toString(), raw_headers, self.auth, self.allow_redirects, proxies,
+                self.verify, self.cert, timeout
+            )
+
+            # Attach to the identical in-flight request instead of sending another
+            if (in_flight := session._in_flight.get(coalesce_key)) is not None and not in_flight.finished:
+                session.requests_coalesced += 1
+                self._connect_callbacks(in_flight, finished, progress, upload_progress, ready_read)
+                if wait_until_finished:
+                    wait_for_reply(in_flight._reply)
+                return in_flight
+
+        # Both are set per request, so concurrent requests with other settings aren't affected
+        redirect_policy: QNetworkRequest.RedirectPolicy = session.default_redirect_policy
         if not self.allow_redirects:
-            session.manager.setRedirectPolicy(QNetworkRequest.RedirectPolicy.ManualRedirectPolicy)
-
-        if self.proxies is not None:
-            for protocol, proxy_url in self.proxies.items():
-                proxy_type: QNetworkProxy.ProxyType
-                match protocol:
-                    case '':
-                        proxy_type = QNetworkProxy.ProxyType.NoProxy
-                    case 'ftp':
-                        proxy_type = QNetworkProxy.ProxyType.FtpCachingProxy
-                    case 'http':
-                        proxy_type = QNetworkProxy.ProxyType.HttpProxy
-                    case 'socks5':
-                        proxy_type = QNetworkProxy.ProxyType.Socks5Proxy
-                    case other:
-                        raise ValueError(f'proxy protocol "{other}" is not supported.')
-
-                proxy_url = QUrl(proxy_url)
-                proxy = QNetworkProxy(proxy_type, proxy_url.host(), proxy_url.port())
-                session.manager.setProxy(proxy)
+            redirect_policy = QNetworkRequest.RedirectPolicy.ManualRedirectPolicy
+        # Qt only reads the attribute as an integer
+        self._request.setAttribute(QNetworkRequest.Attribute.RedirectPolicyAttribute, redirect_policy.value)
+
+        # Requests without their own proxies are spread over the proxy pool, if there is one
+        proxy: QNetworkProxy | None = self._prepare_proxy()
+        pooled_proxy: PooledProxy | None = None
+        if self.proxies is None and session.proxy_pool is not None:
+            if (pooled_proxy := session.proxy_pool.select()) is not None:
+                proxy = pooled_proxy.proxy
+        manager: QNetworkAccessManager = session.manager_for_proxy(proxy)
 
         if self.timeout:
             # Set transfer timeout amount
@@ -788,16 +1121,73 @@ class Request:
             transfer_timeout = int((self.timeout[1] if isinstance(self.timeout, Sequence) else self.timeout) * 1000)
             self._request.setTransferTimeout(transfer_timeout)
 
-        verb: bytes = self.method.encode('utf8')
-        _reply: QNetworkReply = session.manager.sendCustomRequest(self._request, verb, request_data)
-        response: Response = self._prepare_response(_reply, finished, progress)
+        if self.stream or response_sink is not None:
+            # The disk cache buffers bodies of unknown length in memory before saving them
+            self._request.setAttribute(QNetworkRequest.Attribute.CacheSaveControlAttribute, False)
+
+        body_size: int = 0
+        if isinstance(request_data, QIODevice):
+            # Stream the body from the device, which Qt would otherwise copy into memory first
+            if not request_data.isSequential():
+                body_size = request_data.size()
+            elif 'Content-Length' in request_headers:
+                body_size = int(request_headers['Content-Length'])
+            if body_size or not request_data.isSequential():
+                self._request.setAttribute(QNetworkRequest.Attribute.DoNotBufferUploadDataAttribute, True)
+        elif request_data:
+            body_size = len(request_data)
+
+        timing = ResponseTiming(body_size)
+
+        # Custom verbs bypass and invalidate the HTTP cache, so use the dedicated methods where possible
+        _reply: QNetworkReply
+        if self.method == 'GET' and request_data is None:
+            _reply = manager.get(self._request)
+        elif self.method == 'HEAD' and request_data is None:
+            _reply = manager.head(self._request)
+        else:
+            verb: bytes = self.method.encode('utf8')
+            _reply = manager.sendCustomRequest(self._request, verb, request_data)
+
+        if coalesce_key is not None:
+            # Stop attaching before any finished callback, so callbacks which send the request again aren't attached
+            _reply.finished.connect(  # pyright: ignore[reportGeneralTypeIssues]
+                DeferredCallable(session._in_flight.pop, coalesce_key, None), Qt.ConnectionType.SingleShotConnection
+            )
+
+        response: Response = self._prepare_response(
+            _reply, timing, finished, progress, upload_progress, ready_read, response_sink
+        )
+
+        if coalesce_key is not None:
+            session._in_flight[coalesce_key] = response
+
+        # Devices opened for this request are deleted with the reply, and devices given by the caller are left open
+        if isinstance(request_data, QIODevice) and request_data is not self.data:
+            request_data.setParent(_reply)
+
+        if session.metrics is not None:
+            _reply.finished.connect(  # pyright: ignore[reportGeneralTypeIssues]
+                DeferredCallable(session.metrics.record, self.method, _reply, timing),
+                Qt.ConnectionType.SingleShotConnection
+            )
+
+        if self.timeout:
+            # Create connection timeout
+            # This is for the RESPONSE side of the connection.
+            connect_timeout: float = self.timeout[0] if isinstance(self.timeout, Sequence) else self.timeout
+            if connect_timeout:
+                session.timeouts.add(_reply, connect_timeout)
+
+        if pooled_proxy is not None:
+            _reply.finished.connect(  # pyright: ignore[reportGeneralTypeIssues]
+                DeferredCallable(session.proxy_pool.record, pooled_proxy, _reply, timing),  # pyright: ignore
+                Qt.ConnectionType.SingleShotConnection
+            )
 
         if self.auth:
             session.reply_auth_map[_reply] = self.auth
 
-        if session.manager.redirectPolicy() != session.default_redirect_policy:
-            session.manager.setRedirectPolicy(session.default_redirect_policy)
-
         if wait_until_finished:
             wait_for_reply(_reply)
 
@@ -807,13 +1197,26 @@ class Request:
 class Response:
     """``requests``-like wrapper over a :py:class:`QNetworkReply`."""
 
-    def __init__(self, request: Request, reply: QNetworkReply) -> None:
+    def __init__(self, request: Request, reply: QNetworkReply, timing: ResponseTiming | None = None) -> None:
         """Initialize the :py:class:`Response`."""
+        self._body: QByteArray | bytes | None = None
         self._data: bytes | None = None
+        self._decoder: ContentDecoder | None = None
         self._encoding: str | None = None
         self._headers: CaseInsensitiveDict = CaseInsensitiveDict()
+        self._aborted: bool = False
         self._reply: QNetworkReply = reply
+        self._text: str | None = None
         self.request: Request = request
+        self.sink: ResponseSink | None = None
+        """Where the body is streamed to, if anywhere. Streamed data is not included in ``data``."""
+        self.timing: ResponseTiming = ResponseTiming() if timing is None else timing
+        """Timestamps of each phase of the request, and the amount of bytes transferred."""
+
+        self.decoded_bytes: int = 0
+        """Amount of body bytes read after decoding their content coding."""
+        self.wire_bytes: int = 0
+        """Amount of body bytes read as they were received, before decoding their content coding."""
 
     def __del__(self) -> None:
         """Usually the last reference to this :py:class:`Response` is connected to a :py:class:`QNetworkReply` signal.
@@ -829,6 +1232,92 @@ class Response:
         """Representation of the :py:class:`Response` with its HTTP status code."""
         return f'<Response [{self.code}]>'
 
+    def __await__(self) -> Generator[Any, None, Response]:
+        """Wait for the :py:class:`Response` to finish without blocking the running asyncio event loop.
+
+        The event loop must be integrated with Qt's (such as ``qasync.QEventLoop``),
+        otherwise the internal :py:class:`QNetworkReply` is never processed.
+        """
+        return self._until_finished().__await__()
+
+    def _read(self) -> bytes:
+        """Read and decode all body data that is currently available."""
+        data: QByteArray | bytes = self._read_buffer()
+        return data if isinstance(data, bytes) else data.data()
+
+    def _read_buffer(self) -> QByteArray | bytes:
+        """Read and decode all body data that is currently available.
+
+        Bodies without a content coding are returned as the :py:class:`QByteArray` read from the reply,
+        so they aren't copied into ``bytes`` until needed.
+        """
+        if self._decoder is None:
+            content_encoding: str = ''
+
+            # Qt decodes bodies itself if the request has no Accept-Encoding header, but keeps the Content-Encoding.
+            # Otherwise, leave bodies with unknown codings as-is, as they weren't requested.
+            if self._reply.request().hasRawHeader(b'Accept-Encoding'):
+                content_encoding = self._reply.rawHeader(b'Content-Encoding').data().decode('latin-1')
+                if not ContentDecoder.supports(content_encoding):
+                    content_encoding = ''
+
+            self._decoder = ContentDecoder(content_encoding)
+
+        data: QByteArray = self._reply.readAll()
+        self.wire_bytes += data.size()
+        if self.timing.finished is None:
+            self.timing.bytes_received += data.size()
+
+        if self._decoder.identity:
+            self.decoded_bytes += data.size()
+            return data
+
+        decoded: bytes = self._decoder.decode(
+            data.data(), final=self._reply.isFinished() and not self._reply.bytesAvailable()
+        )
+        self.decoded_bytes += len(decoded)
+        return decoded
+
+    def _write_sink(self) -> None:
+        """Write all body data that is currently available to the sink, aborting if it doesn't accept more."""
+        try:
+            if not self.sink.write(self._read()):  # pyright: ignore[reportOptionalMemberAccess]
+                self.abort()
+        except Exception:
+            self.abort()
+            self.sink.close(success=False)  # pyright: ignore[reportOptionalMemberAccess]
+            raise
+
+    def _close_sink(self) -> None:
+        """Write the rest of the body to the sink, then close it."""
+        if not self.sink.closed:  # pyright: ignore[reportOptionalMemberAccess]
+            self._write_sink()
+        self.sink.close(success=self.error == QNetworkReply.NetworkError.NoError)  # pyright: ignore
+
+    async def _until_finished(self) -> Response:
+        if not self.finished:
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+            def resolve() -> None:
+                if not future.done():
+                    future.set_result(None)
+
+            self._reply.finished.connect(resolve)  # pyright: ignore[reportGeneralTypeIssues]
+            await future
+
+        return self
+
+    @property
+    def buffer(self) -> memoryview:
+        """Return a read-only view of the :py:class:`Response` data, without copying it into ``bytes``.
+
+        The view is over the same data as ``data``, and keeps it alive while the view is referenced.
+        """
+        if self._body is None:
+            self._body = self._read_buffer()
+
+        return memoryview(self._body).toreadonly()
+
     @property
     def code(self) -> int | None:
         """Return the HTTP status code of the :py:class:`Response`.
@@ -839,21 +1328,59 @@ class Response:
 
     @property
     def data(self) -> bytes:
-        """Return the :py:class:`Response` data as ``bytes``, and cache it for later use."""
+        """Return the :py:class:`Response` data as ``bytes``, and cache it for later use.
+
+        Data which was already consumed by ``read()`` or streamed to a sink is not included.
+        """
         if self._data is None:
-            self._data = self._reply.readAll().data()
+            if self._body is None:
+                self._body = self._read_buffer()
+            # Keep only the copy, so the body isn't held twice
+            self._data = self._body = self._body if isinstance(self._body, bytes) else self._body.data()
 
         return self._data
 
+    @property
+    def elapsed(self) -> dt.timedelta | None:
+        """Return the time between sending the request and receiving the response headers.
+
+        ``None`` is returned if the response headers have not been received.
+        """
+        if self.timing.headers is None:
+            return None
+        return dt.timedelta(seconds=self.timing.headers - self.timing.queued)
+
     @property
     def encoding(self) -> str | None:
-        """Return the detected encoding for data, and cache it for later use."""
+        """Return the encoding of data, and cache it for later use.
+
+        The charset of the ``Content-Type`` header is used if Python supports it.
+        Otherwise, JSON is detected from its first bytes, and other data from a byte order mark or HTML meta tag.
+        Only the first 1024 bytes of data are searched.
+        """
         if self._encoding is None:
-            decoder: QStringDecoder = QStringDecoder.decoderForHtml(self.data)
-            self._encoding = str(decoder.name())
+            mimetype, _, parameters = self._reply.rawHeader(b'Content-Type').data().decode('latin-1').partition(';')
+
+            if match := _CHARSET_PATTERN.search(parameters):
+                try:
+                    self._encoding = codecs.lookup(match[1]).name
+                except LookupError:
+                    pass
+
+            if self._encoding is None:
+                head: bytes = bytes(self.buffer[:1024])
+                if mimetype.strip().lower().endswith('json'):
+                    self._encoding = guess_json_utf(head) or 'utf-8'
+                else:
+                    self._encoding = str(QStringDecoder.decoderForHtml(head).name())
 
         return self._encoding
 
+    @property
+    def error(self) -> QNetworkReply.NetworkError:
+        """Return the network error of the :py:class:`Response`, which is ``NoError`` if it succeeded."""
+        return self._reply.error()
+
     @property
     def finished(self) -> bool:
         """Return whether the internal :py:class:`QNetworkReply` is marked as finished."""
@@ -895,12 +1422,8 @@ class Response:
 
     @property
     def json(self) -> dict[str, Any]:
-        """Return the :py:class:`Response` data as a ``JSON`` object."""
-        data: bytes = self.data
-        if (encoding := self.encoding) is None:
-            encoding = guess_json_utf(data) or 'utf8'
-
-        return json_.loads(data.decode(encoding=encoding))
+        """Return the :py:class:`Response` data as a ``JSON`` object, parsed from ``text``."""
+        return json_.loads(self.text)
 
     @property
     def ok(self) -> bool:
@@ -912,20 +1435,49 @@ class Response:
 
     @property
     def text(self) -> str:
-        """Return the :py:class:`Response` data as a unicode-encoded string."""
-        data: bytes = self.data
-        encoding: str = self.encoding or 'utf8'
+        """Return the :py:class:`Response` data as a unicode-encoded string, and cache it for later use.
 
-        if not data:
-            return ''
+        The data is decoded from ``buffer``, so it's never copied into ``bytes``.
+        """
+        if self._text is None:
+            self._text = str(self.buffer, self.encoding or 'utf8')
 
-        return data.decode(encoding=encoding)
+        return self._text
+
+    @property
+    def timed_out(self) -> bool:
+        """Return whether the request was aborted because it timed out, instead of by :py:meth:`abort`.
+
+        Requests which didn't receive their response headers in time are marked by the session's ``timeouts``.
+        Qt aborts requests which pass their transfer timeout without marking them,
+        so any other abort of a request with a transfer timeout is counted as a timeout.
+        """
+        if TimeoutScheduler.is_timed_out(self._reply):
+            return True
+
+        return (self.error == QNetworkReply.NetworkError.OperationCanceledError and not self._aborted
+                and self._reply.request().transferTimeout() > 0)
 
     @property
     def url(self) -> QUrl:
         """Return the URL the :py:class:`Response` is from."""
         return self._reply.url()
 
+    def read(self) -> bytes:
+        """Read all data that is currently available from the :py:class:`Response`.
+
+        Data read by this method is consumed, and will not be included in ``data``.
+        This is meant for processing the body incrementally, such as from a ``ready_read`` callback.
+        Compressed data is decoded incrementally, so only the decoded bytes available so far are returned.
+        """
+        return self._read()
+
+    def abort(self) -> None:
+        """Abort the request if it is not finished, closing any network connections immediately."""
+        if not self.finished:
+            self._aborted = True
+            self._reply.abort()
+
     def delete(self) -> None:
         """Delete internal :py:class:`QNetworkReply`.
 
@@ -0,0 +1,305 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Timing and metrics of network requests for chatgpt_gui."""
+from __future__ import annotations
+
+__all__ = (
+    'EndpointMetrics',
+    'LatencyHistogram',
+    'MetricsRegistry',
+    'ResponseTiming',
+)
+
+import json
+import re
+import time
+from bisect import bisect_left
+from collections import deque
+from pathlib import Path
+from typing import Any
+from typing import Final
+
+from PySide6.QtCore import *
+from PySide6.QtNetwork import *
+
+from ..utils import atomic_write
+
+# Only whole path segments are IDs, so "/v1/models" and "/gpt-4" keep their digits
+_ID_SEGMENT_PATTERN: Final[re.Pattern] = re.compile(
+    r'(?<=/)(?:[\da-f]{8}-[\da-f]{4}-[\da-f]{4}-[\da-f]{4}-[\da-f]{12}|\d+)(?=/|$)', re.I
+)
+
+PHASES: Final[tuple[str, ...]] = ('queue', 'connect', 'server', 'transfer', 'first_byte', 'total')
+"""Names of the phases measured by :py:meth:`ResponseTiming.phases`, in milliseconds."""
+
+
+class ResponseTiming:
+    """Timestamps of each phase of a request, from ``time.perf_counter``. Phases which didn't happen are None.
+
+    Timestamps:
+        - queued: The request was given to Qt, which may wait for a free connection
+        - connecting: A new connection started connecting, including the DNS lookup
+        - encrypted: The TLS handshake of the new connection finished
+        - sent: The request headers and body were written
+        - headers: The response headers were received
+        - first_byte: The first bytes of the response body were available to read
+        - finished: The response finished, failed, or was aborted
+    """
+
+    # Qt signals are connected to bound methods through weak references
+    __slots__ = (
+        '__weakref__', 'bytes_received', 'bytes_sent', 'connecting', 'encrypted', 'first_byte', 'finished', 'headers',
+        'queued', 'sent'
+    )
+
+    def __init__(self, bytes_sent: int = 0) -> None:
+        """Create a new :py:class:`ResponseTiming`, marking the request as queued.
+
+        :param bytes_sent: Size of the request body.
+        """
+        self.queued: float = time.perf_counter()
+        self.connecting: float | None = None
+        self.encrypted: float | None = None
+        self.sent: float | None = None
+        self.headers: float | None = None
+        self.first_byte: float | None = None
+        self.finished: float | None = None
+
+        self.bytes_sent: int = bytes_sent
+        self.bytes_received: int = 0
+
+    def __repr__(self) -> str:
+        """Representation of the :py:class:`ResponseTiming` with the duration of each phase."""
+        phases: str = ', '.join(f'{name}={value:.1f}ms' for name, value in self.phases().items() if value is not None)
+        return f'<{type(self).__name__} ({phases})>'
+
+    @staticmethod
+    def _since(start: float | None, end: float | None) -> float | None:
+        """Milliseconds between two timestamps, or None if either didn't happen."""
+        if start is None or end is None:
+            return None
+        return (end - start) * 1000
+
+    def _mark(self, name: str) -> None:
+        if getattr(self, name) is None:
+            setattr(self, name, time.perf_counter())
+
+    def _mark_connecting(self) -> None:
+        self._mark('connecting')
+
+    def _mark_encrypted(self) -> None:
+        self._mark('encrypted')
+
+    def _mark_sent(self) -> None:
+        self._mark('sent')
+
+    def _mark_headers(self) -> None:
+        self._mark('headers')
+
+    def _mark_first_byte(self) -> None:
+        self._mark('first_byte')
+
+    def _mark_finished(self, unread_bytes: int = 0) -> None:
+        """Mark the response as finished, counting the body bytes which were received but not read yet."""
+        self._mark('finished')
+        self.bytes_received += unread_bytes
+
+    def phases(self) -> dict[str, float | None]:
+        """Return the duration of each phase in milliseconds.
+
+        Phases:
+            - queue: Waiting for a connection
+            - connect: Connecting to the host, including the DNS lookup and TLS handshake. None if reused
+            - server: Between sending the request and receiving the response headers
+            - transfer: Between receiving the response headers and finishing
+            - first_byte: Between queueing the request and the first bytes of the body, or headers if there is none
+            - total: Between queueing the request and finishing
+        """
+        connected: float | None = self.encrypted or self.sent
+        return {
+            'queue': self._since(self.queued, self.connecting or self.sent),
+            'connect': self._since(self.connecting, connected),
+            'server': self._since(self.sent, self.headers),
+            'transfer': self._since(self.headers, self.finished),
+            'first_byte': self._since(self.queued, self.first_byte or self.headers),
+            'total': self._since(self.queued, self.finished),
+        }
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the phase durations and transferred bytes as JSON data."""
+        return self.phases() | {'bytes_sent': self.bytes_sent, 'bytes_received': self.bytes_received}
+
+
+class LatencyHistogram:
+    """Histogram of durations in milliseconds, with fixed bucket bounds.
+
+    Percentiles are estimated as the upper bound of the bucket they fall in, and are never above the maximum.
+    """
+
+    BOUNDS: Final[tuple[float, ...]] = (
+        1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000
+    )
+    """Upper bound of each bucket in milliseconds. Durations above the last bound are counted in an extra bucket."""
+
+    __slots__ = ('buckets', 'count', 'maximum', 'minimum', 'total')
+
+    def __init__(self) -> None:
+        """Create a new empty :py:class:`LatencyHistogram`."""
+        self.buckets: list[int] = [0] * (len(self.BOUNDS) + 1)
+        self.count: int = 0
+        self.maximum: float = 0.0
+        self.minimum: float = 0.0
+        self.total: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Average duration in milliseconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Return an estimate of the given percentile in milliseconds, such as 50 for the median.
+
+        :param percent: Percentile from 0 to 100.
+        """
+        if not self.count:
+            return 0.0
+
+        rank: float = self.count * percent / 100
+        cumulative: int = 0
+        for bound, amount in zip((*self.BOUNDS, self.maximum), self.buckets):
+            cumulative += amount
+            if cumulative >= rank and amount:
+                return min(bound, self.maximum)
+        return self.maximum
+
+    def record(self, milliseconds: float) -> None:
+        """Add a duration to the histogram."""
+        self.buckets[bisect_left(self.BOUNDS, milliseconds)] += 1
+        self.minimum = milliseconds if not self.count else min(self.minimum, milliseconds)
+        self.maximum = max(self.maximum, milliseconds)
+        self.count += 1
+        self.total += milliseconds
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the histogram as JSON data, with common percentiles."""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.minimum,
+            'max': self.maximum,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'bounds': list(self.BOUNDS),
+            'buckets': self.buckets,
+        }
+
+
+class EndpointMetrics:
+    """Totals and latency histograms of the requests sent to a single endpoint."""
+
+    __slots__ = ('bytes_received', 'bytes_sent', 'count', 'errors', 'histograms')
+
+    def __init__(self) -> None:
+        """Create a new empty :py:class:`EndpointMetrics`."""
+        self.bytes_received: int = 0
+        self.bytes_sent: int = 0
+        self.count: int = 0
+        self.errors: int = 0
+        self.histograms: dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in PHASES}
+
+    def record(self, timing: ResponseTiming, error: bool) -> None:
+        """Add a finished request to the totals and histograms.
+
+        :param timing: Timing of the request.
+        :param error: Whether the request failed or received an error status.
+        """
+        self.bytes_received += timing.bytes_received
+        self.bytes_sent += timing.bytes_sent
+        self.count += 1
+        self.errors += error
+
+        for phase, milliseconds in timing.phases().items():
+            if milliseconds is not None:
+                self.histograms[phase].record(milliseconds)
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the totals and histograms as JSON data."""
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'phases': {phase: histogram.to_json() for phase, histogram in self.histograms.items()},
+        }
+
+
+class MetricsRegistry:
+    """In-process registry of the timing of every finished request, grouped by endpoint.
+
+    Endpoints are named by method, host, and path, with numeric and UUID path segments replaced by ":id",
+    so requests to the same resource with different identifiers are grouped together.
+    The most recent requests are also kept with their individual timings, for offline analysis with :py:meth:`dump`.
+    """
+
+    __slots__ = ('endpoints', 'recent', 'started')
+
+    def __init__(self, max_recent: int = 500) -> None:
+        """Create a new empty :py:class:`MetricsRegistry`.
+
+        :param max_recent: Amount of recent requests to keep individual timings of.
+        """
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.recent: deque[dict[str, Any]] = deque(maxlen=max_recent)
+        self.started: float = time.time()
+
+    @staticmethod
+    def endpoint(method: str, url: QUrl) -> str:
+        """Return the endpoint name of a request, such as "GET chat.openai.com/backend-api/conversation/:id"."""
+        return f'{method} {url.host()}{_ID_SEGMENT_PATTERN.sub(":id", url.path())}'
+
+    def clear(self) -> None:
+        """Remove every recorded request."""
+        self.endpoints.clear()
+        self.recent.clear()
+        self.started = time.time()
+
+    def dump(self, path: Path) -> None:
+        """Atomically write the registry to a JSON file.
+
+        :param path: Path of file to write to.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, json.dumps(self.to_json(), indent=2))
+
+    def record(self, method: str, reply: QNetworkReply, timing: ResponseTiming) -> None:
+        """Record a finished request.
+
+        :param method: HTTP method of the request.
+        :param reply: Finished reply of the request.
+        :param timing: Timing of the request.
+        """
+        url: QUrl = reply.request().url()
+        code: int | None = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+        error: bool = reply.error() != QNetworkReply.NetworkError.NoError
+
+        name: str = self.endpoint(method, url)
+        if (metrics := self.endpoints.get(name)) is None:
+            metrics = self.endpoints[name] = EndpointMetrics()
+        metrics.record(timing, error)
+
+        self.recent.append({
+            'endpoint': name,
+            'time': time.time(),
+            'status': code,
+            'error': reply.error().name if error else None,
+        } | timing.to_json())
+
+    def to_json(self) -> dict[str, Any]:
+        """Return every endpoint and recent request as JSON data."""
+        return {
+            'started': self.started,
+            'endpoints': {name: metrics.to_json() for name, metrics in sorted(self.endpoints.items())},
+            'recent': list(self.recent),
+        }
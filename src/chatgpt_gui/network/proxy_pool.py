@@ -0,0 +1,299 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Load balancing of requests over a pool of proxies for chatgpt_gui."""
+from __future__ import annotations
+
+__all__ = (
+    'PooledProxy',
+    'PROXY_ERRORS',
+    'ProxyPool',
+    'STRATEGIES',
+)
+
+import time
+from collections.abc import Iterable
+from typing import Final
+
+from PySide6.QtCore import *
+from PySide6.QtNetwork import *
+
+from ..constants import *
+from .manager import NetworkSession
+from .manager import Response
+from .metrics import ResponseTiming
+
+_Error = QNetworkReply.NetworkError
+
+# Proxies connect to the server themselves, so connection errors of a proxied request are errors of the proxy
+PROXY_ERRORS: Final[frozenset[QNetworkReply.NetworkError]] = frozenset({
+    _Error.ConnectionRefusedError,
+    _Error.HostNotFoundError,
+    _Error.ProxyAuthenticationRequiredError,
+    _Error.ProxyConnectionClosedError,
+    _Error.ProxyConnectionRefusedError,
+    _Error.ProxyNotFoundError,
+    _Error.ProxyTimeoutError,
+    _Error.RemoteHostClosedError,
+    _Error.TemporaryNetworkFailureError,
+    _Error.TimeoutError,
+    _Error.UnknownProxyError,
+})
+"""Network errors which mean a request failed because of its proxy, rather than the server."""
+
+STRATEGIES: Final[tuple[str, ...]] = ('round_robin', 'least_latency')
+"""Ways a :py:class:`ProxyPool` can select the proxy of a request."""
+
+_UNHEALTHY_PROBE_STATUSES: Final[frozenset[int]] = frozenset({407, 502, 503, 504})
+
+
+class PooledProxy:
+    """A proxy in a :py:class:`ProxyPool`, with its health and latency."""
+
+    __slots__ = ('ejected_at', 'failures', 'latency', 'protocol', 'proxy', 'requests', 'url')
+
+    def __init__(self, url: str) -> None:
+        """Create a new healthy :py:class:`PooledProxy` from its URL.
+
+        :param url: Proxy URL, following ``CG_PROXY_PATTERN``. The protocol defaults to http.
+        :raises ValueError: If the URL doesn't match the pattern, or its protocol is not either http or socks5.
+        """
+        if not (match := CG_PROXY_PATTERN.match(url)):
+            raise ValueError(f'Invalid proxy pattern. Must match {CG_PROXY_PATTERN}')
+
+        match_dict = match.groupdict()
+        self.protocol: str = match_dict.get('protocol') or 'http'
+        match self.protocol:
+            case 'http':
+                proxy_type = QNetworkProxy.ProxyType.HttpProxy
+            case 'socks5':
+                proxy_type = QNetworkProxy.ProxyType.Socks5Proxy
+            case _:
+                raise ValueError('Proxy protocol must be either http or socks5.')
+
+        self.url: str = url
+        self.proxy: QNetworkProxy = QNetworkProxy(
+            proxy_type, match_dict['host'], int(match_dict['port']),
+            match_dict.get('username') or '', match_dict.get('password') or ''
+        )
+
+        self.ejected_at: float | None = None
+        """When the proxy was ejected from the pool, from ``time.monotonic``. None if it's healthy."""
+        self.failures: int = 0
+        """Consecutive requests which failed because of the proxy."""
+        self.latency: float | None = None
+        """Moving average of the seconds until response headers were received through the proxy."""
+        self.requests: int = 0
+        """Amount of requests sent through the proxy."""
+
+    def __repr__(self) -> str:
+        """Representation of the :py:class:`PooledProxy` with its host and health."""
+        state: str = 'healthy' if self.healthy else 'ejected'
+        latency: str = '' if self.latency is None else f', {self.latency * 1000:.0f}ms'
+        return f'<{type(self).__name__} ({self.proxy.hostName()}:{self.proxy.port()}, {state}{latency})>'
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the proxy is used for requests."""
+        return self.ejected_at is None
+
+    @property
+    def proxies(self) -> dict[str, str]:
+        """Proxy as the ``proxies`` argument of a :py:class:`Request`."""
+        url: str = self.url if '://' in self.url else f'{self.protocol}://{self.url}'
+        return {self.protocol: url}
+
+
+class ProxyPool(QObject):
+    """Spreads the requests of a :py:class:`NetworkSession` over a pool of proxies.
+
+    Each request without its own proxies is sent through a proxy selected by ``strategy``:
+        - round_robin: Each healthy proxy in turn
+        - least_latency: The healthy proxy with the lowest average latency, trying proxies without one first
+
+    A proxy is ejected from the pool once ``max_failures`` requests in a row fail because of it.
+    If ``health_url`` is set, every proxy is probed with a HEAD request to it each ``health_interval`` seconds,
+    sent through ``probe_session`` with the User-Agent of the session.
+    Ejected proxies are restored by a successful probe, and healthy proxies are ejected by a failed one.
+    If every proxy is ejected, all of them are used, so requests keep failing fast instead of bypassing the pool.
+    """
+
+    proxyEjected = Signal(str)
+    """Emitted with the URL of a proxy when it's ejected from the pool."""
+
+    proxyRestored = Signal(str)
+    """Emitted with the URL of an ejected proxy when it's restored to the pool."""
+
+    def __init__(self, session: NetworkSession, proxies: Iterable[str] = (),
+                 strategy: str = 'round_robin',
+                 health_url: str | None = None,
+                 health_interval: float = 60.0,
+                 max_failures: int = 3,
+                 probe_timeout: float = 10.0,
+                 parent: QObject | None = None) -> None:
+        """Create a new :py:class:`ProxyPool` and use it for the requests of a session.
+
+        :param session: Session to select the proxies of requests for.
+        :param proxies: URLs of the proxies in the pool.
+        :param strategy: How to select the proxy of each request, one of ``STRATEGIES``.
+        :param health_url: URL to probe proxies with. If None, proxies are only ejected by failed requests.
+        :param health_interval: Seconds between probes of every proxy.
+        :param max_failures: Consecutive failed requests before a proxy is ejected.
+        :param probe_timeout: Seconds before a probe fails.
+        :param parent: Parent of the pool.
+        :raises ValueError: If a proxy URL or the strategy is invalid.
+        """
+        super().__init__(parent)
+        self._next: int = 0
+        self._proxies: dict[str, PooledProxy] = {}
+        self._strategy: str = ''
+        self.session: NetworkSession = session
+        # Probes have their own session, so they aren't recorded as traffic of the session in metrics,
+        # cache counters, or connection activity
+        self.probe_session: NetworkSession = NetworkSession(self)
+        self.health_url: str | None = health_url
+        self.max_failures: int = max_failures
+        self.probe_timeout: float = probe_timeout
+        self.strategy = strategy
+
+        self.ejections: int = 0
+        """Amount of times a proxy was ejected from the pool."""
+
+        self._health_timer: QTimer = QTimer(self)
+        self._health_timer.timeout.connect(self.probe)  # pyright: ignore[reportGeneralTypeIssues]
+        self.health_interval = health_interval
+
+        self.set_proxies(proxies)
+        session.proxy_pool = self
+
+    @property
+    def health_interval(self) -> float:
+        """Seconds between probes of every proxy. Probes are stopped if this is not positive."""
+        return self._health_timer.interval() / 1000
+
+    @health_interval.setter
+    def health_interval(self, value: float) -> None:
+        self._health_timer.setInterval(int(value * 1000))
+        self._update_health_timer()
+
+    @property
+    def healthy(self) -> list[PooledProxy]:
+        """Proxies which are used for requests."""
+        return [proxy for proxy in self._proxies.values() if proxy.healthy]
+
+    @property
+    def proxies(self) -> list[PooledProxy]:
+        """Every proxy in the pool, including ejected proxies."""
+        return list(self._proxies.values())
+
+    @property
+    def strategy(self) -> str:
+        """How the proxy of each request is selected, one of ``STRATEGIES``."""
+        return self._strategy
+
+    @strategy.setter
+    def strategy(self, value: str) -> None:
+        if value not in STRATEGIES:
+            raise ValueError(f'Proxy strategy must be one of {", ".join(STRATEGIES)}, not "{value}".')
+        self._strategy = value
+
+    def _update_health_timer(self) -> None:
+        if self._proxies and self._health_timer.interval() > 0:
+            self._health_timer.start()
+        else:
+            self._health_timer.stop()
+
+    def eject(self, proxy: PooledProxy) -> None:
+        """Stop using a proxy for requests until it's restored."""
+        if proxy.healthy:
+            proxy.ejected_at = time.monotonic()
+            self.ejections += 1
+            self.proxyEjected.emit(proxy.url)
+
+    def restore(self, proxy: PooledProxy) -> None:
+        """Use an ejected proxy for requests again."""
+        proxy.failures = 0
+        if not proxy.healthy:
+            proxy.ejected_at = None
+            self.proxyRestored.emit(proxy.url)
+
+    def probe(self) -> None:
+        """Send a HEAD request to ``health_url`` through every proxy, ejecting or restoring each by its outcome.
+
+        Does nothing if there is no health URL.
+        """
+        if not self.health_url:
+            return
+
+        # Only identify as the session, its auth headers aren't meant for the health URL
+        user_agent: str | None = self.session.headers.get('User-Agent')
+        headers: dict[str, str] | None = None if user_agent is None else {'User-Agent': user_agent}
+
+        for proxy in self.proxies:
+            self.probe_session.head(
+                self.health_url, headers=headers, proxies=proxy.proxies, timeout=self.probe_timeout,
+                finished=lambda response, _proxy=proxy: self._handle_probe(_proxy, response)
+            )
+
+    def _handle_probe(self, proxy: PooledProxy, response: Response) -> None:
+        # Any response from the server means the proxy works, unless it's an error from the proxy itself
+        if proxy.url not in self._proxies:
+            return
+
+        if response.code is not None and response.code not in _UNHEALTHY_PROBE_STATUSES:
+            self._update_latency(proxy, response.timing)
+            self.restore(proxy)
+        else:
+            self.eject(proxy)
+
+    def _update_latency(self, proxy: PooledProxy, timing: ResponseTiming) -> None:
+        if timing.headers is not None:
+            latency: float = timing.headers - timing.queued
+            proxy.latency = latency if proxy.latency is None else proxy.latency * 0.7 + latency * 0.3
+
+    def record(self, proxy: PooledProxy, reply: QNetworkReply, timing: ResponseTiming) -> None:
+        """Record the outcome of a finished request sent through a proxy of the pool.
+
+        :param proxy: Proxy the request was sent through.
+        :param reply: Finished reply of the request.
+        :param timing: Timing of the request.
+        """
+        if reply.error() in PROXY_ERRORS:
+            proxy.failures += 1
+            if proxy.failures >= self.max_failures:
+                self.eject(proxy)
+            return
+
+        # Aborted requests may have been cancelled by the user, so they don't count either way
+        if reply.error() != QNetworkReply.NetworkError.OperationCanceledError:
+            proxy.failures = 0
+            self._update_latency(proxy, timing)
+
+    def select(self) -> PooledProxy | None:
+        """Return the proxy to send the next request through, or None if the pool is empty."""
+        candidates: list[PooledProxy] = self.healthy or self.proxies
+        if not candidates:
+            return None
+
+        proxy: PooledProxy
+        if self.strategy == 'least_latency':
+            proxy = min(candidates, key=lambda p: -1.0 if p.latency is None else p.latency)
+        else:
+            proxy = candidates[self._next % len(candidates)]
+            self._next += 1
+
+        proxy.requests += 1
+        return proxy
+
+    def set_proxies(self, urls: Iterable[str]) -> None:
+        """Replace the proxies in the pool. Proxies which were already in the pool keep their health and latency.
+
+        :param urls: URLs of the proxies.
+        :raises ValueError: If a proxy URL is invalid.
+        """
+        proxies: dict[str, PooledProxy] = {}
+        for url in urls:
+            proxies[url] = self._proxies.get(url) or PooledProxy(url)
+
+        self._proxies = proxies
+        self._update_health_timer()
@@ -0,0 +1,195 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Client-side rate limiting of requests for chatgpt_gui."""
+from __future__ import annotations
+
+__all__ = (
+    'RateLimiter',
+    'TokenBucket',
+)
+
+import asyncio
+import time
+from collections.abc import Mapping
+
+from PySide6.QtCore import *
+
+from ..utils import wait_for_timeout
+
+
+class TokenBucket:
+    """Allows an average ``rate`` of requests per second, with bursts of up to ``capacity`` requests.
+
+    The bucket starts full, and refills continuously at ``rate`` tokens per second. Sending a request takes a token.
+    Tokens can be reserved before they are available, in which case the amount of tokens goes negative and the
+    caller waits until the token would have been refilled. This queues callers in the order they reserved.
+    """
+
+    __slots__ = ('_tokens', '_updated', 'capacity', 'rate')
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """Create a new full :py:class:`TokenBucket`.
+
+        :param rate: Tokens refilled per second.
+        :param capacity: Maximum amount of tokens, allowing bursts of that many requests.
+            Defaults to one second of rate.
+        :raises ValueError: If the rate is not positive.
+        """
+        if rate <= 0:
+            raise ValueError('Token bucket rate must be positive.')
+
+        self.capacity: float = max(rate, 1.0) if capacity is None else capacity
+        self.rate: float = rate
+        self._tokens: float = self.capacity
+        self._updated: float = time.monotonic()
+
+    def __repr__(self) -> str:
+        """Representation of the :py:class:`TokenBucket` with its rate and available tokens."""
+        return f'<{type(self).__name__} ({self.rate}/s, {self.tokens:.2f}/{self.capacity} tokens)>'
+
+    def _refill(self) -> None:
+        now: float = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated) * self.rate, self.capacity)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Amount of tokens currently available. Negative if tokens have been reserved in advance."""
+        self._refill()
+        return self._tokens
+
+    def release(self, tokens: float = 1.0) -> None:
+        """Return tokens which were taken but not used, such as for a request cancelled before it was sent.
+
+        :param tokens: Amount of tokens to return.
+        """
+        self._refill()
+        self._tokens = min(self._tokens + tokens, self.capacity)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens from the bucket, even if they are not available yet.
+
+        :param tokens: Amount of tokens to take.
+        :return: Seconds to wait before the tokens are available.
+        """
+        self._refill()
+        self._tokens -= tokens
+        return max(-self._tokens / self.rate, 0.0)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens from the bucket only if they are available now.
+
+        :param tokens: Amount of tokens to take.
+        :return: True if the tokens were taken.
+        """
+        self._refill()
+        if self._tokens < tokens:
+            return False
+
+        self._tokens -= tokens
+        return True
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Return the seconds until the given amount of tokens would be available, without taking them."""
+        self._refill()
+        return max((tokens - self._tokens) / self.rate, 0.0)
+
+
+class RateLimiter:
+    """Paces requests with a separate :py:class:`TokenBucket` for each class of endpoint.
+
+    Requests are classified by the path of their URL, using the first matching prefix in ``endpoints``.
+    Requests that don't match any prefix use the "default" bucket, or are not limited if there is none.
+
+    Instead of sending requests over the limit and receiving a "429 Too Many Requests" response,
+    callers wait for their turn with :py:meth:`acquire` or :py:meth:`aacquire`,
+    or queue their request for later with the delay returned by :py:meth:`reserve`.
+    """
+
+    __slots__ = ('buckets', 'endpoints', 'throttle_wait', 'throttled')
+
+    def __init__(self, buckets: Mapping[str, TokenBucket], endpoints: Mapping[str, str] | None = None) -> None:
+        """Create a new :py:class:`RateLimiter`.
+
+        :param buckets: Token bucket for each endpoint class. The "default" class is used for unmatched requests.
+        :param endpoints: Path prefix of each endpoint class, without a leading slash.
+            A prefix matches the path itself and any path below it.
+        """
+        self.buckets: dict[str, TokenBucket] = dict(buckets)
+        self.endpoints: dict[str, str] = {} if endpoints is None else {
+            prefix.strip('/'): endpoint for endpoint, prefix in endpoints.items()
+        }
+
+        self.throttled: int = 0
+        """Amount of requests which had to wait to be sent."""
+        self.throttle_wait: float = 0.0
+        """Total seconds requests were delayed by."""
+
+    def bucket(self, url: QUrl | str) -> TokenBucket | None:
+        """Return the bucket which limits requests to the given URL, or None if they are not limited."""
+        return self.buckets.get(self.classify(url))
+
+    def classify(self, url: QUrl | str) -> str:
+        """Return the endpoint class of the given URL."""
+        path: str = QUrl(url).path().strip('/')
+        for prefix, endpoint in self.endpoints.items():
+            if path == prefix or path.startswith(f'{prefix}/'):
+                return endpoint
+        return 'default'
+
+    def reserve(self, url: QUrl | str) -> float:
+        """Reserve a token to send a request to the given URL.
+
+        The request must be sent after the returned delay, as the token is already taken.
+
+        :param url: URL of the request.
+        :return: Seconds to wait before sending the request.
+        """
+        if (bucket := self.bucket(url)) is None:
+            return 0.0
+
+        if (delay := bucket.reserve()) > 0:
+            self.throttled += 1
+            self.throttle_wait += delay
+        return delay
+
+    def acquire(self, url: QUrl | str) -> float:
+        """Wait in a local event loop until a request can be sent to the given URL.
+
+        :param url: URL of the request.
+        :return: Seconds waited.
+        """
+        delay: float = self.reserve(url)
+        wait_for_timeout(delay)
+        return delay
+
+    async def aacquire(self, url: QUrl | str) -> float:
+        """Wait until a request can be sent to the given URL, without blocking the running asyncio event loop.
+
+        :param url: URL of the request.
+        :return: Seconds waited.
+        """
+        if (delay := self.reserve(url)) > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def release(self, url: QUrl | str) -> None:
+        """Return the token reserved for a request to the given URL, if the request was not sent.
+
+        :param url: URL of the request.
+        """
+        if (bucket := self.bucket(url)) is not None:
+            bucket.release()
+
+    def wait_time(self, url: QUrl | str | None = None) -> float:
+        """Return how many seconds a request would currently wait before being sent.
+
+        :param url: URL of the request. If None, return the longest wait of any endpoint class.
+        """
+        if url is None:
+            return max((bucket.wait_time() for bucket in self.buckets.values()), default=0.0)
+
+        if (bucket := self.bucket(url)) is None:
+            return 0.0
+        return bucket.wait_time()
@@ -0,0 +1,352 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Retrying of failed requests and per-host circuit breaking for chatgpt_gui."""
+from __future__ import annotations
+
+__all__ = (
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'RetryPolicy',
+)
+
+import asyncio
+import datetime as dt
+import random
+import time
+from collections.abc import Collection
+from email.utils import parsedate_to_datetime
+from typing import Any
+from typing import Final
+
+from PySide6.QtCore import *
+from PySide6.QtNetwork import *
+
+from ..utils import wait_for_timeout
+from .manager import NetworkSession
+from .manager import Request
+from .manager import Response
+
+_Error = QNetworkReply.NetworkError
+
+RETRY_STATUSES: Final[frozenset[int]] = frozenset({429, 500, 502, 503, 504})
+"""HTTP status codes of responses which are likely to succeed if sent again later."""
+
+RETRY_ERRORS: Final[frozenset[QNetworkReply.NetworkError]] = frozenset({
+    _Error.ConnectionRefusedError,
+    _Error.NetworkSessionFailedError,
+    _Error.ProxyTimeoutError,
+    _Error.RemoteHostClosedError,
+    _Error.TemporaryNetworkFailureError,
+    _Error.TimeoutError,
+    _Error.UnknownNetworkError,
+})
+"""Network errors of requests without a response which are likely to succeed if sent again later.
+
+Requests which timed out are also retried, see :py:attr:`Response.timed_out`.
+"""
+
+IDEMPOTENT_METHODS: Final[frozenset[str]] = frozenset({'DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'})
+"""HTTP methods which can be safely sent more than once."""
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when a request is not sent because its host is failing."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        """Create a new :py:class:`CircuitOpenError` for the given host.
+
+        :param host: Host which requests are not sent to.
+        :param retry_in: Seconds until a request to the host is allowed again.
+        """
+        super().__init__(f'Requests to {host} are failing. Trying again in {retry_in:.0f} seconds.')
+        self.host: str = host
+        self.retry_in: float = retry_in
+
+
+class _Circuit:
+    """State of the :py:class:`CircuitBreaker` for a single host."""
+
+    __slots__ = ('failures', 'opened_at', 'trial')
+
+    def __init__(self) -> None:
+        self.failures: int = 0
+        self.opened_at: float | None = None
+        self.trial: bool = False
+
+
+class CircuitBreaker:
+    """Stops sending requests to a host after it fails too many times in a row, failing fast instead.
+
+    Each host has a circuit which is "closed" while requests succeed. After ``failure_threshold`` consecutive
+    failures, the circuit "opens" and requests to the host are rejected with :py:class:`CircuitOpenError`,
+    so a backend that is down isn't sent more load and users aren't left waiting on it.
+
+    After ``reset_timeout`` seconds, the circuit is "half_open" and a single trial request is allowed.
+    If it succeeds the circuit closes, otherwise it opens again for another ``reset_timeout``.
+    Failures of requests sent before the circuit opened don't extend the timeout.
+    """
+
+    __slots__ = ('_circuits', 'failure_threshold', 'rejections', 'reset_timeout', 'trips')
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """Create a new :py:class:`CircuitBreaker`.
+
+        :param failure_threshold: Consecutive failures before the circuit of a host opens.
+        :param reset_timeout: Seconds the circuit of a host stays open before a trial request is allowed.
+        """
+        self._circuits: dict[str, _Circuit] = {}
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+
+        self.rejections: int = 0
+        """Amount of requests rejected because their host's circuit was open."""
+        self.trips: int = 0
+        """Amount of times a circuit opened."""
+
+    def _circuit(self, host: str) -> _Circuit:
+        if (circuit := self._circuits.get(host)) is None:
+            circuit = self._circuits[host] = _Circuit()
+        return circuit
+
+    def check(self, host: str) -> None:
+        """Check whether a request to the host can be sent, claiming the trial request if the circuit is half-open.
+
+        :param host: Host of the request.
+        :raises CircuitOpenError: If the circuit of the host is open, or a trial request was sent recently.
+        """
+        circuit: _Circuit | None = self._circuits.get(host)
+        if circuit is None or circuit.opened_at is None:
+            return
+
+        now: float = time.monotonic()
+        retry_in: float = circuit.opened_at + self.reset_timeout - now
+        if retry_in <= 0:
+            # Restart the timeout, so another trial is allowed if this one is never recorded
+            circuit.opened_at = now
+            circuit.trial = True
+            return
+
+        self.rejections += 1
+        raise CircuitOpenError(host, max(retry_in, 0.0))
+
+    def record(self, host: str, success: bool) -> None:
+        """Record the outcome of a request to the host, opening or closing its circuit.
+
+        :param host: Host of the request.
+        :param success: Whether the host responded without a server error.
+        """
+        circuit: _Circuit = self._circuit(host)
+        if success:
+            circuit.failures = 0
+            circuit.opened_at = None
+            circuit.trial = False
+            return
+
+        circuit.failures += 1
+        if circuit.trial or (circuit.opened_at is None and circuit.failures >= self.failure_threshold):
+            circuit.opened_at = time.monotonic()
+            circuit.trial = False
+            self.trips += 1
+
+    def reset(self, host: str | None = None) -> None:
+        """Close the circuit of a host, allowing requests to be sent to it immediately.
+
+        :param host: Host to reset. If None, reset every host.
+        """
+        if host is None:
+            self._circuits.clear()
+        else:
+            self._circuits.pop(host, None)
+
+    def state(self, host: str) -> str:
+        """Return the state of the circuit of a host, one of "closed", "open", or "half_open"."""
+        circuit: _Circuit | None = self._circuits.get(host)
+        if circuit is None or circuit.opened_at is None:
+            return 'closed'
+        if circuit.trial or time.monotonic() - circuit.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+
+class RetryPolicy:
+    """Sends requests again after transient failures, waiting longer after each attempt.
+
+    Requests are retried if they received a status in ``retry_statuses``, or failed without a response with
+    an error in ``retry_errors``, such as timing out. Only requests with an idempotent method are retried.
+
+    The wait before each retry grows exponentially from ``backoff_factor`` up to ``max_backoff``, and is randomized
+    between zero and that value, so clients that failed at the same time don't retry at the same time.
+    If the server sent a ``Retry-After`` header, its delay is used instead, unless it is longer than
+    ``max_retry_after``, in which case the response is returned immediately instead of making the user wait.
+
+    If the policy has a :py:class:`CircuitBreaker`, every attempt is checked against and recorded in it.
+    """
+
+    __slots__ = (
+        'backoff_factor', 'circuit_breaker', 'jitter', 'max_backoff', 'max_retries', 'max_retry_after',
+        'retries', 'retries_exhausted', 'retry_errors', 'retry_statuses', 'retry_wait'
+    )
+
+    def __init__(self, max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0,
+                 max_retry_after: float = 10.0,
+                 jitter: bool = True,
+                 retry_statuses: Collection[int] = RETRY_STATUSES,
+                 retry_errors: Collection[QNetworkReply.NetworkError] = RETRY_ERRORS,
+                 circuit_breaker: CircuitBreaker | None = None) -> None:
+        """Create a new :py:class:`RetryPolicy`.
+
+        :param max_retries: Maximum amount of times a request is sent again. If 0, requests are never retried.
+        :param backoff_factor: Seconds to wait before the first retry, doubling each retry after.
+        :param max_backoff: Maximum seconds to wait between retries, not including ``Retry-After`` delays.
+        :param max_retry_after: Maximum ``Retry-After`` delay to wait for.
+        :param jitter: Whether to wait a random amount of time, up to the backoff delay.
+        :param retry_statuses: HTTP status codes to retry.
+        :param retry_errors: Network errors to retry, for requests which failed without a response.
+        :param circuit_breaker: Breaker to check before each attempt, and to record each attempt's outcome in.
+        """
+        self.backoff_factor: float = backoff_factor
+        self.circuit_breaker: CircuitBreaker | None = circuit_breaker
+        self.jitter: bool = jitter
+        self.max_backoff: float = max_backoff
+        self.max_retries: int = max_retries
+        self.max_retry_after: float = max_retry_after
+        self.retry_errors: frozenset[QNetworkReply.NetworkError] = frozenset(retry_errors)
+        self.retry_statuses: frozenset[int] = frozenset(retry_statuses)
+
+        self.retries: int = 0
+        """Amount of requests sent again after failing."""
+        self.retries_exhausted: int = 0
+        """Amount of requests which still failed after being sent ``max_retries`` times."""
+        self.retry_wait: float = 0.0
+        """Total seconds waited before retrying requests."""
+
+    @staticmethod
+    def retry_after(response: Response) -> float | None:
+        """Return the delay of the response's ``Retry-After`` header in seconds, or None if it has none.
+
+        The header may be an amount of seconds, or an HTTP date.
+        """
+        value: int | str | None = response.headers.get('Retry-After')
+        if value is None or isinstance(value, bool):
+            return None
+
+        if isinstance(value, int):
+            return float(value)
+
+        try:
+            date: dt.datetime = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max((date - dt.datetime.now(dt.timezone.utc)).total_seconds(), 0.0)
+
+    def backoff(self, attempt: int) -> float:
+        """Return the seconds to wait before sending a request again after the given amount of failed attempts."""
+        delay: float = min(self.backoff_factor * 2 ** (attempt - 1), self.max_backoff)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def is_cancelled(response: Response) -> bool:
+        """Whether the request was aborted by its caller or on shutdown, rather than failing or timing out."""
+        return response.error == _Error.OperationCanceledError and not response.timed_out
+
+    def is_failure(self, response: Response) -> bool:
+        """Whether the response is a transient failure, which may succeed if the request is sent again."""
+        if (code := response.code) is not None:
+            return code in self.retry_statuses
+        return response.error in self.retry_errors or response.timed_out
+
+    def record(self, response: Response) -> bool:
+        """Record the outcome of a finished response in the circuit breaker, if the policy has one.
+
+        Cancelled requests say nothing about the host, so they aren't recorded.
+
+        :return: Whether the response is a transient failure.
+        """
+        if self.is_cancelled(response):
+            return False
+
+        failed: bool = self.is_failure(response)
+        if self.circuit_breaker is not None:
+            # Rate limiting means the host is up, so only count server errors and failed connections against it
+            self.circuit_breaker.record(QUrl(response.request.url).host(), not failed or response.code == 429)
+        return failed
+
+    def next_delay(self, response: Response, attempt: int) -> float | None:
+        """Record the outcome of a finished attempt, and return the seconds to wait before sending it again.
+
+        :param response: Finished response of the attempt.
+        :param attempt: Amount of times the request has been sent, including this attempt.
+        :return: Seconds to wait, or None if the request should not be retried.
+        """
+        request: Request = response.request
+        if not self.record(response) or request.method not in IDEMPOTENT_METHODS or not request.replayable:
+            return None
+
+        if attempt > self.max_retries:
+            self.retries_exhausted += 1
+            return None
+
+        delay: float | None = self.retry_after(response)
+        if delay is None:
+            delay = self.backoff(attempt)
+        elif delay > self.max_retry_after:
+            return None
+
+        self.retries += 1
+        self.retry_wait += delay
+        return delay
+
+    def _check_circuit(self, request: Request) -> None:
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.check(QUrl(request.url).host())
+
+    def _circuit_opened(self, request: Request) -> bool:
+        """Whether the request's host failed enough times to open its circuit, so retrying should stop."""
+        return self.circuit_breaker is not None and self.circuit_breaker.state(QUrl(request.url).host()) == 'open'
+
+    def send(self, session: NetworkSession, request: Request, **send_kwargs: Any) -> Response:
+        """Send a request until it succeeds or the policy gives up, blocking in a local event loop.
+
+        :param session: Session to send the request with.
+        :param request: Request to send.
+        :param send_kwargs: Keyword arguments to pass to ``Request.send``.
+        :return: The finished response of the last attempt. Retries stop early if the host's circuit opens.
+        :raises CircuitOpenError: If the circuit breaker rejects the request.
+        """
+        self._check_circuit(request)
+
+        attempt: int = 0
+        while True:
+            attempt += 1
+            response: Response = request.send(session, wait_until_finished=True, **send_kwargs)
+
+            if (delay := self.next_delay(response, attempt)) is None or self._circuit_opened(request):
+                return response
+
+            response.delete()
+            wait_for_timeout(delay)
+
+    async def asend(self, session: NetworkSession, request: Request, **send_kwargs: Any) -> Response:
+        """Send a request until it succeeds or the policy gives up, without blocking the running asyncio event loop.
+
+        :param session: Session to send the request with.
+        :param request: Request to send.
+        :param send_kwargs: Keyword arguments to pass to ``Request.send``.
+        :return: The finished response of the last attempt. Retries stop early if the host's circuit opens.
+        :raises CircuitOpenError: If the circuit breaker rejects the request.
+        """
+        self._check_circuit(request)
+
+        attempt: int = 0
+        while True:
+            attempt += 1
+            response: Response = await request.send(session, **send_kwargs)
+
+            if (delay := self.next_delay(response, attempt)) is None or self._circuit_opened(request):
+                return response
+
+            response.delete()
+            await asyncio.sleep(delay)
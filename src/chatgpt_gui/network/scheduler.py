@@ -0,0 +1,226 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Scheduling of concurrent requests for chatgpt_gui."""
+from __future__ import annotations
+
+__all__ = (
+    'RequestScheduler',
+    'ScheduledRequest',
+)
+
+import heapq
+import itertools
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+from PySide6.QtCore import *
+
+from ..models import DeferredCallable
+from .manager import NetworkSession
+from .manager import Request
+from .manager import Response
+from .rate_limit import RateLimiter
+
+
+class ScheduledRequest:
+    """Handle for a :py:class:`Request` submitted to a :py:class:`RequestScheduler`.
+
+    The ``response`` attribute is ``None`` until the request leaves the queue and is sent.
+    The ``follow_up`` attribute can be set to a request submitted once this one finishes,
+    which is cancelled instead when this handle is cancelled after it finished.
+    """
+
+    __slots__ = (
+        '_scheduler', 'cancelled', 'finished', 'follow_up', 'host', 'on_cancel', 'priority', 'request', 'response',
+        'send_kwargs'
+    )
+
+    def __init__(self, scheduler: RequestScheduler, request: Request, priority: int,
+                 on_cancel: Callable[[], Any] | None = None, **send_kwargs: Any) -> None:
+        """Create a new :py:class:`ScheduledRequest`. Use :py:meth:`RequestScheduler.submit` instead.
+
+        :param scheduler: Scheduler the request was submitted to.
+        :param request: Request to send.
+        :param priority: Requests with a higher priority leave the queue first.
+        :param on_cancel: Callback when the request is cancelled before being sent, or couldn't be sent.
+        :param send_kwargs: Keyword arguments to pass to ``Request.send``.
+        """
+        self._scheduler: RequestScheduler = scheduler
+        self.cancelled: bool = False
+        self.on_cancel: Callable[[], Any] | None = on_cancel
+        self.finished: bool = False
+        self.follow_up: ScheduledRequest | None = None
+        self.host: str = QUrl(request.url).host()
+        self.priority: int = priority
+        self.request: Request = request
+        self.response: Response | None = None
+        self.send_kwargs: dict[str, Any] = send_kwargs
+
+    def __repr__(self) -> str:
+        """Representation of the :py:class:`ScheduledRequest` with its request and state."""
+        return f'<ScheduledRequest {self.request!r} ({self.state})>'
+
+    @property
+    def state(self) -> str:
+        """One of "queued", "in_flight", "finished", or "cancelled"."""
+        if self.cancelled:
+            return 'cancelled'
+        if self.finished:
+            return 'finished'
+        return 'queued' if self.response is None else 'in_flight'
+
+    def cancel(self) -> bool:
+        """Cancel the request. See :py:meth:`RequestScheduler.cancel`."""
+        return self._scheduler.cancel(self)
+
+
+class RequestScheduler(QObject):
+    """Sends requests through a :py:class:`NetworkSession`, limiting the amount in-flight per host.
+
+    Requests over the limit wait in a per-host priority queue, which is first-in-first-out for equal priorities.
+    If the scheduler has a :py:class:`RateLimiter`, requests which leave the queue wait for their token before
+    being sent, still counting towards the limit while waiting.
+    """
+
+    queueChanged = Signal()
+
+    def __init__(self, session: NetworkSession, max_per_host: int = 2, parent: QObject | None = None,
+                 rate_limiter: RateLimiter | None = None) -> None:
+        """Create a new :py:class:`RequestScheduler`.
+
+        :param session: Session to send requests with.
+        :param max_per_host: Maximum amount of requests in-flight for a single host.
+        :param parent: Parent QObject.
+        :param rate_limiter: Limiter to pace sent requests with. If None, requests are sent as soon as possible.
+        """
+        super().__init__(parent)
+        self.max_per_host: int = max_per_host
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.session: NetworkSession = session
+
+        self._counter: itertools.count = itertools.count()
+        self._in_flight: defaultdict[str, set[ScheduledRequest]] = defaultdict(set)
+        self._queues: defaultdict[str, list[tuple[int, int, ScheduledRequest]]] = defaultdict(list)
+
+    def _dispatch(self, host: str) -> None:
+        """Send queued requests for the given host until the concurrency limit is reached."""
+        queue = self._queues[host]
+        while queue and len(self._in_flight[host]) < self.max_per_host:
+            scheduled: ScheduledRequest = heapq.heappop(queue)[2]
+            self._in_flight[host].add(scheduled)
+
+            delay: float = 0.0 if self.rate_limiter is None else self.rate_limiter.reserve(scheduled.request.url)
+            if delay > 0:
+                QTimer.singleShot(int(delay * 1000), DeferredCallable(self._send, scheduled))
+            else:
+                self._send(scheduled)
+
+        self.queueChanged.emit()
+
+    def _release(self, scheduled: ScheduledRequest) -> None:
+        """Free the slot and rate limiter token of a request which left the queue without being sent."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.release(scheduled.request.url)
+        self._in_flight[scheduled.host].discard(scheduled)
+        self._dispatch(scheduled.host)
+
+    def _send(self, scheduled: ScheduledRequest) -> None:
+        # Requests cancelled while waiting for the rate limiter were never sent, so their token is returned
+        if scheduled.cancelled:
+            self._release(scheduled)
+            return
+
+        send_kwargs: dict[str, Any] = scheduled.send_kwargs.copy()
+        finished: Callable[[Response], Any] | None = send_kwargs.pop('finished', None)
+
+        def handle_finished(response: Response) -> None:
+            scheduled.finished = True
+            self._in_flight[scheduled.host].discard(scheduled)
+
+            try:
+                if finished is not None:
+                    finished(response)
+            finally:
+                self._dispatch(scheduled.host)
+
+        try:
+            scheduled.response = scheduled.request.send(self.session, finished=handle_finished, **send_kwargs)
+        except (OSError, ValueError):
+            # The request can't be sent, such as when its body can't be read, so it's treated as cancelled.
+            # Raising would leave its slot taken, and this may be called from a timer, with no caller to handle it
+            scheduled.cancelled = True
+            self._release(scheduled)
+            if scheduled.on_cancel is not None:
+                scheduled.on_cancel()
+
+    def cancel(self, scheduled: ScheduledRequest) -> bool:
+        """Cancel a submitted request.
+
+        Queued requests are removed from the queue without being sent, and their ``on_cancel`` callback is called.
+        In-flight requests are aborted, and their ``finished`` callback is called with the aborted :py:class:`Response`.
+        Finished requests with a ``follow_up`` request cancel it instead.
+
+        :param scheduled: Request to cancel.
+        :return: True if the request was cancelled, False if it was already finished or cancelled.
+        """
+        if scheduled.finished and scheduled.follow_up is not None:
+            return self.cancel(scheduled.follow_up)
+        if scheduled.cancelled or scheduled.finished:
+            return False
+
+        scheduled.cancelled = True
+        if scheduled.response is not None:
+            scheduled.response.abort()
+            return True
+
+        queue = self._queues[scheduled.host]
+        queue[:] = [entry for entry in queue if entry[2] is not scheduled]
+        heapq.heapify(queue)
+        self.queueChanged.emit()
+
+        if scheduled.on_cancel is not None:
+            scheduled.on_cancel()
+        return True
+
+    def in_flight(self, host: str | None = None) -> int:
+        """Return the amount of requests that have been sent and are not finished.
+
+        :param host: Host to count. If None, count all hosts.
+        """
+        if host is not None:
+            return len(self._in_flight.get(host, ()))
+        return sum(len(requests) for requests in self._in_flight.values())
+
+    def queue_depth(self, host: str | None = None) -> int:
+        """Return the amount of requests waiting to be sent.
+
+        :param host: Host to count. If None, count all hosts.
+        """
+        if host is not None:
+            return len(self._queues.get(host, ()))
+        return sum(len(queue) for queue in self._queues.values())
+
+    def submit(self, request: Request, priority: int = 0,
+               on_cancel: Callable[[], Any] | None = None, **send_kwargs: Any) -> ScheduledRequest:
+        """Queue a :py:class:`Request`, sending it once its host is under the concurrency limit.
+
+        :param request: Request to send.
+        :param priority: Requests with a higher priority leave the queue first.
+        :param on_cancel: Callback when the request is cancelled before being sent, or couldn't be sent.
+        :keyword finished: Callback when the request finishes, with the response supplied as an argument.
+        :keyword progress: Callback to update download progress, with the response, received bytes, and total bytes.
+        :keyword upload_progress: Callback to update upload progress, with the response, sent bytes, and total bytes.
+        :keyword ready_read: Callback when new data is available to read, with the response supplied as an argument.
+        :keyword sink: File path, binary file, generator, or callable to stream the response body to.
+        :return: Handle which can be used to track or cancel the request.
+        :raises TypeError: If wait_until_finished is provided, as scheduled requests are always asynchronous.
+        """
+        if 'wait_until_finished' in send_kwargs:
+            raise TypeError('Scheduled requests cannot be sent with wait_until_finished.')
+
+        scheduled = ScheduledRequest(self, request, priority, on_cancel, **send_kwargs)
+        heapq.heappush(self._queues[scheduled.host], (-priority, next(self._counter), scheduled))
+        self._dispatch(scheduled.host)
+        return scheduled
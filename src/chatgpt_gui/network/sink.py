@@ -0,0 +1,132 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Destinations of streamed HTTP response bodies."""
+from __future__ import annotations
+
+__all__ = (
+    'ResponseSink',
+    'SinkTarget',
+    'STREAM_BUFFER_SIZE',
+)
+
+import os
+from collections.abc import Callable
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+from typing import BinaryIO
+from typing import Final
+from typing import TypeAlias
+
+SinkTarget: TypeAlias = Path | str | BinaryIO | Callable[[bytes], Any] | Generator[Any, bytes, Any]
+"""Anything a streamed response body can be written to."""
+
+STREAM_BUFFER_SIZE: Final[int] = 64 * 1024
+"""Default size in bytes of the read buffer of a streamed response."""
+
+
+class ResponseSink:
+    """Writes the chunks of a streamed response body to a target as they are read.
+
+    The following targets are supported:
+        - Path or str: The body is written to a ".part" file next to the path, which replaces the path once the
+          response succeeds, and is removed otherwise. The path is never left partially written.
+        - Binary file: Each chunk is written to the file. The file is not closed, as it's owned by the caller.
+        - Generator: Each chunk is sent to the generator, which is closed once the response finishes.
+        - Callable: Each chunk is passed to the callable.
+    """
+
+    __slots__ = ('_file', '_path', '_write', 'bytes_written', 'closed', 'target')
+
+    def __init__(self, target: SinkTarget) -> None:
+        """Create a new :py:class:`ResponseSink`.
+
+        :param target: Where to write the response body.
+        :raises TypeError: If the target is not a supported type.
+        """
+        self.target: SinkTarget = target
+        self.bytes_written: int = 0
+        self.closed: bool = False
+        self._file: BinaryIO | None = None
+        self._path: Path | None = None
+
+        match target:
+            case Path() | str():
+                self._path = Path(target)
+                self._write = self._write_part_file
+            case Generator():
+                next(target)  # Advance the generator to its first yield, so it can receive chunks
+                self._write = target.send
+            case _ if callable(getattr(target, 'write', None)):
+                self._write = target.write  # pyright: ignore[reportGeneralTypeIssues]
+            case _ if callable(target):
+                self._write = target
+            case _:
+                raise TypeError(f'Response sink target must be a path, binary file, generator, or callable, '
+                                f'not {type(target)}')
+
+    def __repr__(self) -> str:
+        """Representation of the :py:class:`ResponseSink` with its target and bytes written."""
+        return f'<{type(self).__name__} ({self.target!r}, {self.bytes_written} bytes)>'
+
+    @property
+    def part_path(self) -> Path | None:
+        """Path of the file being written to before it replaces the target path, if the target is a path."""
+        if self._path is None:
+            return None
+        return self._path.with_name(f'{self._path.name}.part')
+
+    def _write_part_file(self, data: bytes) -> None:
+        if self._file is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)  # pyright: ignore[reportOptionalMemberAccess]
+            self._file = self.part_path.open('wb')  # pyright: ignore[reportOptionalMemberAccess]
+        self._file.write(data)
+
+    def write(self, data: bytes) -> bool:
+        """Write a chunk of the body to the target. Empty chunks are ignored.
+
+        :return: Whether the target accepts more data. This is False once a generator target returns.
+        """
+        if self.closed:
+            return False
+
+        if not data:
+            return True
+
+        accepts_more: bool = True
+        try:
+            self._write(data)
+        except StopIteration:
+            self.close()
+            accepts_more = False
+
+        self.bytes_written += len(data)
+        return accepts_more
+
+    def close(self, success: bool = True) -> None:
+        """Finish writing to the target. Closing a closed sink does nothing.
+
+        :param success: Whether the whole body was received.
+            If False, a partially written file is removed, and the target path is left as it was.
+        """
+        if self.closed:
+            return
+        self.closed = True
+
+        if isinstance(self.target, Generator):
+            self.target.close()
+
+        if self._path is None:
+            return
+
+        # Empty bodies never opened the file
+        if self._file is None and success:
+            self._write_part_file(b'')
+
+        if self._file is not None:
+            self._file.close()
+            if success:
+                os.replace(self.part_path, self._path)  # pyright: ignore[reportGeneralTypeIssues]
+            else:
+                self.part_path.unlink(missing_ok=True)  # pyright: ignore[reportOptionalMemberAccess]
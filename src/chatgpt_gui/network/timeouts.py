@@ -0,0 +1,107 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Connect timeouts of network requests for chatgpt_gui."""
+from __future__ import annotations
+
+__all__ = (
+    'TimeoutScheduler',
+)
+
+import heapq
+import itertools
+import time
+from typing import Final
+
+from PySide6.QtCore import *
+from PySide6.QtNetwork import *
+from shiboken6 import Shiboken
+
+_TIMED_OUT_PROPERTY: Final[str] = 'cg_timed_out'
+
+
+class TimeoutScheduler(QObject):
+    """Aborts replies which don't receive their response headers before a deadline, using one timer for every reply.
+
+    Deadlines are kept in a min-heap from ``time.monotonic``, and the timer is set to the earliest one.
+    Replies are only checked once their deadline is reached, so tracking a reply costs a heap push,
+    instead of a timer and signal connections which would be dispatched to Python for every reply.
+
+    Read timeouts are left to the transfer timeout of each request, which Qt restarts without calling into Python
+    whenever data is sent or received, using a timer it creates for every reply regardless.
+    """
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        """Create a new :py:class:`TimeoutScheduler`.
+
+        :param parent: Parent of the scheduler and its timer.
+        """
+        super().__init__(parent)
+        self._counter: itertools.count = itertools.count()
+        self._heap: list[tuple[float, int, QNetworkReply]] = []
+        self._next_deadline: float | None = None
+
+        self.timeouts: int = 0
+        """Amount of replies aborted because their deadline passed."""
+
+        self._timer: QTimer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._expire)  # pyright: ignore[reportGeneralTypeIssues]
+
+    @property
+    def pending(self) -> int:
+        """Amount of deadlines which weren't reached yet, including deadlines of replies which already finished."""
+        return len(self._heap)
+
+    @staticmethod
+    def is_timed_out(reply: QNetworkReply) -> bool:
+        """Return whether a reply was aborted by a :py:class:`TimeoutScheduler` because its deadline passed."""
+        return bool(reply.property(_TIMED_OUT_PROPERTY))
+
+    @staticmethod
+    def _is_waiting(reply: QNetworkReply) -> bool:
+        """Return whether a reply is still waiting for its response headers."""
+        return (Shiboken.isValid(reply) and not reply.isFinished()
+                and reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute) is None)
+
+    def _schedule(self) -> None:
+        """Set the timer to the earliest deadline, dropping the deadlines of finished replies before it."""
+        while self._heap and not self._is_waiting(self._heap[0][2]):
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            self._timer.stop()
+            self._next_deadline = None
+            return
+
+        deadline: float = self._heap[0][0]
+        if deadline != self._next_deadline:
+            self._next_deadline = deadline
+            # Round up, so the timer never fires before the deadline
+            self._timer.start(max(0, int((deadline - time.monotonic()) * 1000) + 1))
+
+    def _expire(self) -> None:
+        """Abort every reply which passed its deadline without receiving its response headers."""
+        now: float = time.monotonic()
+        self._next_deadline = None
+
+        while self._heap and self._heap[0][0] <= now:
+            reply: QNetworkReply = heapq.heappop(self._heap)[2]
+            if self._is_waiting(reply):
+                self.timeouts += 1
+                # Aborting only reports OperationCanceledError, so mark the reply to tell it apart from cancellations
+                reply.setProperty(_TIMED_OUT_PROPERTY, True)
+                reply.abort()
+
+        self._schedule()
+
+    def add(self, reply: QNetworkReply, timeout: float) -> None:
+        """Abort a reply if it doesn't receive its response headers within a timeout.
+
+        :param reply: Reply to track.
+        :param timeout: Seconds to wait for the response headers, starting from now.
+        """
+        deadline: float = time.monotonic() + timeout
+        heapq.heappush(self._heap, (deadline, next(self._counter), reply))
+        if self._next_deadline is None or deadline < self._next_deadline:
+            self._schedule()
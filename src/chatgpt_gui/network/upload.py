@@ -0,0 +1,119 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Sources of streamed HTTP request bodies."""
+from __future__ import annotations
+
+__all__ = (
+    'BodySource',
+    'FILE_CHUNK_SIZE',
+    'IterableDevice',
+    'open_body_device',
+)
+
+from collections.abc import Iterable
+from collections.abc import Iterator
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO
+from typing import Final
+from typing import TypeAlias
+
+from PySide6.QtCore import *
+
+BodySource: TypeAlias = Path | QIODevice | BinaryIO | Iterable[bytes]
+"""Anything a request body can be streamed from, instead of being passed as bytes."""
+
+FILE_CHUNK_SIZE: Final[int] = 64 * 1024
+"""Size in bytes of the chunks read from binary file objects."""
+
+
+class IterableDevice(QIODevice):
+    """Sequential, read-only :py:class:`QIODevice` which reads from an iterable of bytes chunks.
+
+    Chunks are only pulled from the iterable when the device is read, so a generator
+    can produce a body piece by piece as it's uploaded, without ever holding all of it.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], parent: QObject | None = None) -> None:
+        """Create a new open :py:class:`IterableDevice`.
+
+        :param chunks: Chunks of the body. Empty chunks are skipped.
+        :param parent: Parent of the device.
+        """
+        super().__init__(parent)
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._exhausted: bool = False
+        self._finished: bool = False
+        self._pending: bytearray = bytearray()
+        # Chunks are already buffered in memory, so don't copy them into another buffer
+        self.open(QIODevice.OpenModeFlag.ReadOnly | QIODevice.OpenModeFlag.Unbuffered)
+
+    def _fill(self, size: int) -> None:
+        """Pull chunks from the iterable until at least ``size`` bytes are pending, or it's exhausted."""
+        while not self._exhausted and len(self._pending) < size:
+            try:
+                self._pending += next(self._chunks)
+            except StopIteration:
+                self._exhausted = True
+
+    def atEnd(self) -> bool:
+        """Return whether every chunk has been read."""
+        self._fill(1)
+        return not self.bytesAvailable()
+
+    def bytesAvailable(self) -> int:
+        """Return the amount of bytes which can be read without pulling another chunk."""
+        return len(self._pending) + super().bytesAvailable()
+
+    def isSequential(self) -> bool:
+        """Return True, as the chunks can only be read once."""
+        return True
+
+    def readData(self, maxlen: int) -> bytes:
+        """Read up to ``maxlen`` bytes, pulling chunks from the iterable as needed.
+
+        Once every chunk has been read, ``readChannelFinished`` is emitted,
+        which Qt waits for before sending a body of unknown length.
+        """
+        self._fill(maxlen)
+        if self._exhausted and not self._pending and not self._finished:
+            self._finished = True
+            QTimer.singleShot(0, self.readChannelFinished.emit)  # pyright: ignore[reportGeneralTypeIssues]
+        data: bytes = bytes(self._pending[:maxlen])
+        del self._pending[:maxlen]
+        return data
+
+    def writeData(self, data: bytes, length: int) -> int:
+        """Return -1, as the device is read-only."""
+        return -1
+
+
+def open_body_device(source: BodySource) -> QIODevice:
+    """Return an open device to read a request body from.
+
+    Files are opened as a new :py:class:`QFile`, so sending a request again re-reads the file.
+    Open random-access devices are read from the start, and closed devices are opened.
+    Binary file objects are read in chunks of ``FILE_CHUNK_SIZE`` bytes from their current position.
+    Other iterables are wrapped in an :py:class:`IterableDevice`, so they can only be sent once.
+
+    :param source: Source of the body.
+    :return: Open device. Devices created by this function have no parent, and should be parented by the caller.
+    :raises OSError: If the file or device couldn't be opened.
+    """
+    if isinstance(source, Path):
+        device: QIODevice = QFile(str(source))
+    elif isinstance(source, QIODevice):
+        device = source
+    elif callable(getattr(source, 'read', None)):
+        return IterableDevice(iter(partial(source.read, FILE_CHUNK_SIZE), b''))  # pyright: ignore
+    else:
+        return IterableDevice(source)  # pyright: ignore[reportGeneralTypeIssues]
+
+    if not device.isOpen():
+        if not device.open(QIODevice.OpenModeFlag.ReadOnly):
+            raise OSError(f'Couldn\'t open request body "{source}": {device.errorString()}')
+    elif not device.isSequential():
+        device.seek(0)
+
+    return device
@@ -48,11 +48,15 @@ class VersionChecker(QObject):
     checked = Signal(str)
     newerVersion = Signal(str, str)
 
-    def __init__(self, parent: QObject | None = None) -> None:
-        """Create a new :py:class:`VersionChecker` and initialize its :py:class:`NetworkSession`."""
+    def __init__(self, parent: QObject | None = None, session: NetworkSession | None = None) -> None:
+        """Create a new :py:class:`VersionChecker`.
+
+        :param parent: Parent QObject.
+        :param session: Session to send requests with. If None, create a new :py:class:`NetworkSession`.
+        """
         super().__init__(parent)
 
-        self.session: NetworkSession = NetworkSession(self)
+        self.session: NetworkSession = NetworkSession(self) if session is None else session
 
     def check_version(self, package_name: str = CG_PACKAGE_NAME) -> None:
         """Check the latest version of the given package on PyPI.
@@ -13,9 +13,28 @@ import sys
 from ._version import __version__
 from .exception_hook import ExceptionHook
 from .gui import GetterApp
+from .utils import has_package
 from .utils import patch_windows_taskbar_icon
 
 
+def _exec_async(app: GetterApp) -> int:
+    """Run the application through an asyncio event loop integrated with Qt's.
+
+    This allows coroutines, such as ``Client.asend_message``, to be awaited from the GUI.
+
+    :return: Exit code of the application.
+    """
+    import asyncio
+    import qasync
+
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+
+    # run_forever runs Qt's event loop until the application quits, returning its exit code
+    with loop:
+        return loop.run_forever()
+
+
 def main(*args: str) -> int:
     """Run the program. GUI script entrypoint.
 
@@ -29,6 +48,9 @@ def main(*args: str) -> int:
 
         app: GetterApp = GetterApp.instance()
         app.windows['app'].show()
+
+        if has_package('qasync'):
+            return _exec_async(app)
         return app.exec()
 
 
@@ -211,6 +211,17 @@ class PathTomlEncoder(toml.TomlEncoder):
         return super().dump_value(v=v)
 
 
+def _merge_tables(base: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of a TOML table updated with the values of another, merging tables present in both."""
+    merged: dict[str, Any] = base.copy()
+    for key, value in new.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge_tables(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
 class TomlFile:
     """Object that manages the getting and setting of TOML configurations.
 
@@ -380,7 +391,8 @@ class TomlFile:
                 with path.open(mode='r', encoding='utf8') as file:
                     toml_data = toml.load(file, decoder=PathTomlDecoder())
                     if update:
-                        self._data |= toml_data
+                        # Keep keys missing from nested tables, such as settings added after the file was saved
+                        self._data = _merge_tables(self._data, toml_data)
                     else:
                         self._data = toml_data
 
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 __all__ = (
     'add_menu_items',
+    'atomic_write',
     'bit_rep',
     'circle_pixmap',
     'create_shortcut',
@@ -39,6 +40,7 @@ __all__ = (
     'set_or_swap_icon',
     'unique_values',
     'wait_for_reply',
+    'wait_for_timeout',
 )
 
 from .common import bit_rep
@@ -65,10 +67,12 @@ from .network import http_code_map
 from .network import is_error_status
 from .network import query_to_dict
 from .network import wait_for_reply
+from .network import wait_for_timeout
 from .package import current_requirement_licenses
 from .package import current_requirement_names
 from .package import current_requirement_versions
 from .package import has_package
+from .system import atomic_write
 from .system import create_shortcut
 from .system import get_desktop_path
 from .system import get_start_menu_path
@@ -14,6 +14,7 @@ __all__ = (
     'is_error_status',
     'query_to_dict',
     'wait_for_reply',
+    'wait_for_timeout',
 )
 
 import codecs
@@ -71,14 +72,46 @@ def is_error_status(status: int) -> bool:
     return 400 <= status < 600
 
 
-def wait_for_reply(reply: QNetworkReply) -> None:
-    """Process events until the reply is finished.
+def wait_for_reply(reply: QNetworkReply, timeout: float | None = None) -> bool:
+    """Run a local event loop until the reply is finished.
+
+    The thread sleeps until an event is available, so no CPU time is used while waiting on the network.
 
     :param reply: The QNetworkReply to wait for.
+    :param timeout: Maximum amount of seconds to wait. If None, wait until the reply is finished.
+    :return: True if the reply is finished, False if the timeout was reached first.
     :raises RuntimeError: If the internal C++ QNetworkRequest is deleted.
     """
-    while not reply.isFinished():
-        QCoreApplication.processEvents()
+    if reply.isFinished():
+        return True
+
+    loop = QEventLoop()
+    reply.finished.connect(loop.quit)   # pyright: ignore[reportGeneralTypeIssues]
+    reply.destroyed.connect(loop.quit)  # pyright: ignore[reportGeneralTypeIssues]
+
+    if timeout is not None:
+        timer = QTimer(loop)
+        timer.setSingleShot(True)
+        timer.timeout.connect(loop.quit)  # pyright: ignore[reportGeneralTypeIssues]
+        timer.start(int(timeout * 1000))
+
+    loop.exec()
+    return reply.isFinished()
+
+
+def wait_for_timeout(seconds: float) -> None:
+    """Run a local event loop for the given amount of seconds.
+
+    Unlike :py:func:`time.sleep`, events are still processed while waiting, so the application stays responsive.
+
+    :param seconds: Amount of seconds to wait.
+    """
+    if seconds <= 0:
+        return
+
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
 
 ##########
 # NOTICE:
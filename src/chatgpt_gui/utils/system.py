@@ -5,6 +5,7 @@
 from __future__ import annotations
 
 __all__ = (
+    'atomic_write',
     'create_shortcut',
     'get_desktop_path',
     'get_start_menu_path',
@@ -22,6 +23,33 @@ from .common import bit_rep
 from .common import quote_str
 
 
+def atomic_write(path: Path, data: str | bytes, encoding: str = 'utf8') -> None:
+    """Replace the contents of a file, so it is never left partially written.
+
+    The data is written to a temporary file in the same directory, which then replaces the original file.
+
+    :param path: File to write to.
+    :param data: Text or bytes to write.
+    :param encoding: Encoding to use if data is text.
+    """
+    import os
+    import tempfile
+
+    if isinstance(data, str):
+        data = data.encode(encoding)
+
+    fd, temp_path = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
 def create_shortcut(target: Path, arguments: str | None = None,
                     name: str | None = None, description: str | None = None,
                     icon: Path | None = None, working_dir: Path | None = None,